@@ -9,7 +9,7 @@ from core.analyzer import DataAnalyzer
 from core.utils import format_money, format_profit_value
 
 # Import UI stránok
-from ui.pages import overview, employee, heatmap, benchmark, studio, employee_detail, user_management, settings
+from ui.pages import overview, employee, heatmap, benchmark, forecast, studio, employee_detail, user_management, settings
 from ui.styling import apply_dark_theme
 
 # Import autentifikačného systému
@@ -21,6 +21,12 @@ from core.server_monitor import get_server_monitor
 
 # Import error handling
 from core.error_handler import handle_error, log_error
+from ui import error_display
+from core.activity_rollups import load_detailed_reports
+from core import data_loader
+from core.data_loader import filter_sales_data_new_logic, calculate_employee_score_from_sales_amount
+
+error_display.install()
 
 import sys
 import inspect
@@ -32,483 +38,40 @@ def load_sales_data():
     """Načíta sales dáta s opravenou logikou filtrovania"""
     
     try:
-        # ✅ OPRAVENÉ - hľadá v sales priečinku
-        data_path = Path("data/sales")
-        
-        # ✅ Ak sales neexistuje, skús aj raw ako backup
-        if not data_path.exists():
-            data_path = Path("data/raw")
-            
-        if not data_path.exists():
-            st.error(f"Priečinok {data_path} neexistuje!")
-            return pd.DataFrame(), pd.DataFrame()  # ✅ Vráti tuple namiesto listu
-        
-        # Nájdi sales súbor
-        sales_candidates = []
-        for file in data_path.glob("*.xlsx"):
-            filename_lower = file.name.lower()
-            if any(keyword in filename_lower for keyword in ['prodej', 'sales', 'leden', 'unor', 'user']):
-                sales_candidates.append(file)
-        
-        if not sales_candidates:
-            st.error("❌ Žiadny sales súbor nenájdený!")
-            return pd.DataFrame(), pd.DataFrame()  # ✅ Vráti tuple namiesto listu
-        
-        sales_file = sales_candidates[0]
-        
-        # Načítanie súboru
-        df = pd.read_excel(sales_file)
-        
-        # ✅ OPRAVENÉ FILTROVANIE
         include_terminated = st.session_state.get('include_terminated_employees', False)
-        df_filtered = filter_sales_data_new_logic(df, include_terminated)
-        
-        # Spracovanie do zamestnancov (zostáva rovnaké)
-        sales_employees = []
-        current_workplace = 'unknown'
-        
-        for _, row in df_filtered.iterrows():
-            user = row.get('user', '')
-            
-            if user in ['praha', 'zlin', 'brno', 'vizovice']:
-                current_workplace = user
-                continue
-            
-            if not user or pd.isna(user) or str(user).strip() == '':
-                continue
-            
-            employee = {
-                'name': user,
-                'workplace': current_workplace,
-                'monthly_sales': {},
-                'total_sales': 0,
-                'score': 0
-            }
-            
-            # Načítanie mesačných dát
-            total_sales = 0
-            month_columns = ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven', 
-                           'cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec']
-            
-            for col in df_filtered.columns:
-                if str(col).lower() in month_columns:
-                    value = row.get(col, 0)
-                    
-                    # Konverzia 'X' na 0
-                    if pd.isna(value) or str(value).upper().strip() == 'X':
-                        value = 0
-                    else:
-                        try:
-                            value = float(value)
-                        except:
-                            value = 0
-                    
-                    employee['monthly_sales'][col] = value
-                    total_sales += value
-            
-            employee['total_sales'] = total_sales
-            employee['score'] = calculate_employee_score_from_sales_amount(total_sales)
-            
-            sales_employees.append(employee)
-        
-        return sales_employees, df_filtered  # ✅ Vráti tuple s 2 hodnotami
-        
+        return data_loader.load_sales_data(include_terminated)
+    except FileNotFoundError as e:
+        st.error(str(e))
+        return pd.DataFrame(), pd.DataFrame()  # ✅ Vráti tuple namiesto listu
     except Exception as e:
         st.error(f"Chyba pri načítaní sales dát: {e}")
         return pd.DataFrame(), pd.DataFrame()  # ✅ Vráti tuple namiesto listu
 
 
-
-
-def filter_sales_data_new_logic(df, include_terminated=False):
-    """
-    ✅ OPRAVENÁ LOGIKA - hľadá posledný mesiac s dátami, nie chronologicky posledný
-    """
-    
-    # Identifikácia mesačných stĺpcov v chronologickom poradí
-    month_columns = ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven', 
-                    'cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec']
-    
-    # Nájdi skutočné mesačné stĺpce v dátach
-    available_months = []
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if col_lower in month_columns:
-            available_months.append(col)
-    
-    if not available_months:
-        return df
-    
-    # Zoradi mesiace chronologicky
-    month_order = {month: i for i, month in enumerate(month_columns)}
-    available_months.sort(key=lambda x: month_order.get(x.lower(), 999))
-    
-    # Ak zahrnúť všetkých, vráť všetko
-    if include_terminated:
-        return df
-    
-    # ✅ NOVÁ LOGIKA - nájdi posledný mesiac s dátami pre každého zamestnanca
-    keep_indices = []
-    
-    for idx, row in df.iterrows():
-        user = row.get('user', '')
-        
-        # Preskočiť mesta a prázdne riadky
-        if (user in ['praha', 'zlin', 'brno', 'vizovice'] or 
-            not user or pd.isna(user) or str(user).strip() == ''):
-            keep_indices.append(idx)
-            continue
-        
-        # ✅ NÁJDI POSLEDNÝ MESIAC S DÁTAMI (nie chronologicky posledný)
-        last_month_with_data = None
-        last_value = None
-        
-        # Prejdi mesiace odzadu (od decembra po január)
-        for month in reversed(available_months):
-            value = row.get(month, '')
-            
-            # Ak má mesiac dáta (nie je prázdny/NaN)
-            if pd.notna(value) and str(value).strip() != '':
-                last_month_with_data = month
-                last_value = value
-                break  # Našiel som posledný mesiac s dátami
-        
-        # Ak nenašiel žiadny mesiac s dátami, ponechaj (nový zamestnanec)
-        if last_month_with_data is None:
-            keep_indices.append(idx)
-            continue
-        
-        # Ak posledný mesiac s dátami obsahuje 'X', vyhoď
-        last_value_str = str(last_value).strip().upper()
-        if last_value_str == 'X':
-            pass  # Vylúčiť
-        else:
-            keep_indices.append(idx)
-    
-    df_filtered = df.iloc[keep_indices]
-    return df_filtered
-
-
-
-
-
-
-
 def load_internet_data():
     """Load ALL internet data files - vrátené na agregované dáta"""
-    
-    from pathlib import Path
-    import pandas as pd
-    
-    data_path = Path("data/raw")
-    
-    if not data_path.exists():
-        return None
-    
-    try:
-        all_files = list(data_path.glob("*.xlsx"))
-        internet_files = [f for f in all_files if 'internet' in f.name.lower()]
-        
-        if not internet_files:
-            return None
-        
-        all_dataframes = []
-        
-        for file in internet_files:
-            try:
-                df = pd.read_excel(file, header=8)
-                df_clean = df.dropna(subset=['Osoba ▲'])
-                df_final = df_clean[~df_clean['Osoba ▲'].astype(str).str.startswith('*')]
-                
-                if len(df_final) > 0:
-                    df_final = df_final.copy()
-                    df_final['Source_File'] = file.name
-                    all_dataframes.append(df_final)
-                    
-            except Exception:
-                continue
-        
-        if not all_dataframes:
-            return None
-        
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        # Agregácia - obnovená
-        time_columns = ['Mail', 'Chat', 'IS Sykora', 'SykoraShop', 'Web k praci', 
-                       'Hry', 'Nepracovni weby', 'Čas celkem ▼', 'hladanie prace',
-                       'Nezařazené', 'Umela inteligence']
-        
-        def sum_time_strings(series):
-            total_minutes = 0
-            for time_str in series.dropna():
-                if pd.notna(time_str) and str(time_str) not in ['', 'nan']:
-                    try:
-                        parts = str(time_str).split(':')
-                        if len(parts) >= 2:
-                            hours = int(parts[0])
-                            minutes = int(parts[1])
-                            seconds = int(parts[2]) if len(parts) > 2 else 0
-                            total_minutes += hours * 60 + minutes + seconds / 60
-                    except:
-                        pass
-            
-            if total_minutes == 0:
-                return "00:00:00"
-            
-            hours = int(total_minutes // 60)
-            minutes = int(total_minutes % 60)
-            seconds = int((total_minutes % 1) * 60)
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        
-        agg_dict = {}
-        for col in time_columns:
-            if col in combined_df.columns:
-                agg_dict[col] = sum_time_strings
-        
-        if 'Přihlašovací jméno' in combined_df.columns:
-            agg_dict['Přihlašovací jméno'] = 'first'
-        
-        aggregated_df = combined_df.groupby('Osoba ▲').agg(agg_dict).reset_index()
-        
-        return aggregated_df
-        
-    except Exception as e:
-        return None
-
+    return data_loader.load_internet_data("data/raw")
 
 
 def load_applications_data():
     """Load ALL applications data files - vrátené na agregované dáta"""
-    
-    from pathlib import Path
-    import pandas as pd
-    
-    data_path = Path("data/raw")
-    
-    if not data_path.exists():
-        return None
-    
-    try:
-        # ✅ OPRAVENÉ - hľadáme "applications" namiesto "application"
-        all_files = list(data_path.glob("*.xlsx"))
-        app_files = [f for f in all_files if 'applications' in f.name.lower() and 'internet' not in f.name.lower()]
-        
-        if not app_files:
-            return None
-        
-        # KOMBINÁCIA VŠETKÝCH SÚBOROV
-        all_dataframes = []
-        
-        for file in app_files:
-            try:
-                df = pd.read_excel(file, header=8)
-                df_clean = df.dropna(subset=['Osoba ▲'])
-                df_final = df_clean[~df_clean['Osoba ▲'].astype(str).str.startswith('*')]
-                
-                if len(df_final) > 0:
-                    df_final = df_final.copy()
-                    df_final['Source_File'] = file.name
-                    all_dataframes.append(df_final)
-                    
-            except Exception:
-                continue
-        
-        if not all_dataframes:
-            return None
-        
-        # Kombinácia všetkých súborov
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        # Aplikačné time stĺpce
-        app_time_columns = ['Helios Green', 'Chat', 'Imos - program', 'Mail', 
-                           'Programy', 'Půdorysy', 'Čas celkem ▼', 'Internet']
-        
-        # Agregácia časov
-        def sum_time_strings(series):
-            total_minutes = 0
-            for time_str in series.dropna():
-                if pd.notna(time_str) and str(time_str) not in ['', 'nan']:
-                    try:
-                        parts = str(time_str).split(':')
-                        if len(parts) >= 2:
-                            hours = int(parts[0])
-                            minutes = int(parts[1])
-                            seconds = int(parts[2]) if len(parts) > 2 else 0
-                            total_minutes += hours * 60 + minutes + seconds / 60
-                    except:
-                        pass
-            
-            if total_minutes == 0:
-                return "00:00:00"
-            
-            hours = int(total_minutes // 60)
-            minutes = int(total_minutes % 60)
-            seconds = int((total_minutes % 1) * 60)
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        
-        # Agregačný slovník
-        agg_dict = {}
-        for col in app_time_columns:
-            if col in combined_df.columns:
-                agg_dict[col] = sum_time_strings
-        
-        # Pridanie non-time stĺpcov
-        if 'Přihlašovací jméno' in combined_df.columns:
-            agg_dict['Přihlašovací jméno'] = 'first'
-        
-        # Finálna agregácia podľa osoby
-        aggregated_df = combined_df.groupby('Osoba ▲').agg(agg_dict).reset_index()
-        
-        return aggregated_df
-        
-    except Exception as e:
-        return None
+    return data_loader.load_applications_data("data/raw")
 
 
 def load_internet_data_detailed():
     """NOVÁ NADSTAVBA: Načíta individuálne denné záznamy pre timeline analýzu"""
-    
-    from pathlib import Path
-    import pandas as pd
-    
-    data_path = Path("data/raw")
-    
-    if not data_path.exists():
-        return None
-    
-    try:
-        all_files = list(data_path.glob("*.xlsx"))
-        internet_files = [f for f in all_files if 'internet' in f.name.lower()]
-        
-        if not internet_files:
-            return None
-        
-        all_dataframes = []
-        
-        for file in internet_files:
-            try:
-                df = pd.read_excel(file, header=8)
-                df_clean = df.dropna(subset=['Osoba ▲'])
-                df_final = df_clean[~df_clean['Osoba ▲'].astype(str).str.startswith('*')]
-                
-                if len(df_final) > 0:
-                    df_final = df_final.copy()
-                    df_final['Source_File'] = file.name
-                    
-                    # Extrahuj dátum z názvu súboru
-                    import re
-                    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', file.name)
-                    if date_match:
-                        df_final['Date'] = date_match.group(1)
-                    else:
-                        df_final['Date'] = 'unknown'
-                    
-                    all_dataframes.append(df_final)
-                    
-            except Exception:
-                continue
-        
-        if not all_dataframes:
-            return None
-        
-        # ZACHOVÁ INDIVIDUÁLNE RIADKY (žiadna agregácia)
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        return combined_df
-        
-    except Exception:
-        return None
+    return load_detailed_reports("data/raw", 'internet')
 
 
 def load_applications_data_detailed():
     """NOVÁ NADSTAVBA: Načíta individuálne denné záznamy pre timeline analýzu"""
-    
-    from pathlib import Path
-    import pandas as pd
-    
-    data_path = Path("data/raw")
-    
-    if not data_path.exists():
-        return None
-    
-    try:
-        # Nájdi VŠETKY applications súbory
-        all_files = list(data_path.glob("*.xlsx"))
-        app_files = [f for f in all_files if 'application' in f.name.lower() and 'internet' not in f.name.lower()]
-        
-        if not app_files:
-            return None
-        
-        # KOMBINÁCIA VŠETKÝCH SÚBOROV
-        all_dataframes = []
-        
-        for file in app_files:
-            try:
-                df = pd.read_excel(file, header=8)
-                df_clean = df.dropna(subset=['Osoba ▲'])
-                df_final = df_clean[~df_clean['Osoba ▲'].astype(str).str.startswith('*')]
-                
-                if len(df_final) > 0:
-                    df_final = df_final.copy()
-                    df_final['Source_File'] = file.name
-                    
-                    # Extrahuj dátum z názvu súboru
-                    import re
-                    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', file.name)
-                    if date_match:
-                        df_final['Date'] = date_match.group(1)
-                    else:
-                        df_final['Date'] = 'unknown'
-                    
-                    all_dataframes.append(df_final)
-                    
-            except Exception:
-                continue
-        
-        if not all_dataframes:
-            return None
-        
-        # ZACHOVÁ INDIVIDUÁLNE RIADKY (žiadna agregácia)
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        return combined_df
-        
-    except Exception:
-        return None
-
-
-
+    return load_detailed_reports("data/raw", 'applications')
 
 
 def debug_data_loading():
     """Debug funkcia - deaktivovaná"""
     pass
 
-def calculate_employee_score_from_sales_amount(total_sales):
-    """Výpočet skóre na základe celkového predaja"""
-    
-    if total_sales >= 5000000:  # 5M+
-        base_score = 90
-    elif total_sales >= 4000000:  # 4M+
-        base_score = 85
-    elif total_sales >= 3000000:  # 3M+
-        base_score = 75
-    elif total_sales >= 2000000:  # 2M+
-        base_score = 65
-    elif total_sales >= 1000000:  # 1M+
-        base_score = 50
-    elif total_sales > 0:
-        base_score = 30
-    else:
-        base_score = 20
-    
-    # Malá variácia pre realistickosť
-    import random
-    random.seed(hash(str(total_sales)))
-    variation = random.uniform(-5, 5)
-    
-    final_score = max(20, min(95, base_score + variation))
-    return round(final_score, 2)
 
 @handle_error
 def initialize_session_state():
@@ -542,7 +105,7 @@ def initialize_session_state():
             data_path="data/raw"  # ✅ PRIDANÉ
         )
         analyzer.raw_sales_data = raw_sales_df  # Pridáme aj pôvodné DataFrame
-        analyzer.validate_sales_consistency()
+        analyzer.get_validation_report()  # raz na snapshot, výsledok pre admina
         
         st.session_state.analyzer = analyzer
         st.session_state.last_terminated_setting = st.session_state.get('include_terminated_employees')
@@ -617,6 +180,13 @@ def create_sidebar():
                             type="primary" if current_page == 'heatmap' else "secondary"):
                     st.session_state.current_page = 'heatmap'
                     st.rerun()
+            
+            if 'forecast' in allowed_pages:
+                if st.button("🔮 Predikcia", width='stretch',
+                            type="primary" if current_page == 'forecast' else "secondary"):
+                    st.session_state.current_page = 'forecast'
+                    st.session_state.selected_employee = None
+                    st.rerun()
                     
             if 'studio' in allowed_pages:
                 if st.button("🏢 Studio", width='stretch',
@@ -840,6 +410,9 @@ def run_main_application():
         elif st.session_state.current_page == 'heatmap':
             log_page_activity('heatmap')
             heatmap.render(analyzer)
+        elif st.session_state.current_page == 'forecast':
+            log_page_activity('forecast')
+            forecast.render(analyzer)
         elif st.session_state.current_page == 'studio':
             log_page_activity('studio')
             studio.render(analyzer)
@@ -176,12 +176,23 @@ def show_admin_page():
             st.session_state.admin_section = 'data_management'
             st.rerun()
     
-    # Prázdne miesta pre budúce rozšírenia
     with col6:
-        st.empty()
+        if st.button("🗄️ SQL konzola", 
+                    use_container_width=True, 
+                    type="secondary",
+                    help="Ad-hoc read-only SQL dotazy nad aktuálnymi dátami"):
+            st.session_state.admin_section = 'sql_console'
+            st.rerun()
     
     with col7:
-        st.empty()
+        if st.button("🧪 Validácia dát", 
+                    use_container_width=True, 
+                    type="secondary",
+                    help="Report konzistencie dát aktuálneho snapshotu"):
+            st.session_state.admin_section = 'data_validation'
+            st.rerun()
+    
+    # Prázdne miesta pre budúce rozšírenia
     
     with col8:
         st.empty()
@@ -199,6 +210,10 @@ def show_admin_page():
         show_error_logs_section()
     elif admin_section == 'data_management':
         show_data_management_section()
+    elif admin_section == 'sql_console':
+        show_sql_console_section()
+    elif admin_section == 'data_validation':
+        show_data_validation_section()
     else:
         show_admin_overview()
 
@@ -274,6 +289,18 @@ def show_data_management_section():
     show_data_management()
 
 
+def show_sql_console_section():
+    """Sekcia pre SQL konzolu"""
+    st.markdown("### 🗄️ SQL konzola")
+    show_sql_console()
+
+
+def show_data_validation_section():
+    """Sekcia pre validáciu dát"""
+    st.markdown("### 🧪 Validácia dát")
+    show_data_validation()
+
+
 def show_error_logs():
     """Zobrazí error logy aplikácie"""
     from core.error_handler import get_recent_errors, clear_old_errors
@@ -454,6 +481,7 @@ def show_single_day_stats(stats, date_str):
                 'employee': '👤 Zamestnanec',
                 'heatmap': '🗺️ Heatmapa', 
                 'benchmark': '📈 Benchmark',
+                'forecast': '🔮 Predikcia',
                 'studio': '🏢 Studio',
                 'employee_detail': '👤 Detail zamestnanca',
                 'admin': '👑 Admin Panel'
@@ -640,6 +668,7 @@ def show_date_range_stats(from_date, to_date):
                 'employee': '👤 Zamestnanec',
                 'heatmap': '🗺️ Heatmapa', 
                 'benchmark': '📈 Benchmark',
+                'forecast': '🔮 Predikcia',
                 'studio': '🏢 Studio',
                 'employee_detail': '👤 Detail zamestnanca',
                 'admin': '👑 Admin Panel'
@@ -2946,6 +2975,7 @@ def show_page_permissions_management(user_db):
         'employee': '👤 Detail zamestnanca',
         'benchmark': '🏆 Benchmark', 
         'heatmap': '🔥 Heatmapa',
+        'forecast': '🔮 Predikcia',
         'studio': '🏢 Studio',
         'kpi_system': '🎯 KPI Systém',
         'admin': '👑 Administrácia'
@@ -3061,3 +3091,108 @@ def show_page_permissions_management(user_db):
     except Exception as e:
         st.error(f"❌ Chyba pri načítaní používateľov: {e}")
         st.exception(e)
+
+
+def get_console_studio_analyzer():
+    """Studio analyzer pre SQL konzolu (None ak Studio dáta nie sú k dispozícii)"""
+    try:
+        from ui.pages.studio import create_analyzer_with_server_cache
+        return create_analyzer_with_server_cache()
+    except Exception:
+        return None
+
+
+def show_sql_console():
+    """Read-only SQL dotazy nad snapshotom dát (sales, aktivita, studio)"""
+    from core.sql_engine import get_sql_engine, DEFAULT_MAX_ROWS, DEFAULT_TIMEOUT
+    
+    analyzer = st.session_state.get('analyzer')
+    if analyzer is None:
+        st.warning("⚠️ Dáta ešte nie sú načítané")
+        return
+    
+    with st.spinner("Pripravujem SQL tabuľky..."):
+        engine = get_sql_engine(analyzer, get_console_studio_analyzer())
+    
+    with st.expander("📋 Dostupné tabuľky", expanded=False):
+        for name, info in engine.tables.items():
+            st.markdown(f"**{name}** ({info['rows']:,} riadkov): `{', '.join(map(str, info['columns']))}`")
+    
+    example = (
+        "SELECT employee, date, minutes\n"
+        "FROM applications_daily\n"
+        "WHERE activity = 'Hry' AND minutes > 120\n"
+        "ORDER BY minutes DESC"
+    )
+    sql = st.text_area("✍️ SQL dotaz (len SELECT)", value=st.session_state.get('sql_console_query', example),
+                       height=160, key="sql_console_input")
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        max_rows = st.number_input("📊 Max. riadkov", min_value=10, max_value=50000,
+                                   value=DEFAULT_MAX_ROWS, step=100)
+    with col2:
+        timeout = st.number_input("⏱️ Časový limit (s)", min_value=1.0, max_value=60.0,
+                                  value=DEFAULT_TIMEOUT, step=1.0)
+    with col3:
+        st.write("")
+        run = st.button("▶️ Spustiť dotaz", type="primary", use_container_width=True)
+    
+    if not run:
+        return
+    
+    st.session_state.sql_console_query = sql
+    try:
+        result, truncated, duration = engine.execute(sql, max_rows=int(max_rows), timeout=float(timeout))
+    except (ValueError, TimeoutError) as e:
+        st.error(f"❌ {e}")
+        return
+    except Exception as e:
+        st.error(f"❌ Chyba v dotaze: {e}")
+        return
+    
+    st.caption(f"⚡ {len(result):,} riadkov za {duration * 1000:.0f} ms")
+    if truncated:
+        st.warning(f"⚠️ Výsledok bol orezaný na {int(max_rows):,} riadkov")
+    st.dataframe(result, use_container_width=True)
+    
+    if not result.empty:
+        st.download_button(
+            "📥 Stiahnuť CSV",
+            data=result.to_csv(index=False).encode('utf-8'),
+            file_name=f"sql_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
+
+def show_data_validation():
+    """Zobrazí uložený validačný report (počíta sa raz na snapshot pri načítaní dát)"""
+    from core.data_validation import CHECK_LABELS, get_validation_report, load_validation_report
+    
+    analyzer = st.session_state.get('analyzer')
+    report = get_validation_report(analyzer) if analyzer is not None else load_validation_report()
+    if report is None:
+        st.info("ℹ️ Validačný report ešte nebol vytvorený")
+        return
+    
+    st.caption(f"📅 Vytvorený: {report.get('created_at', '-')} | Snapshot: `{report.get('snapshot', '-')}`")
+    
+    summary = report.get('summary', {})
+    cols = st.columns(len(CHECK_LABELS))
+    for col, (name, label) in zip(cols, CHECK_LABELS.items()):
+        with col:
+            st.metric(label, summary.get(name, 0))
+    
+    if not any(summary.values()):
+        st.success("✅ Žiadne problémy v dátach")
+        return
+    
+    for name, label in CHECK_LABELS.items():
+        items = report.get('checks', {}).get(name, [])
+        if not items:
+            continue
+        with st.expander(f"⚠️ {label} ({len(items)})", expanded=False):
+            df = pd.DataFrame(items)
+            if 'files' in df.columns:
+                df['files'] = df['files'].apply(lambda files: ', '.join(files))
+            st.dataframe(df, use_container_width=True, hide_index=True)
@@ -560,14 +560,14 @@ def get_allowed_pages(user_email: str = None) -> list:
         
         # Admin má prístup ku všetkým stránkam
         if user_data.get('role') == 'admin':
-            return ['overview', 'employee', 'benchmark', 'heatmap', 'studio', 'kpi_system', 'admin', 'user_management']
+            return ['overview', 'employee', 'benchmark', 'heatmap', 'forecast', 'studio', 'kpi_system', 'admin', 'user_management']
         
         # Ak má definované page_permissions, použij ich
         if 'page_permissions' in user_data:
             return user_data['page_permissions']
         
         # Default oprávnenia pre manager role
-        return ['overview', 'employee', 'benchmark', 'heatmap', 'studio', 'kpi_system']
+        return ['overview', 'employee', 'benchmark', 'heatmap', 'forecast', 'studio', 'kpi_system']
         
     except Exception as e:
         logger.error(f"Error getting allowed pages: {e}")
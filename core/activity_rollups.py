@@ -0,0 +1,180 @@
+# core/activity_rollups.py
+from pathlib import Path
+
+import pandas as pd
+
+from core.data_loader import read_daily_report
+from core.utils import time_series_to_minutes
+
+
+# Stĺpce z reportov, ktoré nie sú časové hodnoty
+NON_TIME_COLUMNS = {
+    'Osoba ▲', 'Source_File', 'Date', 'Přihlašovací jméno', 'Unnamed: 1',
+    'Počet aktivních dnů', 'Denní průměr', 'Nečinnost'
+}
+
+
+def _report_files(data_path, data_type):
+    """Vráti zoznam denných reportov daného typu (rovnaký výber ako loadery v app.py)"""
+    data_path = Path(data_path)
+    if not data_path.exists():
+        return []
+
+    files = []
+    for f in sorted(data_path.glob("*.xlsx")):
+        name = f.name.lower()
+        if data_type == 'internet':
+            if 'internet' in name:
+                files.append(f)
+        elif 'application' in name and 'internet' not in name:
+            files.append(f)
+    return files
+
+
+def load_detailed_reports(data_path, data_type='internet'):
+    """Individuálne denné riadky zo všetkých reportov (bez agregácie, časy ako text)
+
+    Náhrada za load_*_detailed z app.py - core ich môže volať bez Streamlitu.
+    """
+    frames = []
+    for file in _report_files(data_path, data_type):
+        df = read_daily_report(file)
+        if df is not None and len(df) > 0:
+            frames.append(df)
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+class ActivityRollup:
+    """Materializované súčty aktivít osoba × mesiac a osoba × kvartál (v minútach)
+
+    Rollup sa nikdy neprepočítava od nuly - každý nový denný report sa
+    pripočíta k existujúcim bunkám cez ingest(). Denné riadky (v minútach)
+    ostávajú v self.daily pre dotazy nad konkrétnymi dňami. Súbory sa čítajú
+    cez read_daily_report, takže tie isté rámce, ktoré už načítali loadery.
+    """
+
+    def __init__(self, data_type='internet'):
+        self.data_type = data_type
+        self.monthly = pd.DataFrame()    # index (Osoba ▲, YYYY-MM)
+        self.quarterly = pd.DataFrame()  # index (Osoba ▲, YYYY-Qn)
+        self.daily = pd.DataFrame()      # riadok = osoba × report (Osoba ▲, Date, Source_File + minúty)
+        self.ingested_files = set()
+        self.failed_files = set()        # (meno, mtime) nečitateľných reportov
+        self.version = 0
+
+    def ingest(self, daily_df):
+        """Pripočíta denné riadky (ešte nezapočítané Source_File) do rollupov"""
+
+        if daily_df is None or daily_df.empty:
+            return 0
+
+        if 'Source_File' in daily_df.columns:
+            new_rows = daily_df[~daily_df['Source_File'].isin(self.ingested_files)]
+        else:
+            new_rows = daily_df
+
+        # Riadky bez dátumu sa nezapočítajú - nevedno, do ktorého mesiaca patria
+        dates = self._row_dates(new_rows)
+        new_rows, dates = new_rows[dates.notna()], dates[dates.notna()]
+        if new_rows.empty:
+            return 0
+
+        time_columns = [c for c in new_rows.columns if c not in NON_TIME_COLUMNS]
+        minutes = pd.DataFrame(
+            {col: time_series_to_minutes(new_rows[col]) for col in time_columns},
+            index=new_rows.index
+        )
+        minutes['Osoba ▲'] = new_rows['Osoba ▲'].astype(str).values
+        minutes['Month'] = dates.dt.strftime('%Y-%m').values
+        minutes['Quarter'] = (dates.dt.year.astype(str) + '-Q' + dates.dt.quarter.astype(str)).values
+
+        month_delta = minutes.drop(columns=['Quarter']).groupby(['Osoba ▲', 'Month']).sum()
+        quarter_delta = minutes.drop(columns=['Month']).groupby(['Osoba ▲', 'Quarter']).sum()
+
+        self.monthly = self._merge(self.monthly, month_delta)
+        self.quarterly = self._merge(self.quarterly, quarter_delta)
+
+        daily = minutes[['Osoba ▲'] + time_columns].reset_index(drop=True)
+        daily.insert(1, 'Date', dates.dt.strftime('%Y-%m-%d').values)
+        daily.insert(2, 'Source_File', new_rows['Source_File'].astype(str).values
+                     if 'Source_File' in new_rows.columns else 'unknown')
+        if not self.daily.empty:
+            daily = pd.concat([self.daily, daily], ignore_index=True)
+            daily[daily.columns[3:]] = daily[daily.columns[3:]].fillna(0).astype('int64')
+        self.daily = daily
+
+        if 'Source_File' in new_rows.columns:
+            self.ingested_files.update(new_rows['Source_File'].unique())
+        self.version += 1
+        return len(new_rows)
+
+    @staticmethod
+    def _row_dates(rows):
+        """Dátum riadku z Date stĺpca, fallback na dátum v názve súboru (NaT ak chýba oboje)"""
+        dates = pd.to_datetime(rows['Date'], errors='coerce') if 'Date' in rows.columns else None
+        if dates is None or dates.isna().any():
+            from_file = pd.to_datetime(
+                rows['Source_File'].astype(str).str.extract(r'(\d{4}-\d{2}-\d{2})')[0],
+                errors='coerce'
+            ) if 'Source_File' in rows.columns else pd.Series(pd.NaT, index=rows.index)
+            dates = from_file if dates is None else dates.fillna(from_file)
+        return dates
+
+    @staticmethod
+    def _merge(current, delta):
+        """Pričíta delta bunky k existujúcemu rollupu"""
+        if current.empty:
+            return delta.astype('int64')
+        return current.add(delta, fill_value=0).fillna(0).astype('int64')
+
+    def refresh(self, data_path):
+        """Načíta len nové reporty z priečinka a pripočíta ich"""
+        added = 0
+        for file in _report_files(data_path, self.data_type):
+            if file.name in self.ingested_files:
+                continue
+            stamp = (file.name, file.stat().st_mtime_ns)
+            if stamp in self.failed_files:
+                continue
+            df = read_daily_report(file)
+            if df is None or self._row_dates(df).isna().any():
+                # Poškodený súbor alebo riadky bez dátumu - znova sa skúsi až po zmene súboru (iný mtime)
+                self.failed_files.add(stamp)
+            if df is not None:
+                added += self.ingest(df)
+        return added
+
+    def persons(self):
+        """DataFrame s menami osôb - vstup pre find_matching_names"""
+        if self.monthly.empty:
+            return pd.DataFrame(columns=['Osoba ▲'])
+        return pd.DataFrame({'Osoba ▲': self.monthly.index.get_level_values(0).unique()})
+
+    def _cells(self, table, persons, columns=None):
+        if table.empty or not persons:
+            return pd.DataFrame()
+        mask = table.index.get_level_values(0).isin(persons)
+        cells = table[mask]
+        if columns is not None:
+            cells = cells.reindex(columns=[c for c in columns if c in cells.columns])
+        # Viac variantov mena jednej osoby sa sčíta
+        return cells.groupby(level=1).sum()
+
+    def monthly_for(self, persons, columns=None):
+        """Tabuľka mesiac × aktivita (minúty) pre dané mená"""
+        return self._cells(self.monthly, persons, columns)
+
+    def quarterly_for(self, persons, columns=None):
+        """Tabuľka kvartál × aktivita (minúty) pre dané mená"""
+        return self._cells(self.quarterly, persons, columns)
+
+    def monthly_dict(self, persons):
+        """Rovnaký formát ako DataAnalyzer.get_employee_monthly_data: {mesiac: {stĺpec: minúty}}"""
+        table = self.monthly_for(persons)
+        result = {}
+        for month, row in table.iterrows():
+            values = {col: int(v) for col, v in row.items() if v > 0}
+            result[month] = values
+        return result
@@ -0,0 +1,126 @@
+# core/aggregates.py
+import pandas as pd
+
+from core.employee_table import MONTH_COLUMNS
+
+
+COMPANY = 'company'
+
+
+def employee_aggregates(analyzer):
+    """Súhrn na zamestnanca: predaj po mesiacoch, poradie, denné hodiny aktivít a predikcia"""
+    from core.forecast_engine import ForecastEngine
+
+    table = analyzer.get_employee_table()
+    frame = pd.DataFrame({
+        'employee': table.names,
+        'workplace': [str(wp).lower() for wp in table.workplaces],
+    })
+    frame = pd.concat([frame, pd.DataFrame(table.sales, columns=MONTH_COLUMNS)], axis=1)
+    frame['total_sales'] = table.totals
+    frame['sales_rank'] = analyzer.get_leaderboard('total_sales').positions + 1
+
+    # Denný priemer všetkých sledovaných aktivít (hodiny) - rovnaké hodnoty ako percentilové pásma
+    for data_type in ('internet', 'applications'):
+        values = analyzer.get_percentile_bands(data_type).values
+        hours = values.sum(axis=1) if not values.empty else pd.Series(dtype=float)
+        frame[f'{data_type}_hours_day'] = hours.reindex(table.names).fillna(0.0).round(2).to_numpy()
+
+    if len(table):
+        forecast = ForecastEngine(table).month_ahead('trend')
+        frame['forecast_next_month'] = forecast['forecast'].round(0).to_numpy()
+    else:
+        frame['forecast_next_month'] = []
+    return frame
+
+
+def city_aggregates(employees):
+    """Súhrn po mestách zo súhrnu zamestnancov"""
+    if employees.empty:
+        return pd.DataFrame(columns=['workplace', 'employees', 'total_sales'])
+
+    grouped = employees.groupby('workplace', sort=True)
+    sums = grouped[MONTH_COLUMNS + ['total_sales', 'forecast_next_month']].sum()
+    sums.insert(0, 'employees', grouped.size())
+    hour_cols = [c for c in employees.columns if c.endswith('_hours_day')]
+    sums = sums.join(grouped[hour_cols].mean().round(2))
+    return sums.reset_index().sort_values('total_sales', ascending=False, ignore_index=True)
+
+
+def studio_aggregates(studio_analyzer, analyzer=None):
+    """Súhrn Studio predaja na zamestnanca (objednávky, kusy, tržby, kusy po spotrebičoch)"""
+    if studio_analyzer is None or studio_analyzer.df_active.empty:
+        return pd.DataFrame()
+
+    df = studio_analyzer.df_active
+    key = 'Kontaktní osoba-Jméno a příjmení'
+    grouped = df.groupby(key, sort=False, observed=True)
+    frame = pd.DataFrame({
+        'orders': grouped['Doklad'].nunique(),
+        'items': grouped.size(),
+        'revenue': grouped['Cena/jedn.'].sum(),
+    })
+    counts = pd.crosstab(df[key], df['Název_norm']).reindex(columns=studio_analyzer.APPLIANCES, fill_value=0)
+    frame = frame.join(counts).reset_index().rename(columns={key: 'employee'})
+
+    if 'workplace' in df.columns:
+        workplace = df.groupby(key, sort=False, observed=True)['workplace'].first().str.lower()
+        frame.insert(1, 'workplace', frame['employee'].map(workplace).fillna('unknown'))
+    else:
+        workplace = _studio_workplaces(analyzer, df)
+        frame.insert(1, 'workplace', frame['employee'].map(workplace).fillna('unknown'))
+    return frame.sort_values('revenue', ascending=False, ignore_index=True)
+
+
+def _studio_workplaces(analyzer, df):
+    """Studio meno -> mesto rovnakým párovaním ako filter miest na Studio stránke"""
+    if analyzer is None:
+        return {}
+    workplace = {}
+    for city in sorted(set(analyzer.get_employee_city_mapping().values())):
+        for name in analyzer.find_matching_studio_employees(df, [city]):
+            workplace.setdefault(name, city)
+    return workplace
+
+
+def build_aggregates(analyzer, studio_analyzer=None):
+    """Všetky agregáty pre aktuálny snapshot (cachované na analyzéri)
+
+    Returns:
+        dict: {'snapshot', 'employees', 'cities', 'studio'}
+    """
+    version = analyzer.get_analytics_engine().snapshot_version()
+    key = (version, id(studio_analyzer) if studio_analyzer is not None else None)
+
+    cached = getattr(analyzer, '_aggregates', None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    employees = employee_aggregates(analyzer)
+    aggregates = {
+        'snapshot': version,
+        'employees': employees,
+        'cities': city_aggregates(employees),
+        'studio': studio_aggregates(studio_analyzer, analyzer),
+    }
+    analyzer._aggregates = (key, aggregates)
+    return aggregates
+
+
+def scope_tables(aggregates, scope=COMPANY):
+    """Tabuľky pre export jedného rozsahu - firma = všetko, mesto = len jeho riadky"""
+    tables = {name: aggregates[name] for name in ('employees', 'cities', 'studio')}
+    if scope == COMPANY:
+        return tables
+    return {
+        name: df[df['workplace'] == scope].reset_index(drop=True) if 'workplace' in df.columns else df
+        for name, df in tables.items()
+    }
+
+
+def workplaces(aggregates):
+    """Mestá, pre ktoré sa robí samostatný export"""
+    cities = aggregates['cities']
+    if cities.empty:
+        return []
+    return [wp for wp in cities['workplace'] if wp and wp != 'unknown']
@@ -0,0 +1,238 @@
+# core/analytics_engine.py
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.benchmark_engine import PERIOD_MONTHS
+from core.employee_table import MONTH_COLUMNS
+
+
+GROUP_COLUMNS = ['workplace', 'employee', 'quarter', 'month']
+FILTER_COLUMNS = ['workplace', 'employee', 'quarter', 'month']
+
+# Zdieľaná pamäť výsledkov - rovnaká otázka nad rovnakým snapshotom sa počíta raz
+_QUERY_CACHE = OrderedDict()
+_QUERY_CACHE_SIZE = 256
+
+
+def _quarter_of(month_index):
+    return f"Q{month_index // 3 + 1}"
+
+
+class AnalyticsEngine:
+    """Deklaratívne dotazy nad faktovými tabuľkami analyzéra
+
+    Metriky:
+        'sales'                     - súčet predaja (Kč)
+        'avg_sales'                 - priemerný predaj na zamestnanca
+        'employees'                 - počet zamestnancov
+        'internet:<stĺpec>'         - hodiny internet aktivity (napr. 'internet:Mail')
+        'applications:<stĺpec>'     - hodiny aplikačnej aktivity
+    """
+
+    ACTIVITY_TYPES = ('internet', 'applications')
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self._facts = {}     # kľúč -> (verzia zdrojov, DataFrame)
+        self._sales = None   # (tabuľka, odtlačok)
+        self._rollups = {}   # typ -> (rollup, verzia rollupu, odtlačok)
+        self._mapping = None # (name_mapping, počet položiek, odtlačok)
+
+    # ==================== SNAPSHOT ====================
+
+    def _sales_token(self):
+        """Odtlačok tabuľky predaja (prepočet len pri novej EmployeeTable)"""
+        table = self.analyzer.get_employee_table()
+        if self._sales is None or self._sales[0] is not table:
+            digest = hashlib.md5()
+            digest.update(table.sales.tobytes())
+            digest.update('|'.join(map(str, table.names)).encode())
+            digest.update('|'.join(map(str, table.workplaces)).encode())
+            self._sales = (table, digest.hexdigest())
+        return self._sales[1]
+
+    def _activity_token(self, data_type):
+        """Odtlačok rollupu aktivít (načíta / doplní denné reporty)"""
+        rollup = self.analyzer.get_activity_rollup(data_type)
+        cached = self._rollups.get(data_type)
+        if cached is None or cached[0] is not rollup or cached[1] != rollup.version:
+            digest = hashlib.md5(data_type.encode())
+            digest.update('|'.join(sorted(rollup.ingested_files)).encode())
+            cached = self._rollups[data_type] = (rollup, rollup.version, digest.hexdigest())
+        return cached[2]
+
+    def _mapping_token(self):
+        """Odtlačok name_mapping - mení priradenie aktivít k zamestnancom
+
+        _create_name_mapping vždy vytvorí nový dict, takže stačí prepočet pri
+        novom objekte (alebo inom počte položiek).
+        """
+        mapping = self.analyzer.name_mapping
+        cached = self._mapping
+        if cached is None or cached[0] is not mapping or cached[1] != len(mapping):
+            items = sorted((str(k), str(v)) for k, v in mapping.items())
+            cached = self._mapping = (mapping, len(mapping), hashlib.md5(repr(items).encode()).hexdigest())
+        return cached[2]
+
+    def snapshot_version(self, data_types=ACTIVITY_TYPES):
+        """Odtlačok dát pre dotaz - tabuľka predaja a len tie rollupy, ktoré dotaz potrebuje
+
+        Bez data_types (napr. čisto predajné dotazy) sa denné reporty vôbec nečítajú.
+        """
+        parts = [self._sales_token()]
+        if data_types:
+            parts += [self._activity_token(t) for t in data_types]
+            parts.append(self._mapping_token())
+        return hashlib.md5('|'.join(parts).encode()).hexdigest()[:12]
+
+    def _cached_facts(self, key, version, build):
+        cached = self._facts.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._facts[key] = (version, build())
+        return cached[1]
+
+    # ==================== FAKTOVÉ TABUĽKY ====================
+
+    def sales_facts(self):
+        """Tidy tabuľka zamestnanec × mesiac s predajom"""
+        return self._cached_facts('sales', self.snapshot_version(()), self._build_sales_facts)
+
+    def _build_sales_facts(self):
+        table = self.analyzer.get_employee_table()
+        n, m = table.sales.shape
+        month_index = np.tile(np.arange(m), n)
+        return pd.DataFrame({
+            'employee': np.repeat(table.names, m),
+            'workplace': np.repeat([str(wp).lower() for wp in table.workplaces], m),
+            'month': np.array(MONTH_COLUMNS)[month_index],
+            'quarter': [_quarter_of(i) for i in month_index],
+            'value': table.sales.ravel(),
+        })
+
+    def activity_facts(self, data_type):
+        """Tidy tabuľka zamestnanec × mesiac × aktivita s minútami z rollupu"""
+        return self._cached_facts(f'activity:{data_type}', self.snapshot_version((data_type,)),
+                                  lambda: self._build_activity_facts(data_type))
+
+    def _build_activity_facts(self, data_type):
+        monthly = self.analyzer.get_activity_rollup(data_type).monthly
+        if monthly.empty:
+            return pd.DataFrame(columns=['employee', 'workplace', 'person', 'year_month',
+                                         'month', 'quarter', 'activity', 'value'])
+
+        facts = monthly.stack().rename('value').reset_index()
+        facts.columns = ['person', 'year_month', 'activity', 'value']
+
+        # Osoba z monitoringu -> zamestnanec cez name_mapping
+        person_emp = self.analyzer.person_to_employee(facts['person'].unique())
+
+        facts['employee'] = facts['person'].map(lambda p: person_emp[p][0])
+        facts['workplace'] = facts['person'].map(lambda p: person_emp[p][1])
+        month_index = facts['year_month'].str[5:7].astype(int) - 1
+        facts['month'] = np.array(MONTH_COLUMNS)[month_index]
+        facts['quarter'] = [_quarter_of(i) for i in month_index]
+        return facts
+
+    # ==================== DOTAZY ====================
+
+    @staticmethod
+    def normalize_query(metric, group_by=None, filters=None, period=None):
+        """Kanonický tvar dotazu (poradie a veľkosť písmen nehrajú rolu)"""
+        if isinstance(group_by, str):
+            group_by = [group_by]
+        group_by = tuple(col for col in GROUP_COLUMNS if col in (group_by or []))
+
+        normalized_filters = []
+        for col, values in sorted((filters or {}).items()):
+            if col not in FILTER_COLUMNS:
+                raise ValueError(f"Nepodporovaný filter: {col}")
+            if isinstance(values, str):
+                values = [values]
+            values = tuple(sorted(str(v) if col == 'employee' else str(v).lower() for v in values))
+            normalized_filters.append((col, values))
+
+        if period is None:
+            months = None
+        elif isinstance(period, str):
+            if period.lower() not in PERIOD_MONTHS:
+                raise ValueError(f"Neznáme obdobie: {period}")
+            months = tuple(PERIOD_MONTHS[period.lower()])
+        else:
+            months = tuple(m for m in MONTH_COLUMNS if m in {str(p).lower() for p in period})
+
+        return (metric, group_by, tuple(normalized_filters), months)
+
+    def query(self, metric, group_by=None, filters=None, period=None):
+        """Vráti tidy DataFrame so stĺpcami group_by + 'metric' + 'value'"""
+        normalized = self.normalize_query(metric, group_by, filters, period)
+        data_types = tuple(t for t in self.ACTIVITY_TYPES if metric.startswith(f'{t}:'))
+        cache_key = (self.snapshot_version(data_types), normalized)
+        if cache_key in _QUERY_CACHE:
+            _QUERY_CACHE.move_to_end(cache_key)
+            return _QUERY_CACHE[cache_key].copy()
+
+        result = self._execute(*normalized)
+
+        _QUERY_CACHE[cache_key] = result
+        while len(_QUERY_CACHE) > _QUERY_CACHE_SIZE:
+            _QUERY_CACHE.popitem(last=False)
+        return result.copy()
+
+    def _execute(self, metric, group_by, filters, months):
+        """Plán: výber faktovej tabuľky -> filtre -> obdobie -> agregácia"""
+        if metric in ('sales', 'avg_sales', 'employees'):
+            facts = self.sales_facts()
+        elif ':' in metric and metric.split(':', 1)[0] in ('internet', 'applications'):
+            data_type, activity = metric.split(':', 1)
+            facts = self.activity_facts(data_type)
+            facts = facts[facts['activity'] == activity]
+        else:
+            raise ValueError(f"Neznáma metrika: {metric}")
+
+        mask = np.ones(len(facts), dtype=bool)
+        for col, values in filters:
+            column = facts[col].astype(str)
+            mask &= (column if col == 'employee' else column.str.lower()).isin(values).to_numpy()
+        if months is not None:
+            mask &= facts['month'].isin(months).to_numpy()
+        facts = facts[mask]
+
+        group_cols = list(group_by)
+        if metric == 'employees':
+            if group_cols:
+                result = facts.groupby(group_cols, sort=False)['employee'].nunique().reset_index(name='value')
+            else:
+                result = pd.DataFrame({'value': [facts['employee'].nunique()]})
+        elif metric == 'avg_sales':
+            # Najprv súčet na zamestnanca v rámci skupiny, potom priemer cez zamestnancov
+            outer_cols = [c for c in group_cols if c != 'employee']
+            per_employee = facts.groupby(outer_cols + ['employee'], sort=False)['value'].sum()
+            if 'employee' in group_cols:
+                result = per_employee.reset_index()[group_cols + ['value']]
+            elif outer_cols:
+                result = per_employee.groupby(level=outer_cols, sort=False).mean().reset_index()
+            else:
+                result = pd.DataFrame({'value': [per_employee.mean() if len(per_employee) else 0.0]})
+        else:
+            values = facts['value'] / 60 if ':' in metric else facts['value']
+            if group_cols:
+                result = values.groupby([facts[c] for c in group_cols], sort=False).sum().reset_index()
+            else:
+                result = pd.DataFrame({'value': [float(values.sum())]})
+
+        result.columns = group_cols + ['value'] if group_cols else ['value']
+        result.insert(len(group_cols), 'metric', metric)
+
+        # Mesiace a štvrťroky v kalendárnom poradí
+        if 'month' in group_cols or 'quarter' in group_cols:
+            order_cols = []
+            if 'quarter' in group_cols:
+                order_cols.append(result['quarter'])
+            if 'month' in group_cols:
+                order_cols.append(result['month'].map({m: i for i, m in enumerate(MONTH_COLUMNS)}))
+            order = np.lexsort(tuple(reversed([c.to_numpy() for c in order_cols])))
+            result = result.iloc[order]
+        return result.reset_index(drop=True)
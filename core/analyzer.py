@@ -1,8 +1,13 @@
 # core/analyzer.py
+import numpy as np
 import pandas as pd
 import unicodedata
 from difflib import SequenceMatcher
 from core.utils import time_to_minutes
+from core.activity_rollups import ActivityRollup, load_detailed_reports
+from core.anomaly_detection import AnomalyDetector, ANOMALY_COLUMNS
+from core.employee_table import EmployeeTable
+from core.leaderboard import Leaderboard
 
 
 class DataAnalyzer:
@@ -14,6 +19,13 @@ class DataAnalyzer:
         self.applications_data = None
         self.name_mapping = {}
         self.data_path = None  # ✅ PRIDANÉ
+        self.activity_rollups = {}  # data_type -> ActivityRollup
+        self.anomaly_detectors = {}  # data_type -> AnomalyDetector
+        self._percentile_bands = {}  # data_type -> ((rollup.version, table), PercentileBands)
+        self._leaderboards = None  # {'table': EmployeeTable, 'boards': {metrika: Leaderboard}}
+        self._employee_table = None
+        self._person_employees = None  # (EmployeeTable, name_mapping, {kanonické meno: (zamestnanec, mesto)})
+        self._analytics_engine = None
         
     def load_data(self, sales_data, internet_data=None, applications_data=None, data_path=None):
         """Načíta všetky dáta do analyzátora"""
@@ -145,12 +157,8 @@ class DataAnalyzer:
     def analyze_employee(self, employee_name):
         
         
-        # Nájdenie zamestnanca v sales dátach
-        employee_data = None
-        for emp in self.sales_employees:
-            if emp.get('name') == employee_name:
-                employee_data = emp
-                break
+        # Nájdenie zamestnanca v sales dátach (hash index)
+        employee_data = self.get_employee_by_name(employee_name)
         
         if not employee_data:
             return {'error': f'Employee {employee_name} not found'}
@@ -700,66 +708,171 @@ class DataAnalyzer:
     def validate_sales_consistency(self):
         """Skontroluje konzistenciu sales dát"""
         
-        inconsistencies = []
+        from core.data_validation import check_sales_totals
+        return check_sales_totals(self.get_employee_table())
+    
+    def get_validation_report(self):
+        """Validačný report snapshotu (24h dni, duplicitné dni, sales, nespárované mená)"""
         
-        for emp in self.sales_employees:
-            name = emp.get('name', 'Unknown')
-            
-            # Porovnanie rôznych zdrojov
-            monthly_total = sum(emp.get('monthly_sales', {}).values()) if emp.get('monthly_sales') else 0
-            direct_total = emp.get('total_sales', 0)
-            
-            if monthly_total > 0 and direct_total > 0 and abs(monthly_total - direct_total) > 1:
-                inconsistencies.append({
-                    'name': name,
-                    'monthly_total': monthly_total,
-                    'direct_total': direct_total,
-                    'difference': abs(monthly_total - direct_total)
-                })
+        from core.data_validation import get_validation_report
+        return get_validation_report(self)
+    
+    def get_employee_table(self):
+        """Stĺpcová tabuľka zamestnancov - prestaví sa len pri zmene sales_employees"""
+        
+        table = self._employee_table
+        if table is None or table.records is not self.sales_employees or len(table) != len(self.sales_employees):
+            table = EmployeeTable(self.sales_employees)
+            self._employee_table = table
+        return table
+    
+    def person_to_employee(self, persons):
+        """Osoba z monitoringu -> (zamestnanec, pracovisko) cez kanonické meno z name_mappingu
+
+        Osoba bez zamestnanca v sales ostáva sama sebou s pracoviskom 'unknown'.
+        Mapovanie kanonické meno -> zamestnanec sa zostaví raz na EmployeeTable a name_mapping.
+        """
+        
+        table = self.get_employee_table()
+        cached = self._person_employees
+        if cached is None or cached[0] is not table or cached[1] is not self.name_mapping:
+            canon_to_emp = {}
+            for emp in table.records:
+                canon = self.name_mapping.get(emp.get('name', ''))
+                if canon and canon not in canon_to_emp:
+                    canon_to_emp[canon] = (emp.get('name'), str(emp.get('workplace', 'unknown')).lower())
+            cached = self._person_employees = (table, self.name_mapping, canon_to_emp)
+        
+        canon_to_emp = cached[2]
+        return {p: canon_to_emp.get(self.name_mapping.get(p), (p, 'unknown')) for p in persons}
+    
+    def get_analytics_engine(self):
+        """Deklaratívne dotazy (AnalyticsEngine.query) nad dátami tohto analyzátora"""
+        
+        if self._analytics_engine is None:
+            from core.analytics_engine import AnalyticsEngine
+            self._analytics_engine = AnalyticsEngine(self)
+        return self._analytics_engine
+    
+    def get_leaderboard(self, metric='total_sales'):
+        """Zoradený index zamestnancov pre metriku (raz na snapshot)
+        
+        Metriky: 'total_sales', 'sales:<obdobie>' (q1..q4, h1, h2, year),
+        '<metrika>_score' zo skóre metrík (sales, mail, sketchup, internet, overall)
+        """
+        
+        table = self.get_employee_table()
+        if self._leaderboards is None or self._leaderboards['table'] is not table:
+            self._leaderboards = {'table': table, 'boards': {}}
+        boards = self._leaderboards['boards']
+        
+        if metric not in boards:
+            if metric == 'total_sales':
+                values = table.totals
+            elif metric.startswith('sales:'):
+                from core.benchmark_engine import BenchmarkEngine
+                values = BenchmarkEngine(table).period_sales(metric.split(':', 1)[1])
+            elif metric.endswith('_score'):
+                from core.metrics_calculator import EmployeeMetricsCalculator
+                scores = EmployeeMetricsCalculator(self).calculate_all_employees_metrics()
+                column = metric[:-len('_score')]
+                if column not in scores.columns:
+                    raise ValueError(f"Neznáma metrika: {metric}")
+                values = scores[column].fillna(0).to_numpy()
+            else:
+                raise ValueError(f"Neznáma metrika: {metric}")
+            boards[metric] = Leaderboard(values, table.names)
         
-        return inconsistencies
+        return boards[metric]
     
     def get_employee_by_name(self, name):
         """Nájde zamestnanca podľa mena"""
         
-        for emp in self.sales_employees:
-            if emp.get('name') == name:
-                return emp
-        return None
+        return self.get_employee_table().get(name)
     
     def get_employees_by_workplace(self, workplace):
         """Vráti zamestnancov podľa pracoviska"""
         
-        return [emp for emp in self.sales_employees if emp.get('workplace', '').lower() == workplace.lower()]
+        return self.get_employee_table().by_workplace(workplace)
     
     def calculate_company_statistics(self):
         """Vypočíta celkové štatistiky firmy"""
         
-        total_sales = 0
-        total_employees = len(self.sales_employees)
-        workplace_stats = {}
+        return self.get_employee_table().company_statistics()
+    
+    def get_activity_rollup(self, data_type='internet'):
+        """Vráti rollup osoba × mesiac/kvartál, nové denné reporty sa len pripočítajú"""
         
-        for emp in self.sales_employees:
-            emp_sales = sum(emp.get('monthly_sales', {}).values()) if emp.get('monthly_sales') else 0
-            total_sales += emp_sales
-            
-            workplace = emp.get('workplace', 'unknown')
-            if workplace not in workplace_stats:
-                workplace_stats[workplace] = {'count': 0, 'sales': 0}
-            
-            workplace_stats[workplace]['count'] += 1
-            workplace_stats[workplace]['sales'] += emp_sales
+        data_type = 'internet' if data_type == 'internet' else 'applications'
+        rollup = self.activity_rollups.get(data_type)
+        if rollup is None:
+            rollup = ActivityRollup(data_type)
+            self.activity_rollups[data_type] = rollup
         
-        return {
-            'total_sales': total_sales,
-            'total_employees': total_employees,
-            'average_sales_per_employee': total_sales / total_employees if total_employees > 0 else 0,
-            'workplace_stats': workplace_stats
-        }
+        if self.data_path:
+            rollup.refresh(self.data_path)
+        
+        return rollup
+    
+    def get_percentile_bands(self, data_type='internet'):
+        """Percentilové pásma aktivít pre firmu a mestá (prepočet len pri zmene dát)"""
+        
+        from core.percentile_bands import PercentileBands
+        rollup = self.get_activity_rollup(data_type)
+        key = (rollup.version, self.get_employee_table())
+        
+        cached = self._percentile_bands.get(data_type)
+        if cached is None or cached[0][0] != key[0] or cached[0][1] is not key[1]:
+            cached = (key, PercentileBands(self, data_type))
+            self._percentile_bands[data_type] = cached
+        return cached[1]
+    
+    def get_activity_anomalies(self):
+        """Anomálie dennej aktivity všetkých osôb (skórujú sa len novo pribudnuté dni)"""
+        
+        frames = []
+        for data_type in ('internet', 'applications'):
+            detector = self.anomaly_detectors.get(data_type)
+            if detector is None:
+                detector = AnomalyDetector(data_type)
+                self.anomaly_detectors[data_type] = detector
+            found = detector.update(self.get_activity_rollup(data_type))
+            if not found.empty:
+                frames.append(found)
+        
+        if not frames:
+            return pd.DataFrame(columns=['employee', 'workplace'] + ANOMALY_COLUMNS)
+        anomalies = pd.concat(frames, ignore_index=True)
+        
+        # Osoba z monitoringu -> zamestnanec a pracovisko zo sales
+        person_emp = self.person_to_employee(anomalies['person'].unique())
+        anomalies.insert(0, 'employee', anomalies['person'].map(lambda p: person_emp[p][0]))
+        anomalies.insert(1, 'workplace', anomalies['person'].map(lambda p: person_emp[p][1]))
+        # Najnovšie dni hore, v rámci dňa najväčšia odchýlka
+        order = np.lexsort((anomalies['z_score'].abs().to_numpy(), anomalies['date'].to_numpy(dtype=str)))[::-1]
+        return anomalies.iloc[order].reset_index(drop=True)
+    
+    def get_employee_monthly_activity(self, employee_name, data_type='internet', columns=None, period='month'):
+        """Predpočítané minúty aktivít zamestnanca po mesiacoch ('month') alebo kvartáloch ('quarter')"""
+        
+        rollup = self.get_activity_rollup(data_type)
+        matching_names = self.find_matching_names(employee_name, rollup.persons())
+        if not matching_names:
+            return pd.DataFrame()
+        
+        if period == 'quarter':
+            return rollup.quarterly_for(matching_names, columns)
+        return rollup.monthly_for(matching_names, columns)
     
     def get_employee_monthly_data(self, employee_name, data_type='internet'):
         """Získa mesačné dáta pre konkrétneho zamestnanca agregované podľa mesiacov"""
         
+        # Primárne z materializovaného rollupu (bez prechádzania riadkov)
+        rollup = self.get_activity_rollup(data_type)
+        if not rollup.monthly.empty:
+            matching_names = self.find_matching_names(employee_name, rollup.persons())
+            return rollup.monthly_dict(matching_names) if matching_names else {}
+        
         if data_type == 'internet':
             data_source = self.internet_data
         else:
@@ -773,64 +886,15 @@ class DataAnalyzer:
         if not matching_names:
             return {}
             
-        # Filtrovanie dát pre zamestnanca
+        # Fallback bez data_path: jednorazový rollup z načítaných dát
         employee_data = data_source[data_source['Osoba ▲'].isin(matching_names)]
         
         if employee_data.empty:
             return {}
-            
-        monthly_data = {}
-        
-        # Pre každý riadok dát
-        for _, row in employee_data.iterrows():
-            # Extrahovanie dátumu zo Source_File
-            month = None
-            
-            # 1. Pokus - Source_File stĺpec (z názvu súboru ako Report_Internet_TotalActiveTime_2025-08-16_12-00-35.xlsx)
-            if 'Source_File' in row and pd.notna(row['Source_File']):
-                import re
-                filename = str(row['Source_File'])
-                # Hľadáme vzor YYYY-MM-DD v názve súboru
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
-                if date_match:
-                    date_str = date_match.group(1)
-                    try:
-                        from datetime import datetime
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        month = date_obj.strftime('%Y-%m')
-                    except:
-                        pass
-            
-            # 2. Pokus - ak máme nejaký dátumový stĺpec v dátach
-            if not month and 'Date' in row and pd.notna(row['Date']):
-                try:
-                    date_val = pd.to_datetime(row['Date'])
-                    month = date_val.strftime('%Y-%m')
-                except:
-                    pass
-            
-            # 3. Pokus - default na aktuálny mesiac
-            if not month:
-                from datetime import datetime
-                month = datetime.now().strftime('%Y-%m')
-            
-            if month not in monthly_data:
-                monthly_data[month] = {}
-                
-            # Agreguj všetky časové stĺpce
-            for col in row.index:
-                if col in ['Osoba ▲', 'Source_File', 'Date']:
-                    continue
-                    
-                time_value = row[col]
-                if pd.notna(time_value) and str(time_value) not in ['0:00', 'nan', '']:
-                    minutes = time_to_minutes(str(time_value))
-                    if minutes > 0:
-                        if col not in monthly_data[month]:
-                            monthly_data[month][col] = 0
-                        monthly_data[month][col] += minutes
-        
-        return monthly_data
+        
+        fallback = ActivityRollup(data_type)
+        fallback.ingest(employee_data)
+        return fallback.monthly_dict(matching_names)
     
     def get_all_employees_averages(self, data_type='internet'):
         """Vypočíta priemery všetkých zamestnancov - OPRAVENÉ pre agregované dáta"""
@@ -851,11 +915,9 @@ class DataAnalyzer:
         # Pokús sa zistiť počet dní z timeline dát
         try:
             if data_type == 'internet':
-                from app import load_internet_data_detailed
-                detailed_data = load_internet_data_detailed()
+                detailed_data = load_detailed_reports(self.data_path or 'data/raw', 'internet')
             else:
-                from app import load_applications_data_detailed  
-                detailed_data = load_applications_data_detailed()
+                detailed_data = load_detailed_reports(self.data_path or 'data/raw', 'applications')
             
             # Ak máme detailné dáta, spočítaj skutočný denný priemer
             if detailed_data is not None and not detailed_data.empty:
@@ -1046,11 +1108,9 @@ class DataAnalyzer:
         try:
             # Pokus sa načítať detailné dáta
             if data_type == 'internet':
-                from app import load_internet_data_detailed
-                detailed_data = load_internet_data_detailed()
+                detailed_data = load_detailed_reports(self.data_path or 'data/raw', 'internet')
             else:
-                from app import load_applications_data_detailed  
-                detailed_data = load_applications_data_detailed()
+                detailed_data = load_detailed_reports(self.data_path or 'data/raw', 'applications')
             
             if detailed_data is None or detailed_data.empty:
                 return pd.DataFrame()
@@ -0,0 +1,135 @@
+# core/anomaly_detection.py
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Aktivita -> smer, ktorý sledujeme (+1 nárast, -1 pokles)
+WATCHED_ACTIVITIES = {
+    'Hry': 1,
+    'Nepracovni weby': 1,
+    'hladanie prace': 1,
+    'Čas celkem ▼': -1,
+}
+WINDOW = 10          # počet predchádzajúcich dní v baseline
+MIN_HISTORY = 4      # minimálny počet dní s dátami v okne
+Z_THRESHOLD = 3.5    # robustné z-skóre (medián / MAD)
+MIN_SCALE = 10       # minimálna odchýlka v minútach (MAD môže byť 0)
+MIN_DELTA = 30       # minimálna zmena v minútach, aby to bola anomália
+MAD_TO_STD = 1.4826
+
+ANOMALY_COLUMNS = ['source', 'person', 'date', 'activity', 'minutes', 'baseline', 'z_score', 'direction']
+
+
+def daily_cube(daily, activities):
+    """Kocka osoba × deň × aktivita (minúty) z denných riadkov rollupu
+
+    Ak je pre deň viac reportov, berie sa posledný (názvy súborov nesú čas exportu).
+
+    Returns:
+        tuple: (osoby, dni, aktivity, 3D pole s NaN tam, kde osoba v daný deň nemá záznam)
+    """
+    activities = [a for a in activities if a in daily.columns]
+    if daily.empty or not activities:
+        return np.array([]), np.array([]), activities, np.empty((0, 0, len(activities)))
+
+    latest = (daily.sort_values('Source_File')
+                   .drop_duplicates(['Osoba ▲', 'Date'], keep='last'))
+    persons, person_idx = np.unique(latest['Osoba ▲'].to_numpy(dtype=str), return_inverse=True)
+    dates, date_idx = np.unique(latest['Date'].to_numpy(dtype=str), return_inverse=True)
+
+    cube = np.full((len(persons), len(dates), len(activities)), np.nan)
+    cube[person_idx, date_idx, :] = latest[activities].to_numpy(dtype=float)
+    return persons, dates, activities, cube
+
+
+def robust_scores(cube, window=WINDOW, min_history=MIN_HISTORY):
+    """Robustné z-skóre každého dňa voči predchádzajúcim `window` dňom (po osobách a aktivitách)
+
+    Returns:
+        tuple: (baseline medián, z-skóre) - polia rovnakého tvaru ako cube
+    """
+    persons, days, activities = cube.shape
+    padded = np.concatenate([np.full((persons, window, activities), np.nan), cube], axis=1)
+    # Okno pre deň d = dni d-window .. d-1 (bez aktuálneho dňa)
+    history = sliding_window_view(padded, window, axis=1)[:, :days, :, :]
+
+    counts = np.sum(~np.isnan(history), axis=-1)
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        # Prázdne okná (All-NaN slice) sú očakávané - nemajú históriu
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = np.nanmedian(history, axis=-1)
+        mad = np.nanmedian(np.abs(history - median[..., None]), axis=-1) * MAD_TO_STD
+        scale = np.maximum(np.nan_to_num(mad), MIN_SCALE)
+        z = (cube - median) / scale
+
+    z[counts < min_history] = np.nan
+    return median, z
+
+
+def detect(daily, data_type, dates=None):
+    """Anomálie v denných dátach jedného typu (internet / applications)
+
+    Args:
+        dates: ak je zadané, vyhodnotia sa len tieto dni (história sa berie celá)
+    """
+    persons, all_dates, activities, cube = daily_cube(daily, WATCHED_ACTIVITIES)
+    if cube.size == 0:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+
+    median, z = robust_scores(cube)
+    direction = np.array([WATCHED_ACTIVITIES[a] for a in activities], dtype=float)
+
+    delta = (cube - median) * direction
+    with np.errstate(invalid='ignore'):
+        flagged = (z * direction > Z_THRESHOLD) & (delta >= MIN_DELTA)
+    if dates is not None:
+        flagged &= np.isin(all_dates, list(dates))[None, :, None]
+
+    p, d, a = np.nonzero(flagged)
+    return pd.DataFrame({
+        'source': data_type,
+        'person': persons[p],
+        'date': all_dates[d],
+        'activity': np.array(activities, dtype=object)[a],
+        'minutes': cube[p, d, a],
+        'baseline': median[p, d, a],
+        'z_score': np.round(z[p, d, a], 1),
+        'direction': np.where(direction[a] > 0, 'nárast', 'pokles'),
+    }, columns=ANOMALY_COLUMNS)
+
+
+class AnomalyDetector:
+    """Inkrementálna detekcia anomálií nad ActivityRollup.daily
+
+    Každý deň sa vyhodnotí raz - po príchode nových reportov sa skórujú len
+    nové dni (alebo dni, ku ktorým pribudol ďalší report) a dni po nich, lebo
+    zmenený deň je v baseline nasledujúcich dní. Skoršie nálezy ostávajú.
+    """
+
+    def __init__(self, data_type):
+        self.data_type = data_type
+        self.anomalies = pd.DataFrame(columns=ANOMALY_COLUMNS)
+        self.scored_dates = {}  # dátum -> počet reportov pri vyhodnotení
+        self.rollup_version = None
+
+    def update(self, rollup):
+        """Vyhodnotí dni, ktoré pribudli od posledného behu"""
+        if rollup.version == self.rollup_version or rollup.daily.empty:
+            return self.anomalies
+
+        reports = rollup.daily.groupby('Date')['Source_File'].nunique()
+        changed = [date for date, n in reports.items() if self.scored_dates.get(date) != n]
+        if changed:
+            # Dopočítaný deň uprostred série mení okno všetkých neskorších dní (dátumy YYYY-MM-DD)
+            rescored = {date for date in reports.index if date >= min(changed)}
+            found = detect(rollup.daily, self.data_type, rescored)
+            kept = self.anomalies[~self.anomalies['date'].isin(rescored)]
+            parts = [df for df in (kept, found) if not df.empty]
+            self.anomalies = pd.concat(parts, ignore_index=True) if parts else found
+            self.scored_dates.update({date: int(reports[date]) for date in rescored})
+
+        self.rollup_version = rollup.version
+        return self.anomalies
@@ -0,0 +1,258 @@
+# core/api_server.py
+"""Lokálne read-only JSON API nad predpočítanými agregátmi (bez Streamlitu)
+
+    python -m core.api_server --port 8765
+
+Endpointy (len GET/HEAD):
+    /api/health                  - snapshot a čas posledného prepočtu
+    /api/employees               - súhrn všetkých zamestnancov
+    /api/employees/<meno>        - jeden zamestnanec
+    /api/cities                  - súhrn po mestách
+    /api/cities/<mesto>          - mesto + jeho zamestnanci
+    /api/studio                  - Studio predaj na zamestnanca
+
+Odpovede nesú ETag; pri zhode If-None-Match sa vráti 304 bez tela.
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from core import data_loader
+from core.data_loader import folder_signature
+from core.aggregates import build_aggregates
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+REFRESH_INTERVAL = 60  # s - ako často sa kontroluje, či pribudli nové súbory
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _records(df):
+    """DataFrame -> zoznam dictov s NaN ako null"""
+    if df is None or df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+class AggregateStore:
+    """Drží analyzer a JSON odpovede pre aktuálny snapshot
+
+    Telo každej odpovede sa serializuje raz na snapshot (pri prvom dopyte)
+    a ETag je odtlačok tela - klient s platným ETagom dostane 304.
+    """
+
+    def __init__(self, raw_path=data_loader.RAW_DATA_PATH, sales_path=data_loader.SALES_DATA_PATH,
+                 studio_path=data_loader.STUDIO_DATA_PATH, refresh_interval=REFRESH_INTERVAL):
+        self.raw_path = raw_path
+        self.sales_path = sales_path
+        self.studio_path = studio_path
+        self.refresh_interval = refresh_interval
+
+        self.signature = None
+        self.state = None  # snapshot, built_at, aggregates, responses - mení sa naraz
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Prepočíta agregáty, ak sa zmenili zdrojové súbory (najviac raz za refresh_interval)"""
+        now = time.monotonic()
+        if not force and self.state is not None and now - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            if not force and self.state is not None and now - self._checked_at < self.refresh_interval:
+                return
+            self._checked_at = now
+            signature = folder_signature(self.raw_path, self.sales_path, self.studio_path)
+            if signature == self.signature and not force:
+                return
+
+            analyzer = data_loader.build_analyzer(False, self.raw_path, self.sales_path)
+            studio_analyzer = None
+            studio_file = data_loader.find_studio_file(self.studio_path)
+            if studio_file:
+                from core.studio_analyzer import StudioAnalyzer
+                studio_analyzer = StudioAnalyzer(studio_file)
+            aggregates = build_aggregates(analyzer, studio_analyzer)
+
+            # Meno bez okrajových medzier -> prvý riadok zamestnanca
+            employee_index = {}
+            for position, name in enumerate(aggregates['employees']['employee']):
+                employee_index.setdefault(str(name).strip(), position)
+
+            self.signature = signature
+            self.state = {
+                'snapshot': aggregates['snapshot'],
+                'built_at': datetime.now().isoformat(timespec='seconds'),
+                'aggregates': aggregates,
+                'employee_index': employee_index,
+                'responses': {},
+            }
+
+    @property
+    def snapshot(self):
+        return self.state['snapshot'] if self.state else None
+
+    # ==================== ODPOVEDE ====================
+
+    @staticmethod
+    def _encode(payload, snapshot):
+        body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+        etag = f'"{snapshot}-{hashlib.md5(body).hexdigest()[:12]}"'
+        return body, etag
+
+    def response(self, path):
+        """(status, telo, etag) pre cestu - výsledok sa cachuje do zmeny snapshotu"""
+        self.refresh()
+        state = self.state
+        responses = state['responses']
+        if path not in responses:
+            status, payload = self._payload(path, state)
+            if status != HTTPStatus.OK:
+                return status, self._encode(payload, state['snapshot'])[0], None
+            responses[path] = self._encode(payload, state['snapshot'])
+        body, etag = responses[path]
+        return HTTPStatus.OK, body, etag
+
+    @staticmethod
+    def _payload(path, state):
+        parts = [unquote(p).strip() for p in path.strip('/').split('/')]
+        if len(parts) < 2 or parts[0] != 'api':
+            return HTTPStatus.NOT_FOUND, {'error': 'Neznámy endpoint'}
+
+        snapshot, aggregates = state['snapshot'], state['aggregates']
+        employees = aggregates['employees']
+        resource, key = parts[1], '/'.join(parts[2:])
+
+        if resource == 'health' and not key:
+            return HTTPStatus.OK, {'snapshot': snapshot, 'built_at': state['built_at'],
+                                   'employees': len(employees)}
+
+        if resource == 'employees':
+            if not key:
+                return HTTPStatus.OK, {'snapshot': snapshot, 'employees': _records(employees)}
+            position = state['employee_index'].get(key)
+            if position is None:
+                return HTTPStatus.NOT_FOUND, {'error': f"Zamestnanec '{key}' neexistuje"}
+            return HTTPStatus.OK, {'snapshot': snapshot, 'employee': _records(employees.iloc[[position]])[0]}
+
+        if resource == 'cities':
+            cities = aggregates['cities']
+            if not key:
+                return HTTPStatus.OK, {'snapshot': snapshot, 'cities': _records(cities)}
+            city = cities[cities['workplace'] == key.lower()]
+            if city.empty:
+                return HTTPStatus.NOT_FOUND, {'error': f"Mesto '{key}' neexistuje"}
+            return HTTPStatus.OK, {
+                'snapshot': snapshot,
+                'city': _records(city)[0],
+                'employees': _records(employees[employees['workplace'] == key.lower()]),
+            }
+
+        if resource == 'studio' and not key:
+            return HTTPStatus.OK, {'snapshot': snapshot, 'employees': _records(aggregates['studio'])}
+
+        return HTTPStatus.NOT_FOUND, {'error': 'Neznámy endpoint'}
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD nad AggregateStore s podporou If-None-Match"""
+
+    store = None  # nastaví make_server
+    server_version = "AnalyzatorAPI/1.0"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        try:
+            status, body, etag = self.store.response(urlsplit(self.path).path)
+        except Exception as e:
+            status, body, etag = HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps(
+                {'error': str(e)}, ensure_ascii=False).encode('utf-8'), None
+
+        if etag and etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _method_not_allowed(self):
+        self.send_response(HTTPStatus.METHOD_NOT_ALLOWED)
+        self.send_header('Allow', 'GET, HEAD')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = _method_not_allowed
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"{self.log_date_time_string()} {self.address_string()} {format % args}\n")
+
+
+def make_server(store, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    handler = type('BoundAPIRequestHandler', (APIRequestHandler,), {'store': store})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m core.api_server', description="Read-only JSON API agregátov")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--raw', default=data_loader.RAW_DATA_PATH)
+    parser.add_argument('--sales', default=data_loader.SALES_DATA_PATH)
+    parser.add_argument('--studio', default=data_loader.STUDIO_DATA_PATH)
+    parser.add_argument('--refresh', type=int, default=REFRESH_INTERVAL, help="interval kontroly nových dát (s)")
+    args = parser.parse_args(argv)
+
+    store = AggregateStore(args.raw, args.sales, args.studio, args.refresh)
+    start = time.perf_counter()
+    store.refresh(force=True)
+    print(f"✅ Snapshot {store.snapshot} pripravený za {time.perf_counter() - start:.2f} s")
+
+    server = make_server(store, args.host, args.port)
+    print(f"🌐 API beží na http://{args.host}:{args.port}/api/health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# core/api_server_test.py
+import http.client
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from core.api_server import AggregateStore, make_server
+
+
+def make_store():
+    """Store s hotovým snapshotom - refresh() počas testu nič nenačítava"""
+    employees = pd.DataFrame({
+        'employee': ['Novák J. ', 'Svobodová K.'],
+        'workplace': ['praha', 'brno'],
+        'total_sales': [1000.0, float('nan')],
+    })
+    store = AggregateStore(refresh_interval=3600)
+    store.state = {
+        'snapshot': 'abc123',
+        'built_at': '2025-01-01T00:00:00',
+        'aggregates': {
+            'employees': employees,
+            'cities': pd.DataFrame({'workplace': ['praha', 'brno'], 'employees': [1, 1]}),
+            'studio': pd.DataFrame(),
+        },
+        'employee_index': {'Novák J.': 0, 'Svobodová K.': 1},
+        'responses': {},
+    }
+    store._checked_at = time.monotonic()
+    return store
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = make_server(make_store(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_etag_and_not_modified(server):
+    status, headers, body = request(server, 'GET', '/api/employees')
+    assert status == 200
+    assert headers['Content-Type'] == 'application/json; charset=utf-8'
+    payload = json.loads(body)
+    assert payload['snapshot'] == 'abc123'
+    assert payload['employees'][1]['total_sales'] is None
+    etag = headers['ETag']
+    assert etag.startswith('"abc123-')
+
+    status, headers, _ = request(server, 'GET', '/api/employees')
+    assert status == 200 and headers['ETag'] == etag
+
+    status, headers, body = request(server, 'GET', '/api/employees', {'If-None-Match': etag})
+    assert status == 304 and headers['ETag'] == etag and body == b''
+
+    status, _, _ = request(server, 'GET', '/api/employees', {'If-None-Match': '"iny"'})
+    assert status == 200
+
+
+def test_head_has_no_body(server):
+    status, headers, body = request(server, 'HEAD', '/api/health')
+    assert status == 200 and body == b'' and int(headers['Content-Length']) > 0
+
+
+def test_employee_lookup_strips_spaces(server):
+    status, _, body = request(server, 'GET', '/api/employees/%20Nov%C3%A1k%20J.%20')
+    assert status == 200
+    assert json.loads(body)['employee']['workplace'] == 'praha'
+
+
+@pytest.mark.parametrize('path', ['/api/employees/Nikto', '/api/cities/ostrava', '/api/unknown', '/index.html', '/api'])
+def test_not_found(server, path):
+    status, headers, body = request(server, 'GET', path)
+    assert status == 404
+    assert 'ETag' not in headers
+    assert 'error' in json.loads(body)
+
+
+@pytest.mark.parametrize('method', ['POST', 'PUT', 'PATCH', 'DELETE'])
+def test_method_not_allowed(server, method):
+    status, headers, _ = request(server, method, '/api/employees')
+    assert status == 405
+    assert headers['Allow'] == 'GET, HEAD'
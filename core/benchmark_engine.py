@@ -0,0 +1,156 @@
+# core/benchmark_engine.py
+import numpy as np
+
+from core.employee_table import MONTH_COLUMNS
+from core.leaderboard import Leaderboard
+
+
+# Konkrétne obdobia v roku -> mesiace
+PERIOD_MONTHS = {
+    # Štvrťroky
+    "q1": ['leden', 'unor', 'brezen'],
+    "q2": ['duben', 'kveten', 'cerven'],
+    "q3": ['cervenec', 'srpen', 'zari'],
+    "q4": ['rijen', 'listopad', 'prosinec'],
+    # Polroky
+    "h1": ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven'],
+    "h2": ['cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec'],
+    # Celý rok
+    "year": list(MONTH_COLUMNS),
+}
+
+# Pásma pokroku (%) -> index tieru: <50 poor, <75 average, <100 good, inak excellent
+TIER_EDGES = [50, 75, 100]
+TIERS = [
+    ('poor', "❌ Kritický", "#dc3545"),
+    ('average', "⚠️ Podpriemerný", "#17a2b8"),
+    ('good', "🥉 Blízko k cieľu", "#ffc107"),
+    ('excellent', "🏆 Cieľ splnený", "#28a745"),
+]
+
+
+def get_medal(position):
+    """Vráti medailu na základe pozície"""
+    if position == 1:
+        return "🥇"
+    elif position == 2:
+        return "🥈"
+    elif position == 3:
+        return "🥉"
+    elif position <= 10:
+        return "🏅"
+    else:
+        return f"#{position}"
+
+
+class BenchmarkEngine:
+    """Ranking zamestnancov nad maticou zamestnanec × mesiac
+
+    Súčty za obdobie a poradie sa počítajú raz na obdobie; zmena cieľa
+    len preškáluje existujúce vektory.
+    """
+
+    def __init__(self, table, rows=None):
+        self.table = table
+        self.rows = np.arange(len(table)) if rows is None else np.asarray(rows, dtype=int)
+        self.sales = table.sales[self.rows]
+        self._period_sales = {}
+        self._leaderboards = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def period_mask(self, period):
+        """Boolean maska stĺpcov matice pre obdobie (neznáme obdobie = Q1)"""
+        months = PERIOD_MONTHS.get(period, PERIOD_MONTHS['q1'])
+        mask = np.zeros(len(MONTH_COLUMNS), dtype=bool)
+        mask[self.table.month_columns(months)] = True
+        return mask
+
+    def period_sales(self, period):
+        """Predaj za obdobie pre všetkých zamestnancov (cachované)"""
+        if period not in self._period_sales:
+            self._period_sales[period] = self.sales[:, self.period_mask(period)].sum(axis=1)
+        return self._period_sales[period]
+
+    def leaderboard(self, period):
+        """Zoradený index predaja za obdobie (top-N, poradie, prahy)"""
+        if period not in self._leaderboards:
+            self._leaderboards[period] = Leaderboard(self.period_sales(period), self.table.names[self.rows])
+        return self._leaderboards[period]
+
+    def order(self, period):
+        """Indexy zoradené podľa predaja za obdobie (zostupne, stabilne pri zhode)"""
+        return self.leaderboard(period).order
+
+    def evaluate(self, target, period):
+        """Vektory pokroku, zostávajúcej sumy a tieru pre daný cieľ"""
+        sales = self.period_sales(period)
+        progress = sales / target * 100 if target > 0 else np.zeros(len(sales))
+        return {
+            'period_sales': sales,
+            'progress': progress,
+            'to_target': np.maximum(0, target - sales),
+            'tier': np.digitize(progress, TIER_EDGES),
+        }
+
+    def benchmark_data(self, target, period):
+        """Zoradený zoznam dictov v tvare pôvodného calculate_benchmark_data"""
+        values = self.evaluate(target, period)
+        table = self.table
+        data = []
+
+        for position, i in enumerate(self.order(period), start=1):
+            person_id = self.rows[i]
+            emp = table.records[person_id]
+            tier, performance, color = TIERS[values['tier'][i]]
+            data.append({
+                'name': table.names[person_id],
+                'total_sales': float(table.totals[person_id]),
+                'period_sales': float(values['period_sales'][i]),
+                'progress': float(values['progress'][i]),
+                'performance': performance,
+                'color': color,
+                'tier': tier,
+                'workplace': table.workplaces[person_id],
+                'score': emp.get('score', 0),
+                'monthly_sales': emp.get('monthly_sales', {}),
+                'to_target': float(values['to_target'][i]),
+                'target': target,
+                'period': period,
+                'position': position,
+                'medal': get_medal(position),
+            })
+
+        return data
+
+    def sweep(self, targets, periods):
+        """What-if: pre mriežku cieľov × období vráti počty splnení, priemerný pokrok a celkový gap
+
+        Returns:
+            dict: period -> {'targets', 'pass_count', 'avg_progress', 'total_gap'} (numpy polia)
+        """
+        targets = np.asarray(targets, dtype=float)
+        result = {}
+        if len(periods) == 0:
+            return result
+
+        # Matica zamestnanec × obdobie, potom broadcast proti všetkým cieľom naraz
+        sales = np.column_stack([self.period_sales(p) for p in periods])
+        grid = sales[:, :, None]
+        tgt = targets[None, None, :]
+        safe_tgt = np.where(targets > 0, targets, np.nan)
+
+        pass_count = (grid >= tgt).sum(axis=0)
+        total_gap = np.maximum(0, tgt - grid).sum(axis=0)
+        n = max(len(self.rows), 1)
+        avg_progress = sales.sum(axis=0)[:, None] / n / safe_tgt[None, :] * 100
+
+        for k, period in enumerate(periods):
+            result[period] = {
+                'targets': targets,
+                'pass_count': pass_count[k],
+                'avg_progress': np.nan_to_num(avg_progress[k]),
+                'total_gap': total_gap[k],
+            }
+        return result
@@ -0,0 +1,86 @@
+# core/benchmark_engine_test.py
+import numpy as np
+import pytest
+
+from core.benchmark_engine import BenchmarkEngine, TIER_EDGES, TIERS
+from core.employee_table import EmployeeTable
+
+
+def make_table(q1_sales):
+    """Zamestnanci s predajom len v januári (Q1 = leden)"""
+    return EmployeeTable([
+        {'name': f'emp{i}', 'workplace': 'praha' if i % 2 else 'brno', 'monthly_sales': {'leden': sales}}
+        for i, sales in enumerate(q1_sales)
+    ])
+
+
+@pytest.mark.parametrize('progress, tier', [
+    (0, 'poor'),
+    (49.9, 'poor'),
+    (50, 'average'),
+    (74.9, 'average'),
+    (75, 'good'),
+    (99.9, 'good'),
+    (100, 'excellent'),
+    (250, 'excellent'),
+])
+def test_tier_edges(progress, tier):
+    engine = BenchmarkEngine(make_table([progress * 10]))
+    values = engine.evaluate(1000, 'q1')
+    assert values['progress'][0] == pytest.approx(progress)
+    assert TIERS[values['tier'][0]][0] == tier
+
+
+def test_tier_edges_are_percent_boundaries():
+    assert TIER_EDGES == [50, 75, 100]
+
+
+def test_zero_target_gives_zero_progress():
+    values = BenchmarkEngine(make_table([100, 0])).evaluate(0, 'q1')
+    assert values['progress'].tolist() == [0, 0]
+    assert values['to_target'].tolist() == [0, 0]
+
+
+def test_benchmark_data_order_and_ties():
+    # emp1 a emp3 majú zhodu - ostáva pôvodné poradie
+    data = BenchmarkEngine(make_table([100, 300, 50, 300])).benchmark_data(200, 'q1')
+    assert [row['name'] for row in data] == ['emp1', 'emp3', 'emp0', 'emp2']
+    assert [row['position'] for row in data] == [1, 2, 3, 4]
+    assert [row['medal'] for row in data] == ['🥇', '🥈', '🥉', '🏅']
+    assert [row['to_target'] for row in data] == [0, 0, 100, 150]
+
+
+def test_rows_subset():
+    engine = BenchmarkEngine(make_table([100, 300, 50, 300]), rows=[0, 2])
+    assert [row['name'] for row in engine.benchmark_data(100, 'q1')] == ['emp0', 'emp2']
+
+
+@pytest.mark.parametrize('period, expected', [('q1', 10), ('q3', 5), ('h1', 10), ('h2', 5), ('year', 15), ('neznáme', 10)])
+def test_period_sales(period, expected):
+    # Neznáme obdobie = Q1
+    table = EmployeeTable([{'name': 'x', 'workplace': 'praha', 'monthly_sales': {'leden': 10, 'srpen': 5}}])
+    assert BenchmarkEngine(table).period_sales(period)[0] == expected
+
+
+def test_sweep_matches_evaluate():
+    table = EmployeeTable([
+        {'name': 'a', 'workplace': 'praha', 'monthly_sales': {'leden': 100, 'cervenec': 40}},
+        {'name': 'b', 'workplace': 'brno', 'monthly_sales': {'unor': 250}},
+        {'name': 'c', 'workplace': 'brno', 'monthly_sales': {}},
+    ])
+    engine = BenchmarkEngine(table)
+    targets = [0, 50, 100, 250, 300]
+    result = engine.sweep(targets, ['q1', 'q3'])
+
+    assert set(result) == {'q1', 'q3'}
+    for period, values in result.items():
+        sales = engine.period_sales(period)
+        for k, target in enumerate(targets):
+            assert values['pass_count'][k] == (sales >= target).sum()
+            assert values['total_gap'][k] == np.maximum(0, target - sales).sum()
+            expected = engine.evaluate(target, period)['progress'].mean() if target > 0 else 0
+            assert values['avg_progress'][k] == pytest.approx(expected)
+
+
+def test_sweep_without_periods():
+    assert BenchmarkEngine(make_table([1])).sweep([100], []) == {}
@@ -0,0 +1,171 @@
+# core/cli.py
+"""Headless prepočet a export agregátov (bez Streamlitu) - napr. pre cron
+
+    python -m core.cli --out data/exports --formats csv,xlsx
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+from core import data_loader
+from core.aggregates import COMPANY, build_aggregates, scope_tables, workplaces
+
+
+FORMATS = ('csv', 'parquet', 'xlsx')
+DEFAULT_FORMATS = 'csv,xlsx'
+DEFAULT_EXPORT_PATH = "data/exports"
+
+
+@contextmanager
+def stage(name, timings):
+    """Zmeria trvanie jednej fázy a vypíše ho"""
+    start = time.perf_counter()
+    print(f"▶️  {name}...", flush=True)
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+        print(f"⏱️  {name}: {timings[name]:.2f} s", flush=True)
+
+
+def quiet(verbose=False):
+    """Analyzer pri párovaní mien veľa vypisuje - v cron výstupe chceme len fázy"""
+    return nullcontext() if verbose else redirect_stdout(io.StringIO())
+
+
+def parquet_available():
+    """Parquet potrebuje pyarrow alebo fastparquet (nie sú v requirements)"""
+    for module in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def write_export(df, path, fmt):
+    """Zapíše jednu tabuľku (beží vo worker procese)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'csv':
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    elif fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'xlsx':
+        df.to_excel(path, index=False)
+    else:
+        raise ValueError(f"Neznámy formát: {fmt}")
+    return str(path), len(df)
+
+
+def export_jobs(aggregates, out_dir, formats):
+    """(DataFrame, cesta, formát) pre firmu a každé mesto"""
+    jobs = []
+    for scope in [COMPANY] + workplaces(aggregates):
+        for name, df in scope_tables(aggregates, scope).items():
+            if df.empty:
+                continue
+            for fmt in formats:
+                jobs.append((df, out_dir / scope / f"{name}.{fmt}", fmt))
+    return jobs
+
+
+def run_exports(jobs, workers):
+    """Zapíše exporty paralelne v procesoch (core nenačítava Streamlit, workery štartujú rýchlo)"""
+    written, failed = [], []
+    if workers <= 1:
+        for df, path, fmt in jobs:
+            try:
+                written.append(write_export(df, path, fmt))
+            except Exception as e:
+                failed.append((str(path), e))
+        return written, failed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(write_export, df, path, fmt): path for df, path, fmt in jobs}
+        for future in as_completed(futures):
+            try:
+                written.append(future.result())
+            except Exception as e:
+                failed.append((str(futures[future]), e))
+    return written, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m core.cli', description="Prepočet agregátov a export pre HR")
+    parser.add_argument('--raw', default=data_loader.RAW_DATA_PATH, help="priečinok s dennými reportmi")
+    parser.add_argument('--sales', default=data_loader.SALES_DATA_PATH, help="priečinok so sales súborom")
+    parser.add_argument('--studio', default=data_loader.STUDIO_DATA_PATH, help="priečinok so Studio reportmi")
+    parser.add_argument('--out', default=DEFAULT_EXPORT_PATH, help="cieľový priečinok exportov")
+    parser.add_argument('--formats', default=DEFAULT_FORMATS, help=f"čiarkou oddelené z {', '.join(FORMATS)}")
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help="počet procesov pre export")
+    parser.add_argument('--include-terminated', action='store_true', help="zahrnúť aj ukončených zamestnancov")
+    parser.add_argument('--verbose', action='store_true', help="zobraziť ladiace výpisy analyzátora")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    formats = [f.strip().lower() for f in args.formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        print(f"❌ Neznámy formát: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if 'parquet' in formats and not parquet_available():
+        print("⚠️ Parquet preskočený - nie je nainštalovaný pyarrow ani fastparquet", file=sys.stderr)
+        formats.remove('parquet')
+
+    timings = {}
+    total_start = time.perf_counter()
+
+    with stage("Načítanie dát", timings):
+        try:
+            with quiet(args.verbose):
+                analyzer = data_loader.build_analyzer(args.include_terminated, args.raw, args.sales)
+                for data_type in ('internet', 'applications'):
+                    analyzer.get_activity_rollup(data_type)
+        except FileNotFoundError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+
+        studio_analyzer = None
+        studio_file = data_loader.find_studio_file(args.studio)
+        if studio_file:
+            from core.studio_analyzer import StudioAnalyzer
+            studio_analyzer = StudioAnalyzer(studio_file)
+        print(f"   zamestnancov: {len(analyzer.get_employee_table())}, "
+              f"studio: {Path(studio_file).name if studio_file else '-'}")
+        if studio_analyzer is not None:
+            memory = studio_analyzer.memory_usage()
+            print(f"   studio v pamäti: {memory['total'] / 1024**2:.1f} MB "
+                  f"(df {memory['df_active'] / 1024**2:.1f} MB, kocka {memory.get('cube', 0) / 1024**2:.1f} MB)")
+
+    with stage("Agregáty", timings):
+        with quiet(args.verbose):
+            aggregates = build_aggregates(analyzer, studio_analyzer)
+            report = analyzer.get_validation_report()
+        print(f"   snapshot: {aggregates['snapshot']}, mestá: {', '.join(workplaces(aggregates)) or '-'}, "
+              f"problémy v dátach: {sum(report.get('summary', {}).values())}")
+
+    out_dir = Path(args.out) / datetime.now().strftime('%Y-%m-%d')
+    with stage("Export", timings):
+        jobs = export_jobs(aggregates, out_dir, formats)
+        written, failed = run_exports(jobs, args.workers)
+        for path, error in failed:
+            print(f"   ❌ {path}: {error}", file=sys.stderr)
+        print(f"   súborov: {len(written)} → {out_dir}")
+
+    print(f"✅ Hotovo za {time.perf_counter() - total_start:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
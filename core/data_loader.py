@@ -0,0 +1,412 @@
+# core/data_loader.py
+"""Načítanie zdrojových dát bez závislosti na Streamlite (app.py aj CLI)"""
+import hashlib
+import random
+import re
+from pathlib import Path
+
+import pandas as pd
+
+
+SALES_DATA_PATH = "data/sales"
+RAW_DATA_PATH = "data/raw"
+STUDIO_DATA_PATH = "data/studio"
+
+
+def folder_signature(*paths):
+    """Odtlačok Excel súborov v priečinkoch (meno, veľkosť, mtime) - zmena = nový snapshot"""
+    entries = []
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        for file in sorted(list(path.glob("*.xlsx")) + list(path.glob("*.xls"))):
+            stat = file.stat()
+            entries.append(f"{file}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.md5('|'.join(entries).encode()).hexdigest()
+
+
+_daily_reports = {}  # cesta -> ((veľkosť, mtime), DataFrame alebo None)
+
+
+def read_daily_report(file):
+    """Jeden denný report bez súčtových riadkov, s doplneným Source_File a Date
+
+    Každá verzia súboru (veľkosť, mtime) sa parsuje raz - loadery aj ActivityRollup
+    čítajú cez túto funkciu. Nečitateľný súbor vráti None (tiež sa pamätá).
+    Vrátený DataFrame je zdieľaný, volajúci ho nemenia.
+    """
+    file = Path(file)
+    stat = file.stat()
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _daily_reports.get(str(file))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        df = pd.read_excel(file, header=8)
+        df = df.dropna(subset=['Osoba ▲'])
+        df = df[~df['Osoba ▲'].astype(str).str.startswith('*')].copy()
+        df['Source_File'] = file.name
+        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', file.name)
+        df['Date'] = date_match.group(1) if date_match else 'unknown'
+    except Exception:
+        df = None
+    _daily_reports[str(file)] = (stamp, df)
+    return df
+
+
+def load_sales_data(include_terminated=False, data_path=SALES_DATA_PATH):
+    """Načíta sales dáta s opravenou logikou filtrovania
+
+    Returns:
+        tuple: (zoznam zamestnancov ako dicty, vyfiltrovaný DataFrame)
+
+    Raises:
+        FileNotFoundError: ak priečinok alebo sales súbor neexistuje
+    """
+    data_path = Path(data_path)
+
+    # ✅ Ak sales neexistuje, skús aj raw ako backup
+    if not data_path.exists():
+        data_path = Path(RAW_DATA_PATH)
+
+    if not data_path.exists():
+        raise FileNotFoundError(f"Priečinok {data_path} neexistuje!")
+
+    # Nájdi sales súbor
+    sales_candidates = []
+    for file in data_path.glob("*.xlsx"):
+        filename_lower = file.name.lower()
+        if any(keyword in filename_lower for keyword in ['prodej', 'sales', 'leden', 'unor', 'user']):
+            sales_candidates.append(file)
+
+    if not sales_candidates:
+        raise FileNotFoundError("❌ Žiadny sales súbor nenájdený!")
+
+    sales_file = sales_candidates[0]
+
+    # Načítanie súboru
+    df = pd.read_excel(sales_file)
+    df_filtered = filter_sales_data_new_logic(df, include_terminated)
+
+    # Spracovanie do zamestnancov
+    sales_employees = []
+    current_workplace = 'unknown'
+
+    for _, row in df_filtered.iterrows():
+        user = row.get('user', '')
+
+        if user in ['praha', 'zlin', 'brno', 'vizovice']:
+            current_workplace = user
+            continue
+
+        if not user or pd.isna(user) or str(user).strip() == '':
+            continue
+
+        employee = {
+            'name': user,
+            'workplace': current_workplace,
+            'monthly_sales': {},
+            'total_sales': 0,
+            'score': 0
+        }
+
+        # Načítanie mesačných dát
+        total_sales = 0
+        month_columns = ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven',
+                       'cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec']
+
+        for col in df_filtered.columns:
+            if str(col).lower() in month_columns:
+                value = row.get(col, 0)
+
+                # Konverzia 'X' na 0
+                if pd.isna(value) or str(value).upper().strip() == 'X':
+                    value = 0
+                else:
+                    try:
+                        value = float(value)
+                    except:
+                        value = 0
+
+                employee['monthly_sales'][col] = value
+                total_sales += value
+
+        employee['total_sales'] = total_sales
+        employee['score'] = calculate_employee_score_from_sales_amount(total_sales)
+
+        sales_employees.append(employee)
+
+    return sales_employees, df_filtered
+
+
+def filter_sales_data_new_logic(df, include_terminated=False):
+    """
+    ✅ OPRAVENÁ LOGIKA - hľadá posledný mesiac s dátami, nie chronologicky posledný
+    """
+
+    # Identifikácia mesačných stĺpcov v chronologickom poradí
+    month_columns = ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven',
+                    'cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec']
+
+    # Nájdi skutočné mesačné stĺpce v dátach
+    available_months = []
+    for col in df.columns:
+        col_lower = str(col).lower()
+        if col_lower in month_columns:
+            available_months.append(col)
+
+    if not available_months:
+        return df
+
+    # Zoradi mesiace chronologicky
+    month_order = {month: i for i, month in enumerate(month_columns)}
+    available_months.sort(key=lambda x: month_order.get(x.lower(), 999))
+
+    # Ak zahrnúť všetkých, vráť všetko
+    if include_terminated:
+        return df
+
+    # ✅ NOVÁ LOGIKA - nájdi posledný mesiac s dátami pre každého zamestnanca
+    keep_indices = []
+
+    for idx, row in df.iterrows():
+        user = row.get('user', '')
+
+        # Preskočiť mesta a prázdne riadky
+        if (user in ['praha', 'zlin', 'brno', 'vizovice'] or
+            not user or pd.isna(user) or str(user).strip() == ''):
+            keep_indices.append(idx)
+            continue
+
+        # ✅ NÁJDI POSLEDNÝ MESIAC S DÁTAMI (nie chronologicky posledný)
+        last_month_with_data = None
+        last_value = None
+
+        # Prejdi mesiace odzadu (od decembra po január)
+        for month in reversed(available_months):
+            value = row.get(month, '')
+
+            # Ak má mesiac dáta (nie je prázdny/NaN)
+            if pd.notna(value) and str(value).strip() != '':
+                last_month_with_data = month
+                last_value = value
+                break  # Našiel som posledný mesiac s dátami
+
+        # Ak nenašiel žiadny mesiac s dátami, ponechaj (nový zamestnanec)
+        if last_month_with_data is None:
+            keep_indices.append(idx)
+            continue
+
+        # Ak posledný mesiac s dátami obsahuje 'X', vyhoď
+        last_value_str = str(last_value).strip().upper()
+        if last_value_str == 'X':
+            pass  # Vylúčiť
+        else:
+            keep_indices.append(idx)
+
+    df_filtered = df.iloc[keep_indices]
+    return df_filtered
+
+
+def load_internet_data(data_path=RAW_DATA_PATH):
+    """Load ALL internet data files - vrátené na agregované dáta"""
+
+    data_path = Path(data_path)
+
+    if not data_path.exists():
+        return None
+
+    try:
+        all_files = list(data_path.glob("*.xlsx"))
+        internet_files = [f for f in all_files if 'internet' in f.name.lower()]
+
+        if not internet_files:
+            return None
+
+        all_dataframes = []
+
+        for file in internet_files:
+            df_final = read_daily_report(file)
+            if df_final is not None and len(df_final) > 0:
+                all_dataframes.append(df_final)
+
+        if not all_dataframes:
+            return None
+
+        combined_df = pd.concat(all_dataframes, ignore_index=True)
+
+        # Agregácia - obnovená
+        time_columns = ['Mail', 'Chat', 'IS Sykora', 'SykoraShop', 'Web k praci',
+                       'Hry', 'Nepracovni weby', 'Čas celkem ▼', 'hladanie prace',
+                       'Nezařazené', 'Umela inteligence']
+
+        def sum_time_strings(series):
+            total_minutes = 0
+            for time_str in series.dropna():
+                if pd.notna(time_str) and str(time_str) not in ['', 'nan']:
+                    try:
+                        parts = str(time_str).split(':')
+                        if len(parts) >= 2:
+                            hours = int(parts[0])
+                            minutes = int(parts[1])
+                            seconds = int(parts[2]) if len(parts) > 2 else 0
+                            total_minutes += hours * 60 + minutes + seconds / 60
+                    except:
+                        pass
+
+            if total_minutes == 0:
+                return "00:00:00"
+
+            hours = int(total_minutes // 60)
+            minutes = int(total_minutes % 60)
+            seconds = int((total_minutes % 1) * 60)
+            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+        agg_dict = {}
+        for col in time_columns:
+            if col in combined_df.columns:
+                agg_dict[col] = sum_time_strings
+
+        if 'Přihlašovací jméno' in combined_df.columns:
+            agg_dict['Přihlašovací jméno'] = 'first'
+
+        aggregated_df = combined_df.groupby('Osoba ▲').agg(agg_dict).reset_index()
+
+        return aggregated_df
+
+    except Exception as e:
+        return None
+
+
+def load_applications_data(data_path=RAW_DATA_PATH):
+    """Load ALL applications data files - vrátené na agregované dáta"""
+
+    data_path = Path(data_path)
+
+    if not data_path.exists():
+        return None
+
+    try:
+        # ✅ OPRAVENÉ - hľadáme "applications" namiesto "application"
+        all_files = list(data_path.glob("*.xlsx"))
+        app_files = [f for f in all_files if 'applications' in f.name.lower() and 'internet' not in f.name.lower()]
+
+        if not app_files:
+            return None
+
+        # KOMBINÁCIA VŠETKÝCH SÚBOROV
+        all_dataframes = []
+
+        for file in app_files:
+            df_final = read_daily_report(file)
+            if df_final is not None and len(df_final) > 0:
+                all_dataframes.append(df_final)
+
+        if not all_dataframes:
+            return None
+
+        # Kombinácia všetkých súborov
+        combined_df = pd.concat(all_dataframes, ignore_index=True)
+
+        # Aplikačné time stĺpce
+        app_time_columns = ['Helios Green', 'Chat', 'Imos - program', 'Mail',
+                           'Programy', 'Půdorysy', 'Čas celkem ▼', 'Internet']
+
+        # Agregácia časov
+        def sum_time_strings(series):
+            total_minutes = 0
+            for time_str in series.dropna():
+                if pd.notna(time_str) and str(time_str) not in ['', 'nan']:
+                    try:
+                        parts = str(time_str).split(':')
+                        if len(parts) >= 2:
+                            hours = int(parts[0])
+                            minutes = int(parts[1])
+                            seconds = int(parts[2]) if len(parts) > 2 else 0
+                            total_minutes += hours * 60 + minutes + seconds / 60
+                    except:
+                        pass
+
+            if total_minutes == 0:
+                return "00:00:00"
+
+            hours = int(total_minutes // 60)
+            minutes = int(total_minutes % 60)
+            seconds = int((total_minutes % 1) * 60)
+            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+        # Agregačný slovník
+        agg_dict = {}
+        for col in app_time_columns:
+            if col in combined_df.columns:
+                agg_dict[col] = sum_time_strings
+
+        # Pridanie non-time stĺpcov
+        if 'Přihlašovací jméno' in combined_df.columns:
+            agg_dict['Přihlašovací jméno'] = 'first'
+
+        # Finálna agregácia podľa osoby
+        aggregated_df = combined_df.groupby('Osoba ▲').agg(agg_dict).reset_index()
+
+        return aggregated_df
+
+    except Exception as e:
+        return None
+
+
+def calculate_employee_score_from_sales_amount(total_sales):
+    """Výpočet skóre na základe celkového predaja"""
+
+    if total_sales >= 5000000:  # 5M+
+        base_score = 90
+    elif total_sales >= 4000000:  # 4M+
+        base_score = 85
+    elif total_sales >= 3000000:  # 3M+
+        base_score = 75
+    elif total_sales >= 2000000:  # 2M+
+        base_score = 65
+    elif total_sales >= 1000000:  # 1M+
+        base_score = 50
+    elif total_sales > 0:
+        base_score = 30
+    else:
+        base_score = 20
+
+    # Malá variácia pre realistickosť
+    random.seed(hash(str(total_sales)))
+    variation = random.uniform(-5, 5)
+
+    final_score = max(20, min(95, base_score + variation))
+    return round(final_score, 2)
+
+
+def find_studio_file(studio_path=STUDIO_DATA_PATH):
+    """Najnovší Excel súbor zo Studio priečinka alebo None"""
+    studio_path = Path(studio_path)
+    if not studio_path.exists():
+        return None
+
+    excel_files = list(studio_path.glob("*.xlsx")) + list(studio_path.glob("*.xls"))
+    if not excel_files:
+        return None
+
+    excel_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+    return str(excel_files[0])
+
+
+def build_analyzer(include_terminated=False, data_path=RAW_DATA_PATH, sales_path=SALES_DATA_PATH):
+    """Načíta všetky zdroje a vytvorí DataAnalyzer (rovnako ako initialize_session_state)"""
+    from core.analyzer import DataAnalyzer
+
+    sales_data, raw_sales_df = load_sales_data(include_terminated, sales_path)
+    analyzer = DataAnalyzer()
+    analyzer.load_data(
+        sales_data=sales_data,
+        internet_data=load_internet_data(data_path),
+        applications_data=load_applications_data(data_path),
+        data_path=data_path
+    )
+    analyzer.raw_sales_data = raw_sales_df
+    return analyzer
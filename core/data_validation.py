@@ -0,0 +1,164 @@
+# core/data_validation.py
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.data_loader import RAW_DATA_PATH, SALES_DATA_PATH, folder_signature
+
+
+VALIDATION_REPORT_PATH = Path("data/cache/validation_report.json")
+MINUTES_PER_DAY = 24 * 60
+TOTAL_COLUMN = 'Čas celkem ▼'
+KEY_COLUMNS = ['Osoba ▲', 'Date', 'Source_File']
+
+CHECK_LABELS = {
+    'day_over_24h': "Deň nad 24h",
+    'duplicate_days': "Duplicitné dni",
+    'sales_mismatch': "Nesúlad mesačného a celkového predaja",
+    'unmatched_sales': "Zamestnanci bez monitoringu",
+    'unmatched_monitoring': "Monitoring bez zamestnanca",
+}
+
+
+def _report_totals(daily):
+    """Celkové minúty na riadok reportu (Čas celkem ▼, inak súčet aktivít)"""
+    if TOTAL_COLUMN in daily.columns:
+        return daily[TOTAL_COLUMN].to_numpy()
+    activity_cols = [c for c in daily.columns if c not in KEY_COLUMNS]
+    return daily[activity_cols].to_numpy().sum(axis=1)
+
+
+def check_day_totals(daily, data_type):
+    """Osoba × deň s viac ako 24h (súčet cez všetky reporty daného dňa)"""
+    if daily.empty:
+        return []
+    days = pd.DataFrame({
+        'person': daily['Osoba ▲'].to_numpy(),
+        'date': daily['Date'].to_numpy(),
+        'minutes': _report_totals(daily),
+    })
+    grouped = days.groupby(['person', 'date'], sort=True)['minutes'].agg(['sum', 'size'])
+    over = grouped[grouped['sum'] > MINUTES_PER_DAY]
+    return [
+        {'source': data_type, 'person': person, 'date': date,
+         'hours': round(float(row['sum']) / 60, 1), 'reports': int(row['size'])}
+        for (person, date), row in over.iterrows()
+    ]
+
+
+def check_duplicate_days(daily, data_type):
+    """Dni pokryté viacerými reportmi (pri načítaní by sa sčítali)"""
+    if daily.empty:
+        return []
+    files = daily[['Date', 'Source_File']].drop_duplicates()
+    counts = files.groupby('Date')['Source_File'].agg(['size', list])
+    duplicates = counts[counts['size'] > 1]
+    return [
+        {'source': data_type, 'date': date, 'reports': int(row['size']), 'files': sorted(row['list'])}
+        for date, row in duplicates.iterrows()
+    ]
+
+
+def check_sales_totals(table):
+    """Zamestnanci, ktorých súčet mesiacov nesedí s total_sales"""
+    monthly = table.totals
+    direct = table.reported_totals
+    mask = (monthly > 0) & (direct > 0) & (np.abs(monthly - direct) > 1)
+    return [
+        {'name': table.names[i], 'monthly_total': float(monthly[i]),
+         'direct_total': float(direct[i]), 'difference': float(abs(monthly[i] - direct[i]))}
+        for i in np.flatnonzero(mask)
+    ]
+
+
+def check_unmatched_names(analyzer, persons):
+    """Mená bez páru medzi sales a monitoringom (cez name_mapping)"""
+    mapping = analyzer.name_mapping
+    table = analyzer.get_employee_table()
+
+    sales_canon = pd.Series(table.names).map(mapping)
+    persons = pd.Series(sorted(persons), dtype=object)
+    monitoring_canon = persons.map(mapping)
+
+    unmatched_sales = sales_canon.isna() | ~sales_canon.isin(set(monitoring_canon.dropna()))
+    unmatched_monitoring = monitoring_canon.isna() | ~monitoring_canon.isin(set(sales_canon.dropna()))
+
+    return (
+        [{'name': table.names[i], 'workplace': table.workplaces[i]} for i in np.flatnonzero(unmatched_sales.to_numpy())],
+        [{'person': p} for p in persons[unmatched_monitoring.to_numpy()]],
+    )
+
+
+def build_validation_report(analyzer):
+    """Spustí všetky kontroly nad aktuálnym snapshotom"""
+    checks = {name: [] for name in CHECK_LABELS}
+    persons = set()
+
+    for data_type in ('internet', 'applications'):
+        daily = analyzer.get_activity_rollup(data_type).daily
+        checks['day_over_24h'] += check_day_totals(daily, data_type)
+        checks['duplicate_days'] += check_duplicate_days(daily, data_type)
+        if not daily.empty:
+            persons.update(daily['Osoba ▲'].unique())
+
+    checks['sales_mismatch'] = check_sales_totals(analyzer.get_employee_table())
+    checks['unmatched_sales'], checks['unmatched_monitoring'] = check_unmatched_names(analyzer, persons)
+
+    return {
+        'snapshot': analyzer.get_analytics_engine().snapshot_version(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'summary': {name: len(items) for name, items in checks.items()},
+        'checks': checks,
+    }
+
+
+def save_validation_report(report, path=VALIDATION_REPORT_PATH):
+    """Uloží report na disk (JSON)"""
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        return True
+    except Exception as e:
+        print(f"Validation report save error: {e}")
+        return False
+
+
+def load_validation_report(path=VALIDATION_REPORT_PATH):
+    """Načíta posledný uložený report alebo None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def report_sources(analyzer):
+    """Lacný odtlačok vstupov reportu: súbory (meno, veľkosť, mtime) + tabuľka predaja
+
+    Denné reporty sa na to nečítajú - uložený report sa dá použiť hneď pri štarte session.
+    """
+    files = folder_signature(analyzer.data_path or RAW_DATA_PATH, SALES_DATA_PATH)
+    return f"{files[:12]}-{analyzer.get_analytics_engine().snapshot_version(())}"
+
+
+def get_validation_report(analyzer, path=VALIDATION_REPORT_PATH):
+    """Report pre aktuálne zdrojové súbory - počíta sa raz, potom z pamäte alebo z disku"""
+    sources = report_sources(analyzer)
+
+    cached = getattr(analyzer, '_validation_report', None)
+    if cached is not None and cached.get('sources') == sources:
+        return cached
+
+    report = load_validation_report(path)
+    if report is None or report.get('sources') != sources:
+        report = build_validation_report(analyzer)
+        report['sources'] = sources
+        save_validation_report(report, path)
+
+    analyzer._validation_report = report
+    return report
@@ -0,0 +1,115 @@
+# core/employee_table.py
+import numpy as np
+
+from core.utils import get_quarter_months
+
+
+MONTH_COLUMNS = ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven',
+                 'cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec']
+MONTH_INDEX = {month: i for i, month in enumerate(MONTH_COLUMNS)}
+
+
+class EmployeeTable:
+    """Stĺpcová tabuľka zamestnancov postavená nad analyzer.sales_employees
+
+    person_id = poradie zamestnanca v sales_employees. Pôvodné dicty ostávajú
+    v self.records, takže existujúce stránky dostanú rovnaké objekty.
+    """
+
+    def __init__(self, sales_employees):
+        self.records = sales_employees if isinstance(sales_employees, list) else []
+        n = len(self.records)
+
+        self.names = np.empty(n, dtype=object)
+        self.workplaces = np.empty(n, dtype=object)
+        self.scores = np.zeros(n, dtype=float)
+        # total_sales ako ho uvádza zdroj (na kontrolu voči súčtu mesiacov)
+        self.reported_totals = np.zeros(n, dtype=float)
+        # Hustá matica zamestnanec × mesiac (leden..prosinec)
+        self.sales = np.zeros((n, len(MONTH_COLUMNS)), dtype=float)
+
+        self.name_index = {}
+        self.workplace_index = {}
+
+        for person_id, emp in enumerate(self.records):
+            name = emp.get('name', 'Unknown')
+            workplace = emp.get('workplace', 'unknown')
+            self.names[person_id] = name
+            self.workplaces[person_id] = workplace
+            self.scores[person_id] = emp.get('score', 0) or 0
+            self.reported_totals[person_id] = emp.get('total_sales', 0) or 0
+
+            for month, value in (emp.get('monthly_sales') or {}).items():
+                col = MONTH_INDEX.get(str(month).lower())
+                if col is not None:
+                    self.sales[person_id, col] += value or 0
+
+            # Pri duplicitnom mene vyhráva prvý výskyt (ako pri lineárnom hľadaní)
+            self.name_index.setdefault(name, person_id)
+            self.workplace_index.setdefault(str(workplace).lower(), []).append(person_id)
+
+        self.workplace_index = {wp: np.array(ids, dtype=int) for wp, ids in self.workplace_index.items()}
+        self.totals = self.sales.sum(axis=1)
+
+        # Kódy pracovísk podľa prvého výskytu (pre bincount agregácie)
+        self.workplace_labels = list(dict.fromkeys(self.workplaces))
+        codes = {label: i for i, label in enumerate(self.workplace_labels)}
+        self.workplace_codes = np.array([codes[wp] for wp in self.workplaces], dtype=int)
+
+    def __len__(self):
+        return len(self.records)
+
+    def person_id(self, name):
+        """Vráti person_id podľa mena alebo None"""
+        return self.name_index.get(name)
+
+    def get(self, name):
+        """Vráti pôvodný dict zamestnanca podľa mena (O(1))"""
+        person_id = self.name_index.get(name)
+        return self.records[person_id] if person_id is not None else None
+
+    def rows_for_workplaces(self, workplaces):
+        """Indexy zamestnancov z daných pracovísk (v pôvodnom poradí)"""
+        parts = [self.workplace_index.get(str(wp).lower()) for wp in workplaces]
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return np.array([], dtype=int)
+        return np.sort(np.concatenate(parts))
+
+    def by_workplace(self, workplace):
+        """Zamestnanci daného pracoviska ako pôvodné dicty"""
+        return [self.records[i] for i in self.rows_for_workplaces([workplace])]
+
+    def month_columns(self, months):
+        """Indexy stĺpcov matice pre zoznam mesiacov"""
+        return [MONTH_INDEX[m.lower()] for m in months if m.lower() in MONTH_INDEX]
+
+    def quarter_sales(self, quarter, rows=None):
+        """Predaj za kvartál pre všetkých (alebo vybraných) zamestnancov"""
+        cols = self.month_columns(get_quarter_months(quarter))
+        matrix = self.sales if rows is None else self.sales[rows]
+        return matrix[:, cols].sum(axis=1)
+
+    def monthly_totals(self):
+        """Súčet predaja firmy po mesiacoch {mesiac: suma}"""
+        return dict(zip(MONTH_COLUMNS, self.sales.sum(axis=0)))
+
+    def company_statistics(self):
+        """Rovnaký výstup ako DataAnalyzer.calculate_company_statistics, len z polí"""
+        total_employees = len(self.records)
+        total_sales = float(self.totals.sum())
+
+        workplace_stats = {}
+        if total_employees:
+            labels = self.workplace_labels
+            counts = np.bincount(self.workplace_codes, minlength=len(labels))
+            sums = np.bincount(self.workplace_codes, weights=self.totals, minlength=len(labels))
+            for label, count, sales in zip(labels, counts, sums):
+                workplace_stats[label] = {'count': int(count), 'sales': float(sales)}
+
+        return {
+            'total_sales': total_sales,
+            'total_employees': total_employees,
+            'average_sales_per_employee': total_sales / total_employees if total_employees > 0 else 0,
+            'workplace_stats': workplace_stats
+        }
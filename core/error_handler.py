@@ -4,17 +4,40 @@ import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
-import streamlit as st
+from typing import Dict, Any, Optional, Callable
+
+
+# UI vrstva si sem zaregistruje prístup k session state a zobrazenie chyby
+# (core tak nezávisí od Streamlitu - CLI a workery ho vôbec nenačítajú)
+_session_provider: Optional[Callable[[], Any]] = None
+_error_display: Optional[Callable[[Dict[str, Any]], None]] = None
+
+
+def set_session_provider(provider: Optional[Callable[[], Any]]):
+    """Nastaví funkciu, ktorá vráti aktuálny session state (mapping)"""
+    global _session_provider
+    _session_provider = provider
+
+
+def set_error_display(display: Optional[Callable[[Dict[str, Any]], None]]):
+    """Nastaví funkciu, ktorá zobrazí zalogovanú chybu používateľovi"""
+    global _error_display
+    _error_display = display
+
+
+def _get_session_state():
+    if _session_provider is None:
+        return None
+    return _session_provider()
 
 
 class ErrorHandler:
     """Centralizovaný error handler pre aplikáciu"""
     
     def __init__(self):
+        self.ensure_log_directory()
         self.setup_logging()
         self.error_log_file = "logs/errors.json"
-        self.ensure_log_directory()
     
     def setup_logging(self):
         """Nastaví logging konfiguráciu"""
@@ -86,8 +109,9 @@ class ErrorHandler:
     def get_current_user_email(self) -> Optional[str]:
         """Bezpečne získa email aktuálneho používateľa"""
         try:
-            if hasattr(st, 'session_state') and hasattr(st.session_state, 'authenticated_user'):
-                user = st.session_state.authenticated_user
+            state = _get_session_state()
+            if state is not None and 'authenticated_user' in state:
+                user = state.get('authenticated_user')
                 if user and isinstance(user, dict):
                     return user.get('email')
         except:
@@ -97,7 +121,8 @@ class ErrorHandler:
     def get_safe_session_state(self) -> Dict[str, Any]:
         """Bezpečne získa relevantné session state informácie"""
         try:
-            if not hasattr(st, 'session_state'):
+            state = _get_session_state()
+            if state is None:
                 return {}
             
             safe_state = {}
@@ -111,8 +136,8 @@ class ErrorHandler:
             ]
             
             for key in safe_keys:
-                if hasattr(st.session_state, key):
-                    value = getattr(st.session_state, key)
+                if key in state:
+                    value = state.get(key)
                     # Pre authenticated_user zobraz len email, nie celé dáta
                     if key == 'authenticated_user' and isinstance(value, dict):
                         safe_state[key] = {'email': value.get('email', 'unknown')}
@@ -184,19 +209,11 @@ def handle_error(func):
                 }
             )
             
-            # Zobraz používateľovi priateľskú chybu
-            if hasattr(st, 'error'):
-                st.error("❌ Nastala chyba. Bola automaticky zalogovaná.")
-                
-                # Pre adminov zobraz viac detailov
+            # Zobraz používateľovi priateľskú chybu (ak je zaregistrované UI)
+            if _error_display is not None:
                 try:
-                    from auth.auth import is_admin
-                    if is_admin():
-                        with st.expander("🔧 Detaily chyby (len pre adminov)"):
-                            st.code(f"Error: {error_info['error_type']}")
-                            st.code(f"Message: {error_info['error_message']}")
-                            st.code(f"Timestamp: {error_info['timestamp']}")
-                except:
+                    _error_display(error_info or {})
+                except Exception:
                     pass
             
             # Re-raise error pre debugging
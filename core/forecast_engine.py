@@ -0,0 +1,182 @@
+# core/forecast_engine.py
+import numpy as np
+import pandas as pd
+
+from core.employee_table import MONTH_COLUMNS
+
+
+METHODS = {
+    'trend': "📈 Lineárny trend (najmenšie štvorce)",
+    'average': "➖ Priemer posledných 3 mesiacov",
+}
+AVERAGE_WINDOW = 3
+Z_SCORE = 1.96  # 95 % pásmo
+
+
+class ForecastEngine:
+    """Predikcia predaja pre všetkých zamestnancov naraz nad maticou zamestnanec × mesiac
+
+    Každý zamestnanec má vlastný model, ale fit prebieha maticovo: história
+    je maskovaná od prvého nenulového mesiaca po posledný mesiac s dátami firmy.
+    """
+
+    def __init__(self, table, rows=None, z=Z_SCORE):
+        self.table = table
+        self.rows = np.arange(len(table)) if rows is None else np.asarray(rows, dtype=int)
+        self.sales = table.sales[self.rows]
+        self.z = z
+
+        # Posledný mesiac, v ktorom má firma nejaký predaj
+        observed = np.flatnonzero(table.sales.sum(axis=0) > 0)
+        self.last_month = int(observed[-1]) if len(observed) else -1
+
+        n, m = self.sales.shape
+        cols = np.arange(m)
+        has_sales = self.sales > 0
+        first = np.where(has_sales.any(axis=1), has_sales.argmax(axis=1), m)
+        self.mask = (cols[None, :] >= first[:, None]) & (cols[None, :] <= self.last_month)
+        self._fits = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    # ==================== FIT ====================
+
+    def fit(self, method='trend'):
+        """Parametre modelu pre všetkých zamestnancov (cachované)"""
+        if method not in self._fits:
+            if method == 'trend':
+                self._fits[method] = self._fit_trend()
+            elif method == 'average':
+                self._fits[method] = self._fit_average()
+            else:
+                raise ValueError(f"Neznáma metóda: {method}")
+        return self._fits[method]
+
+    def _fit_trend(self):
+        """Vážené OLS y = a + b·x pre každý riadok (váha = maska histórie)"""
+        w = self.mask.astype(float)
+        x = np.arange(self.sales.shape[1], dtype=float)[None, :]
+        y = self.sales
+
+        n_obs = w.sum(axis=1)
+        safe_n = np.maximum(n_obs, 1)
+        x_mean = (w * x).sum(axis=1) / safe_n
+        y_mean = (w * y).sum(axis=1) / safe_n
+        dx = (x - x_mean[:, None]) * w
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * (y - y_mean[:, None])).sum(axis=1)
+
+        # Pri menej ako 3 mesiacoch sa trend neodhaduje (len priemer)
+        has_trend = (n_obs >= 3) & (sxx > 0)
+        slope = np.where(has_trend, sxy / np.where(sxx > 0, sxx, 1), 0.0)
+        intercept = y_mean - slope * x_mean
+
+        residuals = (y - (intercept[:, None] + slope[:, None] * x)) * w
+        dof = np.where(has_trend, n_obs - 2, n_obs - 1)
+        sigma = np.sqrt((residuals ** 2).sum(axis=1) / np.maximum(dof, 1))
+
+        return {
+            'intercept': intercept, 'slope': slope, 'sigma': sigma, 'n_obs': n_obs,
+            'x_mean': x_mean, 'sxx': np.where(has_trend, sxx, np.inf),
+        }
+
+    def _fit_average(self):
+        """Priemer posledných AVERAGE_WINDOW mesiacov histórie, rozptyl z celej histórie"""
+        w = self.mask.astype(float)
+        n_obs = w.sum(axis=1)
+
+        # Posledných k maskovaných stĺpcov = tie s poradím od konca < k
+        rank_from_end = np.cumsum(w[:, ::-1], axis=1)[:, ::-1]
+        window = w * (rank_from_end <= AVERAGE_WINDOW)
+        k = window.sum(axis=1)
+        level = (window * self.sales).sum(axis=1) / np.maximum(k, 1)
+
+        mean = (w * self.sales).sum(axis=1) / np.maximum(n_obs, 1)
+        var = (w * (self.sales - mean[:, None]) ** 2).sum(axis=1) / np.maximum(n_obs - 1, 1)
+
+        return {'level': level, 'sigma': np.sqrt(var), 'n_obs': n_obs, 'k': np.maximum(k, 1)}
+
+    # ==================== PREDIKCIA ====================
+
+    def predict(self, months, method='trend'):
+        """Predikcia a rozptyl pre indexy mesiacov (matice riadky × mesiace)"""
+        params = self.fit(method)
+        x0 = np.asarray(months, dtype=float)[None, :]
+
+        if method == 'trend':
+            mean = params['intercept'][:, None] + params['slope'][:, None] * x0
+            n = np.maximum(params['n_obs'], 1)[:, None]
+            leverage = 1 + 1 / n + (x0 - params['x_mean'][:, None]) ** 2 / params['sxx'][:, None]
+            var = params['sigma'][:, None] ** 2 * leverage
+        else:
+            mean = np.repeat(params['level'][:, None], x0.shape[1], axis=1)
+            var = np.repeat((params['sigma'] ** 2 * (1 + 1 / params['k']))[:, None], x0.shape[1], axis=1)
+
+        # Bez histórie nie je čo predikovať
+        empty = params['n_obs'] == 0
+        mean[empty] = 0.0
+        var[empty] = 0.0
+        return np.maximum(mean, 0.0), var
+
+    def _frame(self, mean, var, extra=None):
+        std = np.sqrt(var)
+        data = {
+            'name': self.table.names[self.rows],
+            'workplace': self.table.workplaces[self.rows],
+        }
+        data.update(extra or {})
+        data.update({
+            'forecast': mean,
+            'lower': np.maximum(mean - self.z * std, 0.0),
+            'upper': mean + self.z * std,
+            'std': std,
+            'history_months': self.fit('trend')['n_obs'].astype(int),
+        })
+        return pd.DataFrame(data)
+
+    def next_month_index(self):
+        return self.last_month + 1
+
+    def next_month_label(self):
+        return MONTH_COLUMNS[self.next_month_index() % 12]
+
+    def month_ahead(self, method='trend'):
+        """Predikcia na nasledujúci mesiac pre každého zamestnanca"""
+        target = self.next_month_index()
+        mean, var = self.predict([target], method)
+        last_actual = self.sales[:, self.last_month] if self.last_month >= 0 else np.zeros(len(self.rows))
+        return self._frame(mean[:, 0], var[:, 0], {'last_actual': last_actual})
+
+    def quarter_months(self):
+        """Indexy mesiacov kvartálu, do ktorého patrí nasledujúci mesiac"""
+        start = (self.next_month_index() % 12) // 3 * 3
+        offset = self.next_month_index() - self.next_month_index() % 12
+        return np.arange(start, start + 3) + offset
+
+    def quarter_label(self):
+        return f"Q{(self.next_month_index() % 12) // 3 + 1}"
+
+    def quarter_end(self, method='trend'):
+        """Projekcia konca kvartálu = skutočnosť doteraz + predikcia zvyšných mesiacov"""
+        months = self.quarter_months()
+        past = months[months <= self.last_month]
+        future = months[months > self.last_month]
+
+        actual = self.sales[:, past].sum(axis=1) if len(past) else np.zeros(len(self.rows))
+        mean, var = self.predict(future, method)
+        # Mesiace považujeme za nezávislé - rozptyly sa sčítajú
+        return self._frame(actual + mean.sum(axis=1), var.sum(axis=1), {'actual_to_date': actual})
+
+    def by_workplace(self, frame):
+        """Agregácia predikcií po mestách (súčet priemerov aj rozptylov)"""
+        if frame.empty:
+            return frame
+        grouped = frame.assign(var=frame['std'] ** 2, employees=1).groupby('workplace', sort=False)
+        value_cols = [c for c in ('last_actual', 'actual_to_date') if c in frame.columns]
+        result = grouped[value_cols + ['forecast', 'var', 'employees']].sum()
+        std = np.sqrt(result.pop('var'))
+        result['lower'] = np.maximum(result['forecast'] - self.z * std, 0.0)
+        result['upper'] = result['forecast'] + self.z * std
+        result['std'] = std
+        return result.reset_index().sort_values('forecast', ascending=False, ignore_index=True)
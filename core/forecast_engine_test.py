@@ -0,0 +1,88 @@
+# core/forecast_engine_test.py
+import numpy as np
+import pytest
+
+from core.employee_table import EmployeeTable, MONTH_COLUMNS
+from core.forecast_engine import ForecastEngine, AVERAGE_WINDOW
+
+
+# Predaj leden..cerven (firma má dáta do júna = posledný mesiac 5)
+ROWS = {
+    'trend': [100, 120, 150, 160, 200, 210],
+    'late_start': [0, 0, 0, 300, 250, 400],      # história od apríla (3 mesiace)
+    'two_months': [0, 0, 0, 0, 80, 120],         # menej ako 3 mesiace - bez trendu
+    'one_month': [0, 0, 0, 0, 0, 90],
+    'gap': [50, 0, 0, 70, 0, 40],                # nuly po prvom predaji sú súčasť histórie
+    'no_sales': [0, 0, 0, 0, 0, 0],
+}
+
+
+@pytest.fixture(scope='module')
+def engine():
+    table = EmployeeTable([
+        {'name': name, 'workplace': 'praha', 'monthly_sales': dict(zip(MONTH_COLUMNS, sales))}
+        for name, sales in ROWS.items()
+    ])
+    return ForecastEngine(table)
+
+
+def history(sales):
+    """Referenčná história riadku: od prvého nenulového mesiaca po jún"""
+    sales = np.asarray(sales, dtype=float)
+    nonzero = np.flatnonzero(sales > 0)
+    if not len(nonzero):
+        return np.array([]), np.array([])
+    x = np.arange(nonzero[0], 6, dtype=float)
+    return x, sales[nonzero[0]:6]
+
+
+@pytest.mark.parametrize('name', list(ROWS))
+def test_trend_matches_polyfit(engine, name):
+    fit = engine.fit('trend')
+    i = list(ROWS).index(name)
+    x, y = history(ROWS[name])
+
+    assert fit['n_obs'][i] == len(x)
+    if len(x) >= 3:
+        slope, intercept = np.polyfit(x, y, 1)
+        residuals = y - (intercept + slope * x)
+        sigma = np.sqrt((residuals ** 2).sum() / (len(x) - 2))
+    else:
+        slope, intercept = 0.0, (y.mean() if len(y) else 0.0)
+        sigma = y.std(ddof=1) if len(y) > 1 else 0.0
+    assert fit['slope'][i] == pytest.approx(slope)
+    assert fit['intercept'][i] == pytest.approx(intercept)
+    assert fit['sigma'][i] == pytest.approx(sigma)
+
+
+@pytest.mark.parametrize('name', list(ROWS))
+def test_average_matches_window_mean(engine, name):
+    fit = engine.fit('average')
+    i = list(ROWS).index(name)
+    _, y = history(ROWS[name])
+
+    assert fit['level'][i] == pytest.approx(y[-AVERAGE_WINDOW:].mean() if len(y) else 0.0)
+    assert fit['sigma'][i] == pytest.approx(y.std(ddof=1) if len(y) > 1 else 0.0)
+    assert fit['k'][i] == max(min(len(y), AVERAGE_WINDOW), 1)
+
+
+@pytest.mark.parametrize('method', ['trend', 'average'])
+def test_month_ahead(engine, method):
+    forecast = engine.month_ahead(method).set_index('name')
+    assert engine.next_month_label() == 'cervenec'
+
+    x, y = history(ROWS['trend'])
+    if method == 'trend':
+        slope, intercept = np.polyfit(x, y, 1)
+        expected = intercept + slope * 6
+    else:
+        expected = y[-AVERAGE_WINDOW:].mean()
+    assert forecast.loc['trend', 'forecast'] == pytest.approx(expected)
+    # Bez predaja nie je čo predikovať
+    assert forecast.loc['no_sales', ['forecast', 'std', 'history_months']].tolist() == [0, 0, 0]
+    assert (forecast['forecast'] >= 0).all() and (forecast['lower'] <= forecast['forecast']).all()
+
+
+def test_unknown_method(engine):
+    with pytest.raises(ValueError):
+        engine.fit('median')
@@ -168,13 +168,9 @@ class KPIManager:
     def get_city_kpis(self, city: str, period: str = "current", analyzer=None) -> List[Dict]:
         """Získa KPI pre všetkých zamestnancov z daného mesta"""
         try:
-            # Ak nemáme analyzer, skús ho získať zo session state alebo vráť prázdne dáta
+            # Analyzer odovzdáva UI vrstva - core nesiaha do session state
             if analyzer is None:
-                import streamlit as st
-                if 'analyzer' in st.session_state:
-                    analyzer = st.session_state.analyzer
-                else:
-                    return [{"error": "Analyzer nie je dostupný"}]
+                return [{"error": "Analyzer nie je dostupný"}]
             
             # Získaj zamestnancov z mesta
             city_employees = []
@@ -0,0 +1,66 @@
+# core/leaderboard.py
+import numpy as np
+
+
+class Leaderboard:
+    """Zoradený index jednej metriky
+
+    Poradie sa zoradí raz; top-N / bottom-N sú rezy, poradie zamestnanca je
+    O(1) lookup a poradie ľubovoľnej hodnoty / prahy sú binárne vyhľadávanie.
+    """
+
+    def __init__(self, values, keys=None):
+        self.values = np.asarray(values, dtype=float)
+        n = len(self.values)
+        self.keys = np.asarray(list(keys) if keys is not None else range(n), dtype=object)
+
+        # Zostupne aj vzostupne, pri zhode stabilne podľa pôvodného poradia
+        self.order = np.argsort(-self.values, kind='stable')
+        self.ascending_order = np.argsort(self.values, kind='stable')
+        self.ascending = self.values[self.ascending_order]
+        self.positions = np.empty(n, dtype=int)
+        self.positions[self.order] = np.arange(n)
+
+        self.key_index = {}
+        for i, key in enumerate(self.keys):
+            self.key_index.setdefault(key, i)
+
+    def __len__(self):
+        return len(self.values)
+
+    def top(self, n):
+        """Indexy n najlepších (zostupne)"""
+        return self.order[:n]
+
+    def bottom(self, n):
+        """Indexy n najslabších (vzostupne)"""
+        return self.ascending_order[:n]
+
+    def top_keys(self, n):
+        return list(self.keys[self.top(n)])
+
+    def bottom_keys(self, n):
+        return list(self.keys[self.bottom(n)])
+
+    def rank(self, key):
+        """Poradie (1 = najlepší) podľa kľúča alebo None"""
+        i = self.key_index.get(key)
+        return int(self.positions[i]) + 1 if i is not None else None
+
+    def rank_of_value(self, value):
+        """Poradie, ktoré by hodnota mala (1 + počet striktne väčších)"""
+        return 1 + len(self) - int(np.searchsorted(self.ascending, value, side='right'))
+
+    def at_least(self, threshold):
+        """Indexy s hodnotou >= threshold (zostupne)"""
+        count = len(self) - int(np.searchsorted(self.ascending, threshold, side='left'))
+        return self.order[:count]
+
+    def at_most(self, threshold):
+        """Indexy s hodnotou <= threshold (vzostupne)"""
+        count = int(np.searchsorted(self.ascending, threshold, side='right'))
+        return self.ascending_order[:count]
+
+    def median(self):
+        """Medián (horný pri párnom počte, ako sorted(...)[n // 2])"""
+        return float(self.ascending[len(self) // 2]) if len(self) else 0.0
@@ -0,0 +1,49 @@
+# core/leaderboard_test.py
+import pytest
+
+from core.leaderboard import Leaderboard
+
+
+KEYS = ['a', 'b', 'c', 'd', 'e']
+VALUES = [10, 30, 20, 30, 10]
+
+
+@pytest.fixture
+def board():
+    return Leaderboard(VALUES, KEYS)
+
+
+def test_ties_keep_original_order(board):
+    # Zhoda 30: b pred d, zhoda 10: a pred e - zostupne aj vzostupne
+    assert board.top_keys(5) == ['b', 'd', 'c', 'a', 'e']
+    assert board.bottom_keys(5) == ['a', 'e', 'c', 'b', 'd']
+
+
+@pytest.mark.parametrize('key, rank', [('b', 1), ('d', 2), ('c', 3), ('a', 4), ('e', 5), ('x', None)])
+def test_rank(board, key, rank):
+    assert board.rank(key) == rank
+
+
+@pytest.mark.parametrize('value, rank', [(40, 1), (30, 1), (25, 3), (20, 3), (10, 4), (0, 6)])
+def test_rank_of_value(board, value, rank):
+    assert board.rank_of_value(value) == rank
+
+
+@pytest.mark.parametrize('threshold, keys', [(30, ['b', 'd']), (20, ['b', 'd', 'c']), (31, []), (0, ['b', 'd', 'c', 'a', 'e'])])
+def test_at_least(board, threshold, keys):
+    assert [KEYS[i] for i in board.at_least(threshold)] == keys
+
+
+@pytest.mark.parametrize('threshold, keys', [(10, ['a', 'e']), (20, ['a', 'e', 'c']), (9, [])])
+def test_at_most(board, threshold, keys):
+    assert [KEYS[i] for i in board.at_most(threshold)] == keys
+
+
+def test_duplicate_key_ranks_first_occurrence():
+    board = Leaderboard([1, 5], ['x', 'x'])
+    assert board.rank('x') == 2
+
+
+@pytest.mark.parametrize('values, median', [([], 0.0), ([3], 3.0), ([1, 2], 2.0), ([5, 1, 3], 3.0)])
+def test_median(values, median):
+    assert Leaderboard(values).median() == median
@@ -1,5 +1,6 @@
 # core/metrics_calculator.py
-from core.utils import time_to_minutes
+from core.utils import time_to_minutes, activity_minutes_by_person
+import numpy as np
 import pandas as pd
 import unicodedata
 from difflib import SequenceMatcher
@@ -267,3 +268,75 @@ class EmployeeMetricsCalculator:
 
         
         return min(100, productivity_percentage)
+
+
+    # ==================== BATCH VÝPOČTY ====================
+
+    def calculate_all_employees_metrics(self):
+        """Vypočíta skóre všetkých metrík pre všetkých zamestnancov naraz
+
+        Returns:
+            DataFrame: index = meno zamestnanca, stĺpce sales/mail/sketchup/internet/overall.
+            mail je NaN ak internet dáta chýbajú (rovnako ako výnimka v per-employee verzii).
+        """
+
+        table = self.analyzer.get_employee_table()
+        cached = getattr(self.analyzer, '_metrics_table', None)
+        if cached is not None and cached[0] is table:
+            return cached[1]
+
+        names = list(table.names)
+        # Rovnaký predaj ako karta zamestnanca: total_sales, pri nule súčet mesiacov
+        card_sales = np.where(table.reported_totals != 0, table.reported_totals, table.totals)
+        sales = np.maximum(card_sales, 0)
+
+        result = pd.DataFrame(index=pd.Index(names, name='name'))
+        result['sales'] = np.minimum(100, sales / 2000000 * 100)
+        result['overall'] = np.where(table.scores > 0, table.scores, 50)
+
+        internet_data = getattr(self.analyzer, 'internet_data', None)
+        if internet_data is None or internet_data.empty or not names:
+            result['mail'] = np.nan if internet_data is None else 50
+            result['sketchup'] = 100
+            result['internet'] = 60
+        else:
+            columns = ['Mail', 'Chat', 'IS Sykora', 'SykoraShop', 'Web k praci', 'Čas celkem ▼']
+            person_minutes = activity_minutes_by_person(internet_data, columns)
+
+            # Matica zhody zamestnanec × osoba (matchovanie len raz za snapshot)
+            persons = list(person_minutes.index)
+            match = np.zeros((len(names), len(persons)))
+            for i, name in enumerate(names):
+                matched = set(self.find_matching_names(name, internet_data))
+                for j, person in enumerate(persons):
+                    if person in matched:
+                        match[i, j] = 1
+
+            totals = pd.DataFrame(match @ person_minutes.to_numpy(dtype=float), index=result.index, columns=columns)
+            has_records = match.sum(axis=1) > 0
+            day_total = totals['Čas celkem ▼'].to_numpy()
+            safe_total = np.where(day_total > 0, day_total, 1)
+
+            # Mail efektivita - prahy cez np.select
+            mail_pct = totals['Mail'].to_numpy() / safe_total * 100
+            mail = np.select(
+                [(mail_pct >= 10) & (mail_pct <= 25), mail_pct < 10, mail_pct <= 35, mail_pct <= 50],
+                [90, 70, 75, 50],
+                default=30
+            )
+            mail = np.minimum(100, mail + np.select([sales > 3000000, sales > 2000000], [15, 10], default=0))
+            result['mail'] = np.where(has_records & (day_total > 0), mail, 50)
+
+            # SketchUp - pásma 0 / ≤30 / ≤60 / ≤120 / viac minút
+            sketchup_bins = np.digitize(totals['Chat'].to_numpy(), [0, 30, 60, 120], right=True)
+            sketchup = np.array([100, 80, 60, 40, 20])[sketchup_bins]
+            result['sketchup'] = np.where(has_records, sketchup, 100)
+
+            # Internet efektivita - podiel produktívneho času
+            productive = totals[['IS Sykora', 'Mail', 'SykoraShop', 'Web k praci']].sum(axis=1).to_numpy()
+            internet = np.minimum(100, productive / safe_total * 100)
+            result['internet'] = np.where(has_records & (day_total > 0), internet, 60)
+
+        result = result[['sales', 'mail', 'sketchup', 'internet', 'overall']]
+        self.analyzer._metrics_table = (table, result)
+        return result
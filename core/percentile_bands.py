@@ -0,0 +1,101 @@
+# core/percentile_bands.py
+import numpy as np
+import pandas as pd
+
+from core.utils import INTERNET_ACTIVITY_COLUMNS, APP_ACTIVITY_COLUMNS
+
+
+PERCENTILES = [10, 25, 50, 75, 90]
+COMPANY = 'company'
+
+
+class PercentileBands:
+    """Percentilové pásma denných priemerov aktivít (hodiny/deň) pre firmu a mestá
+
+    Pre každý rozsah (firma, mesto) a aktivitu sa raz zoradia hodnoty
+    zamestnancov. Pásma sa počítajú raz na rozsah (pri prvom dopyte) a poradie
+    zamestnanca je binárne vyhľadávanie (searchsorted).
+    """
+
+    def __init__(self, analyzer, data_type='internet'):
+        self.data_type = data_type
+        self.columns = INTERNET_ACTIVITY_COLUMNS if data_type == 'internet' else APP_ACTIVITY_COLUMNS
+        self.values, self.workplaces = self._daily_averages(analyzer)
+        self._bands = {}  # rozsah -> tabuľka pásiem
+
+        self.sorted = {COMPANY: self._sort(self.values)}
+        for workplace, group in self.values.groupby(self.workplaces.reindex(self.values.index)):
+            if workplace != 'unknown':
+                self.sorted[workplace] = self._sort(group)
+
+    def _daily_averages(self, analyzer):
+        """Denný priemer (hodiny) na zamestnanca = súčet minút / počet denných riadkov
+
+        Rovnaká definícia ako get_employee_daily_averages; varianty mena jednej
+        osoby sa zlúčia cez name_mapping.
+        """
+        daily = analyzer.get_activity_rollup(self.data_type).daily
+        columns = [c for c in self.columns if c in daily.columns]
+        if daily.empty or not columns:
+            return pd.DataFrame(columns=self.columns, dtype=float), pd.Series(dtype=object)
+
+        person_emp = analyzer.person_to_employee(daily['Osoba ▲'].unique())
+        employee = daily['Osoba ▲'].map(lambda p: person_emp[p][0])
+
+        grouped = daily[columns].groupby(employee.to_numpy())
+        hours = grouped.sum().div(grouped.size(), axis=0) / 60
+        hours = hours.reindex(columns=self.columns, fill_value=0.0)
+
+        workplaces = pd.Series({emp: wp for emp, wp in person_emp.values()})
+        workplaces = workplaces[~workplaces.index.duplicated()]
+        return hours, workplaces
+
+    @staticmethod
+    def _sort(frame):
+        return {col: np.sort(frame[col].to_numpy(dtype=float)) for col in frame.columns}
+
+    def scopes(self):
+        return list(self.sorted.keys())
+
+    def bands(self, scope=COMPANY):
+        """Tabuľka aktivita × p10..p90 (+ počet zamestnancov) pre daný rozsah (zdieľaná, nemeniť)"""
+        if scope not in self._bands:
+            self._bands[scope] = self._compute_bands(scope)
+        return self._bands[scope]
+
+    def _compute_bands(self, scope):
+        sorted_values = self.sorted.get(scope, {})
+        rows = {}
+        for col, values in sorted_values.items():
+            if len(values) == 0:
+                continue
+            # Pole je už zoradené - percentil je len interpolácia medzi susednými indexmi
+            rows[col] = dict(zip([f'p{p}' for p in PERCENTILES], np.percentile(values, PERCENTILES)))
+            rows[col]['count'] = len(values)
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    def percentile_rank(self, value, activity, scope=COMPANY):
+        """Percentil hodnoty v rámci rozsahu (0-100, zhody sa počítajú do polovice)"""
+        values = self.sorted.get(scope, {}).get(activity)
+        if values is None or len(values) == 0:
+            return None
+        below = np.searchsorted(values, value, side='left')
+        at_or_below = np.searchsorted(values, value, side='right')
+        return float((below + at_or_below) / 2 / len(values) * 100)
+
+    def employee_profile(self, employee_name, scope=COMPANY):
+        """Hodnoty zamestnanca, jeho percentil a pásma rozsahu pre každú aktivitu"""
+        if employee_name not in self.values.index:
+            return pd.DataFrame()
+        bands = self.bands(scope)
+        if bands.empty:
+            return bands
+        employee = self.values.loc[employee_name]
+        profile = bands.copy()
+        profile.insert(0, 'value', [float(employee.get(col, 0.0)) for col in profile.index])
+        profile.insert(1, 'percentile', [self.percentile_rank(v, col, scope)
+                                         for col, v in zip(profile.index, profile['value'])])
+        return profile
+
+    def workplace_of(self, employee_name):
+        return self.workplaces.get(employee_name, 'unknown')
@@ -9,7 +9,6 @@ from datetime import datetime, timedelta
 import time
 import threading
 from typing import Dict, List, Optional
-import streamlit as st
 
 
 class ServerMonitor:
@@ -0,0 +1,164 @@
+# core/sql_engine.py
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+
+DEFAULT_MAX_ROWS = 1000
+DEFAULT_TIMEOUT = 5.0
+
+# Povolené operácie pre sqlite authorizer - všetko ostatné (zápis, ATTACH, PRAGMA...) sa zamietne
+_READ_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    getattr(sqlite3, 'SQLITE_RECURSIVE', 33),
+}
+
+_LEADING_COMMENTS = re.compile(r'^\s*(--[^\n]*\n|/\*.*?\*/|\s)*', re.S)
+
+
+class SQLEngine:
+    """In-process SQL (SQLite v pamäti) nad snapshotom dát
+
+    Tabuľky:
+        sales              - zamestnanec × mesiac s predajom
+        internet_monthly   - osoba × mesiac × aktivita (minúty)
+        applications_monthly
+        internet_daily     - osoba × deň × aktivita (minúty)
+        applications_daily
+        studio_sales       - aktívne objednávky zo Studio reportu (ak je k dispozícii)
+    """
+
+    def __init__(self, analyzer=None, studio_analyzer=None):
+        self.analyzer = analyzer
+        self.studio_analyzer = studio_analyzer
+        self.connection = None
+        self.tables = {}
+        self._lock = threading.Lock()
+
+    # ==================== REGISTRÁCIA TABULIEK ====================
+
+    def build(self):
+        """Vytvorí databázu v pamäti a zaregistruje všetky dostupné tabuľky"""
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self.tables = {}
+
+        if self.analyzer is not None:
+            engine = self.analyzer.get_analytics_engine()
+            sales = engine.sales_facts().rename(columns={'value': 'sales'})
+            self._register(connection, 'sales', sales)
+
+            for data_type in ('internet', 'applications'):
+                monthly = engine.activity_facts(data_type).rename(columns={'value': 'minutes'})
+                self._register(connection, f'{data_type}_monthly', monthly)
+                self._register(connection, f'{data_type}_daily', self._daily_facts(data_type))
+
+        if self.studio_analyzer is not None and getattr(self.studio_analyzer, 'df_active', None) is not None:
+            self._register(connection, 'studio_sales', self.studio_analyzer.df_active)
+
+        # Od tejto chvíle len čítanie
+        connection.execute('PRAGMA query_only = ON')
+        connection.set_authorizer(self._authorize)
+        self.connection = connection
+        return self
+
+    def _daily_facts(self, data_type):
+        """Long tabuľka osoba × deň × aktivita z denných riadkov rollupu
+
+        employee a workplace sú rovnaké ako v sales a *_monthly (meno zo sales),
+        takže denné tabuľky sa dajú joinovať na predaj aj mesto.
+        """
+        daily = self.analyzer.get_activity_rollup(data_type).daily
+        columns = ['person', 'employee', 'workplace', 'date', 'source_file', 'activity', 'minutes']
+        if daily.empty:
+            return pd.DataFrame(columns=columns)
+
+        facts = daily.melt(id_vars=['Osoba ▲', 'Date', 'Source_File'], var_name='activity', value_name='minutes')
+        facts = facts[facts['minutes'] > 0]
+        person_emp = self.analyzer.person_to_employee(facts['Osoba ▲'].unique())
+        facts.insert(1, 'employee', facts['Osoba ▲'].map(lambda p: person_emp[p][0]))
+        facts.insert(2, 'workplace', facts['Osoba ▲'].map(lambda p: person_emp[p][1]))
+        facts.columns = columns
+        return facts.reset_index(drop=True)
+
+    def _register(self, connection, name, df):
+        df = df.copy()
+        for col in df.columns:
+            # Dátumy ako ISO text, aby fungovalo porovnanie '2025-08-01' <= date
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+            elif df[col].dtype == object:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        df.to_sql(name, connection, index=False)
+        self.tables[name] = {'columns': list(df.columns), 'rows': len(df)}
+
+    # ==================== DOTAZY ====================
+
+    @staticmethod
+    def _authorize(action, arg1, arg2, db_name, trigger):
+        return sqlite3.SQLITE_OK if action in _READ_ACTIONS else sqlite3.SQLITE_DENY
+
+    @staticmethod
+    def check_read_only(sql):
+        """Povolí len jeden SELECT/WITH príkaz"""
+        # Viac príkazov odmietne sqlite3 (execute), zápisy authorizer a query_only
+        statement = _LEADING_COMMENTS.sub('', sql or '').strip()
+        if statement.endswith(';'):
+            statement = statement[:-1].rstrip()
+        if not statement:
+            raise ValueError("Prázdny dotaz")
+        keyword = statement.split(None, 1)[0].upper()
+        if keyword not in ('SELECT', 'WITH'):
+            raise ValueError("Povolené sú len SELECT dotazy")
+        return statement
+
+    def execute(self, sql, max_rows=DEFAULT_MAX_ROWS, timeout=DEFAULT_TIMEOUT):
+        """Spustí read-only dotaz s limitom riadkov a časovým limitom
+
+        Returns:
+            tuple: (DataFrame s najviac max_rows riadkami, bool či bol výsledok orezaný, trvanie v s)
+        """
+        statement = self.check_read_only(sql)
+        if self.connection is None:
+            self.build()
+
+        deadline = time.perf_counter() + timeout
+        start = time.perf_counter()
+
+        with self._lock:
+            # Progress handler preruší dotaz po uplynutí limitu (sqlite3.OperationalError: interrupted)
+            self.connection.set_progress_handler(lambda: int(time.perf_counter() > deadline), 10000)
+            try:
+                cursor = self.connection.execute(statement)
+                rows = cursor.fetchmany(max_rows + 1)
+                columns = [d[0] for d in cursor.description or []]
+                cursor.close()
+            except sqlite3.OperationalError as e:
+                if 'interrupted' in str(e):
+                    raise TimeoutError(f"Dotaz prekročil časový limit {timeout:g} s") from e
+                raise
+            finally:
+                self.connection.set_progress_handler(None, 0)
+
+        truncated = len(rows) > max_rows
+        result = pd.DataFrame.from_records(rows[:max_rows], columns=columns)
+        return result, truncated, time.perf_counter() - start
+
+
+def get_sql_engine(analyzer, studio_analyzer=None):
+    """SQL engine pre aktuálny snapshot (cachovaný na analyzéri)"""
+    version = analyzer.get_analytics_engine().snapshot_version() if analyzer is not None else None
+    key = (version, id(studio_analyzer) if studio_analyzer is not None else None)
+
+    cached = getattr(analyzer, '_sql_engine', None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    engine = SQLEngine(analyzer, studio_analyzer).build()
+    if analyzer is not None:
+        analyzer._sql_engine = (key, engine)
+    return engine
@@ -1,10 +1,13 @@
 import pandas as pd
 import numpy as np
 import re
-import streamlit as st
 from typing import Dict, List, Tuple
 import difflib
 
+from core.leaderboard import Leaderboard
+from core.studio_cube import StudioCube
+from core.studio_products import ProductIndex
+
 
 
 class StudioAnalyzer:
@@ -30,8 +33,16 @@ class StudioAnalyzer:
         df = pd.read_excel(file)
         return df
     
+    # Opakujúce sa texty sa držia ako kategórie (kódy + jeden zoznam hodnôt)
+    CATEGORY_COLUMNS = ['Kontaktní osoba-Jméno a příjmení', 'Název', 'Název_norm', 'Uživatelský stav',
+                        'Odběratel', 'Mesiac', 'Štvrťrok']
+    
     def process_data(self):
-        """Spracuje a vyčistí dáta"""
+        """Spracuje a vyčistí dáta
+        
+        Surový self.df sa po spracovaní zahodí - drží sa len df_active
+        s kategóriami pre texty a zmenšenými celočíselnými stĺpcami.
+        """
         # Konverzia dátumu
         self.df['Datum real.'] = pd.to_datetime(self.df['Datum real.'], errors='coerce')
         
@@ -42,25 +53,69 @@ class StudioAnalyzer:
             status_str = str(status).strip()
             return status_str == '12-Zrušena' or status_str == '12'
         
-        # Aplikuj filter
-        cancelled_mask = self.df['Uživatelský stav'].apply(is_cancelled)
-        self.df_active = self.df.loc[~cancelled_mask].copy()
+        # Aplikuj filter (stav sa vyhodnotí raz pre každú hodnotu, nie pre každý riadok)
+        status = self.df['Uživatelský stav'].astype('category')
+        cancelled_mask = status.cat.codes.isin(
+            [i for i, value in enumerate(status.cat.categories) if is_cancelled(value)])
+        self.df_active = self.df.loc[~cancelled_mask.to_numpy()]
         
-        # Normalizácia názvov spotrebičov
-        self.df_active.loc[:, 'Název_norm'] = self.df_active['Název'].apply(self.realistic_normalize_appliance)
+        # Normalizácia názvov spotrebičov - raz pre každý unikátny názov
+        names = self.df_active['Název'].dropna().unique()
+        normalized = {name: self.realistic_normalize_appliance(name) for name in names}
+        self.df_active = self.df_active.assign(
+            Název_norm=self.df_active['Název'].map(normalized).fillna(self.realistic_normalize_appliance(None)))
         
         # Ponechaj len relevantné spotrebiče
-        relevant_data = self.df_active.loc[self.df_active['Název_norm'].isin(self.APPLIANCES)].copy()
-        self.df_active = relevant_data
+        relevant_data = self.df_active.loc[self.df_active['Název_norm'].isin(self.APPLIANCES)]
+        
+        # Zoradenie podľa dátumu (NaT na konci) - rozsah dátumov je potom len rez cez searchsorted
+        self.df_active = relevant_data.sort_values('Datum real.', kind='stable', na_position='last')
         
         # Pridanie časových období
         if not self.df_active.empty:
             self.df_active.loc[:, 'Mesiac'] = self.df_active['Datum real.'].dt.to_period('M').astype(str)
             self.df_active.loc[:, 'Štvrťrok'] = self.df_active['Datum real.'].dt.to_period('Q').astype(str)
             self.df_active.loc[:, 'Rok'] = self.df_active['Datum real.'].dt.year
+        
+        self.df_active = self.compact(self.df_active)
+        self.df = None
+        
+        # Kocka s kumulatívnymi súčtami sa postaví raz pri načítaní (cachuje sa spolu s analyzérom)
+        self.cube = StudioCube(self.df_active, self.APPLIANCES)
+        self._products = (self.df_active, ProductIndex(self.df_active))
+        self.employee_scope = None  # None = všetci, inak zoznam povolených mien
+        self.date_window = None     # (od, do) po filter_by_date
+    
+    @classmethod
+    def compact(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Texty na kategórie (abecedné poradie ako pri zoradení stringov), celé čísla na najmenší typ
+        
+        Ceny ostávajú float64 - súčty tržieb v Kč by vo float32 strácali presnosť.
+        """
+        df = df.copy()
+        for column in cls.CATEGORY_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        for column in df.columns:
+            if pd.api.types.is_integer_dtype(df[column]) and not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = pd.to_numeric(df[column], downcast='integer')
+        return df
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Pamäť analyzéra v bajtoch (df_active, kocka, produktový index)"""
+        usage = {'df_active': int(self.df_active.memory_usage(deep=True).sum())}
+        cube = getattr(self, 'cube', None)
+        if cube is not None:
+            usage['cube'] = cube.nbytes()
+        cached = getattr(self, '_products', None)
+        if cached is not None:
+            products = cached[1]
+            tables = [products.employees, products.company] + ([products.cities] if products.cities is not None else [])
+            usage['products'] = int(sum(t.memory_usage(deep=True).sum() for t in tables))
+        usage['total'] = sum(usage.values())
+        return usage
 
 
-    
     def realistic_normalize_appliance(self, nazev: str) -> str:
         if pd.isna(nazev):
             return 'ostatne'
@@ -106,15 +161,61 @@ class StudioAnalyzer:
 
         return 'ostatne'
 
-    def get_employee_summary(self) -> pd.DataFrame:
-        """Získa súhrnný prehľad podľa zamestnancov (bez delenia podľa štúdií)"""
+    def date_bounds(self) -> Tuple:
+        """Prvý a posledný dátum v df_active (zoradené podľa dátumu, NaT na konci)"""
+        dates = self.df_active['Datum real.']
+        valid = int(dates.count())
+        if valid == 0:
+            return None, None
+        return dates.iloc[0], dates.iloc[valid - 1]
+    
+    def date_positions(self, start_date, end_date) -> Tuple[int, int]:
+        """Pozície [od, do) riadkov s dátumom v rozsahu start_date .. koniec dňa end_date"""
+        dates = self.df_active['Datum real.'].to_numpy()
+        start = pd.Timestamp(start_date).to_datetime64().astype(dates.dtype)
+        end = (pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)).to_datetime64().astype(dates.dtype)
+        return int(np.searchsorted(dates, start, side='left')), int(np.searchsorted(dates, end, side='left'))
+    
+    def filter_by_date(self, start_date, end_date) -> 'StudioAnalyzer':
+        """Nový analyzer nad rezom df_active pre rozsah dátumov (bez kópie a bez prepočtu názvov)"""
+        start, end = self.date_positions(start_date, end_date)
+        filtered = StudioAnalyzer.__new__(StudioAnalyzer)
+        filtered.df_active = self.df_active.iloc[start:end]
+        filtered.cube = self.get_cube()
+        filtered.employee_scope = getattr(self, 'employee_scope', None)
+        filtered.date_window = (start_date, end_date)
+        return filtered
+    
+    def get_cube(self) -> StudioCube:
+        """Kocka zamestnanec × spotrebič × deň (postaví sa, ak chýba)"""
+        cube = getattr(self, 'cube', None)
+        if cube is None:
+            cube = self.cube = StudioCube(self.df_active, self.APPLIANCES)
+        return cube
+    
+    def get_product_index(self) -> ProductIndex:
+        """Tržby a kusy (kategória, produkt) pre df_active - pre celý snapshot pri načítaní, inak pri prvom dopyte"""
+        cached = getattr(self, '_products', None)
+        if cached is None or cached[0] is not self.df_active:
+            cached = self._products = (self.df_active, ProductIndex(self.df_active))
+        return cached[1]
+    
+    LOW_SALES_RATIO = 0.15   # menej ako 15 % z celkového predaja
+    LOW_SALES_SHARE = 0.2    # a zároveň menej ako 20 % z celku
+    
+    def get_employee_summary(self, all_employees: bool = False) -> pd.DataFrame:
+        """Získa súhrnný prehľad podľa zamestnancov (bez delenia podľa štúdií)
+        
+        all_employees=True pridá aj výsledky detect_imbalances pre všetkých naraz
+        (stĺpce mean, std a <spotrebič>_red_flag).
+        """
         
+        # Prázdny výsledok = žiadne aktívne dáta po filtrovaní (hlásenie rieši UI)
         if self.df_active.empty:
-            st.error("❌ Žiadne aktívne dáta po filtrovaní!")
             return pd.DataFrame()
         
         # Grupovanie len podľa zamestnanca
-        summary = self.df_active.groupby(['Kontaktní osoba-Jméno a příjmení', 'Název_norm']).size().unstack(fill_value=0)
+        summary = self.df_active.groupby(['Kontaktní osoba-Jméno a příjmení', 'Název_norm'], observed=True).size().unstack(fill_value=0)
         
         # Zabezpečenie všetkých stĺpcov spotrebičov
         for appliance in self.APPLIANCES:
@@ -122,34 +223,67 @@ class StudioAnalyzer:
                 summary[appliance] = 0
         
         # Celkový predaj
+        counts = summary[self.APPLIANCES].to_numpy(dtype=float)
+        total = counts.sum(axis=1)
         summary['total'] = summary[self.APPLIANCES].sum(axis=1)
         
-        # Flagovanie nevyváženého predaja
-        def flag_low_sales(row):
-            total = row['total']
-            if total == 0:
-                return {f'{app}_flag': False for app in self.APPLIANCES}
-            
-            flags = {}
-            threshold = 0.15  # Menej ako 15% z celkového predaja
-            
-            for appliance in self.APPLIANCES:
-                ratio = row[appliance] / total if total > 0 else 0
-                flags[f'{appliance}_flag'] = ratio < threshold and row[appliance] < (total * 0.2)
-            
-            return flags
-        
-        # Aplikovanie flagovania
-        flag_data = summary.apply(flag_low_sales, axis=1, result_type='expand')
+        # Flagovanie nevyváženého predaja - pomer a prah pre celú maticu naraz
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = counts / total[:, None]
+        low = (ratio < self.LOW_SALES_RATIO) & (counts < total[:, None] * self.LOW_SALES_SHARE) & (total[:, None] > 0)
+        parts = [summary, pd.DataFrame(low, index=summary.index, columns=[f'{app}_flag' for app in self.APPLIANCES])]
+        
+        if all_employees:
+            mean, std, red_flags = self._imbalance_matrix(counts)
+            parts.append(pd.DataFrame({'mean': mean, 'std': std}, index=summary.index))
+            parts.append(pd.DataFrame(red_flags, index=summary.index, columns=[f'{app}_red_flag' for app in self.APPLIANCES]))
         
         # Kombinácia dát
-        result = pd.concat([summary, flag_data], axis=1).reset_index()
+        result = pd.concat(parts, axis=1).reset_index()
         
         # Zoradenie podľa celkového predaja
         result = result.sort_values('total', ascending=False)
         
         return result
     
+    @staticmethod
+    def _imbalance_matrix(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Priemer / smerodajná odchýlka predaných spotrebičov po riadkoch a red flagy
+        
+        Rovnaká definícia ako detect_imbalances: štatistiky len zo spotrebičov,
+        ktoré zamestnanec predal (std s ddof=1), flag = počet < priemer - std.
+        """
+        present = counts > 0
+        n = present.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(n > 0, counts.sum(axis=1) / n, 0.0)
+            squares = np.where(present, (counts - mean[:, None]) ** 2, 0.0).sum(axis=1)
+            std = np.where(n > 1, np.sqrt(squares / (n - 1)), np.where(n == 1, np.nan, 0.0))
+            red_flags = counts < (mean - std)[:, None]
+        return mean, std, red_flags
+    
+    def get_appliance_leaderboard(self, appliance: str = None, metric: str = 'revenue') -> Leaderboard:
+        """Zoradený index zamestnancov podľa predaja spotrebičov (všetkých alebo jednej kategórie)
+        
+        metric: 'revenue' (súčet Cena/jedn.) alebo 'count' (počet kusov).
+        Počíta sa raz na df_active, ďalšie top-N / prahy sú len rezy.
+        """
+        cache = getattr(self, '_leaderboards', None)
+        if cache is None or cache['df'] is not self.df_active:
+            cache = {'df': self.df_active, 'boards': {}}
+            self._leaderboards = cache
+        
+        key = (appliance, metric)
+        if key not in cache['boards']:
+            df = self.df_active
+            if appliance is not None:
+                df = df[df['Název_norm'] == appliance]
+            grouped = df.groupby('Kontaktní osoba-Jméno a příjmení', observed=True)['Cena/jedn.']
+            values = grouped.sum() if metric == 'revenue' else grouped.count()
+            cache['boards'][key] = Leaderboard(values.to_numpy(), values.index)
+        
+        return cache['boards'][key]
+    
     def get_employee_detailed_data(self, employee_name: str) -> pd.DataFrame:
         """Získa detailné dáta pre konkrétneho zamestnanca"""
         return self.df_active[
@@ -165,19 +299,19 @@ class StudioAnalyzer:
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
         
         # Mesačné dáta
-        monthly = employee_data.groupby(['Mesiac', 'Název_norm']).size().unstack(fill_value=0)
+        monthly = employee_data.groupby(['Mesiac', 'Název_norm'], observed=True).size().unstack(fill_value=0)
         for appliance in self.APPLIANCES:
             if appliance not in monthly.columns:
                 monthly[appliance] = 0
         
         # Štvrťročné dáta
-        quarterly = employee_data.groupby(['Štvrťrok', 'Název_norm']).size().unstack(fill_value=0)
+        quarterly = employee_data.groupby(['Štvrťrok', 'Název_norm'], observed=True).size().unstack(fill_value=0)
         for appliance in self.APPLIANCES:
             if appliance not in quarterly.columns:
                 quarterly[appliance] = 0
         
         # Ročné dáta
-        yearly = employee_data.groupby(['Rok', 'Název_norm']).size().unstack(fill_value=0)
+        yearly = employee_data.groupby(['Rok', 'Název_norm'], observed=True).size().unstack(fill_value=0)
         for appliance in self.APPLIANCES:
             if appliance not in yearly.columns:
                 yearly[appliance] = 0
@@ -191,7 +325,7 @@ class StudioAnalyzer:
         ]
         
         # Počet predaných kusov každého spotrebiča
-        appliance_counts = employee_data.groupby('Název_norm').size()
+        appliance_counts = employee_data.groupby('Název_norm', observed=True).size()
         
         # Vypočíta priemer a štandardnú odchýlku
         mean_count = appliance_counts.mean() if len(appliance_counts) > 0 else 0
@@ -0,0 +1,153 @@
+# core/studio_cube.py
+import numpy as np
+import pandas as pd
+
+
+EMPLOYEE_COLUMN = 'Kontaktní osoba-Jméno a příjmení'
+
+
+class StudioCube:
+    """Kocka zamestnanec × spotrebič × deň (kusy, kusy s cenou, tržby) s kumulatívnymi súčtami
+
+    Drží sa len bunky s predajom, zoradené podľa kľúča (riadok, spotrebič, deň),
+    a kumulatívne súčty cez ne. Súčet bunky (riadok, spotrebič) za rozsah dní
+    je rozdiel cum[hi] - cum[lo], kde lo/hi sú pozície hraníc rozsahu
+    nájdené cez searchsorted. Riadky bez mena zamestnanca sú v poslednom
+    riadku kocky (počítajú sa do súčtov, nie do počtu zamestnancov).
+    """
+
+    def __init__(self, df, appliances):
+        self.appliances = list(appliances)
+        df = df[df['Datum real.'].notna() & df['Název_norm'].isin(self.appliances)]
+
+        employee_codes, self.employees = pd.factorize(df[EMPLOYEE_COLUMN], sort=True)
+        self.employees = np.asarray(self.employees, dtype=object)
+        self.employee_index = {name: i for i, name in enumerate(self.employees)}
+        unnamed = len(self.employees)
+        employee_codes = np.where(employee_codes < 0, unnamed, employee_codes)
+
+        appliance_codes = pd.Categorical(df['Název_norm'], categories=self.appliances).codes
+        day_codes, days = pd.factorize(df['Datum real.'].dt.normalize(), sort=True)
+        self.days = np.asarray(days, dtype='datetime64[D]')
+
+        self.workplaces = None
+        if 'workplace' in df.columns:
+            first = df.groupby(EMPLOYEE_COLUMN, sort=True, observed=True)['workplace'].first()
+            self.workplaces = first.reindex(self.employees).astype(str).str.lower().to_numpy()
+
+        shape = (unnamed + 1, len(self.appliances), len(self.days))
+        flat = np.ravel_multi_index((employee_codes, appliance_codes, day_codes), shape) if len(df) else np.array([], dtype=np.int64)
+        prices = df['Cena/jedn.'].to_numpy(dtype=float)
+        priced = ~np.isnan(prices)
+
+        # Len bunky s predajom (riadkov df je menej ako buniek hustej kocky)
+        self.cells, cell_codes = np.unique(flat, return_inverse=True)
+        size = len(self.cells)
+
+        # Počty kusov sa zmestia do int32 (polovičná pamäť oproti int64), tržby ostávajú float64
+        self.counts = self._cumulate(np.bincount(cell_codes, minlength=size).astype(np.int32))
+        self.priced = self._cumulate(np.bincount(cell_codes[priced], minlength=size).astype(np.int32))
+        self.revenue = self._cumulate(np.bincount(cell_codes[priced], weights=prices[priced], minlength=size))
+
+    @staticmethod
+    def _cumulate(values):
+        """cum[i] = súčet buniek 0 .. i-1"""
+        cum = np.zeros(len(values) + 1, dtype=values.dtype)
+        np.cumsum(values, out=cum[1:])
+        return cum
+
+    def nbytes(self):
+        """Pamäť kocky v bajtoch"""
+        return int(self.cells.nbytes + self.counts.nbytes + self.priced.nbytes + self.revenue.nbytes)
+
+    # ==================== ROZSAHY ====================
+
+    def day_positions(self, start_date=None, end_date=None):
+        """Pozície [od, do) na osi dní pre rozsah vrátane celého end_date"""
+        start = 0 if start_date is None else int(np.searchsorted(
+            self.days, np.datetime64(pd.Timestamp(start_date).date(), 'D'), side='left'))
+        end = len(self.days) if end_date is None else int(np.searchsorted(
+            self.days, np.datetime64(pd.Timestamp(end_date).date(), 'D'), side='right'))
+        return start, max(start, end)
+
+    def employee_rows(self, employees=None, workplaces=None):
+        """Indexy riadkov kocky pre rozsah (None = všetci vrátane riadkov bez mena)"""
+        if employees is None and workplaces is None:
+            return np.arange(len(self.employees) + 1)
+        rows = np.arange(len(self.employees))
+        if employees is not None:
+            rows = np.array(sorted({self.employee_index[e] for e in employees if e in self.employee_index}), dtype=int)
+        if workplaces is not None and self.workplaces is not None:
+            wanted = {str(w).lower() for w in workplaces}
+            rows = rows[np.isin(self.workplaces[rows], list(wanted))]
+        return rows
+
+    def _positions(self, rows, days):
+        """Pozície v self.cells pre (riadok, spotrebič, deň) -> pole riadky × spotrebiče × dni"""
+        pairs = rows[:, None] * len(self.appliances) + np.arange(len(self.appliances))
+        keys = pairs[:, :, None] * len(self.days) + np.asarray(days)
+        return np.searchsorted(self.cells, keys, side='left')
+
+    def totals(self, start_date=None, end_date=None, employees=None, workplaces=None):
+        """Matice riadky × spotrebiče (kusy, kusy s cenou, tržby) za rozsah - O(zamestnanci × spotrebiče × log buniek)"""
+        start, end = self.day_positions(start_date, end_date)
+        rows = self.employee_rows(employees, workplaces)
+        positions = self._positions(rows, [start, end])
+        lo, hi = positions[:, :, 0], positions[:, :, 1]
+        return (rows, self.counts[hi] - self.counts[lo],
+                self.priced[hi] - self.priced[lo], self.revenue[hi] - self.revenue[lo])
+
+    def summary(self, start_date=None, end_date=None, employees=None, workplaces=None):
+        """Celkové metriky a metriky po spotrebičoch za rozsah"""
+        rows, counts, priced, revenue = self.totals(start_date, end_date, employees, workplaces)
+        named = rows < len(self.employees)
+
+        total_count = int(counts.sum())
+        total_priced = int(priced.sum())
+        per_appliance = pd.DataFrame({
+            'appliance': self.appliances,
+            'total_sales': revenue.sum(axis=0),
+            'total_count': counts.sum(axis=0),
+            'employees': (counts[named] > 0).sum(axis=0),
+        })
+        appliance_priced = priced.sum(axis=0)
+        per_appliance['avg_price'] = np.divide(per_appliance['total_sales'], appliance_priced,
+                                               out=np.zeros(len(self.appliances)), where=appliance_priced > 0)
+        return {
+            'total_sales': float(revenue.sum()),
+            'total_count': total_count,
+            'employees': int((counts[named].sum(axis=1) > 0).sum()),
+            'avg_price': float(revenue.sum() / total_priced) if total_priced else float('nan'),
+            'appliances': per_appliance,
+        }
+
+    def monthly(self, start_date=None, end_date=None, employees=None, workplaces=None):
+        """Súčty mesiac × spotrebič za rozsah (len dvojice s predajom)"""
+        start, end = self.day_positions(start_date, end_date)
+        columns = ['Mesiac', 'Název_norm', 'count', 'priced', 'revenue']
+        if end <= start:
+            return pd.DataFrame(columns=columns)
+
+        rows = self.employee_rows(employees, workplaces)
+        months = self.days[start:end].astype('datetime64[M]')
+        month_starts = np.unique(months)
+        # Hranice mesiacov na osi dní (v rámci rozsahu) + koniec rozsahu
+        bounds = np.append(start + np.searchsorted(months, month_starts, side='left'), end)
+
+        positions = self._positions(rows, bounds)                # riadky × spotrebiče × hranice
+        parts = {}
+        for name, cum in (('count', self.counts), ('priced', self.priced), ('revenue', self.revenue)):
+            at_bounds = cum[positions].sum(axis=0)               # spotrebiče × hranice
+            parts[name] = np.diff(at_bounds, axis=1).T           # mesiace × spotrebiče
+
+        frame = pd.DataFrame({
+            'Mesiac': np.repeat(pd.PeriodIndex(month_starts.astype('datetime64[ns]'), freq='M').astype(str),
+                                len(self.appliances)),
+            'Název_norm': np.tile(self.appliances, len(month_starts)),
+            'count': parts['count'].ravel(),
+            'priced': parts['priced'].ravel(),
+            'revenue': parts['revenue'].ravel(),
+        }, columns=columns)
+        # Rovnaké poradie ako groupby(['Mesiac', 'Název_norm'])
+        frame = frame[frame['count'] > 0]
+        return frame.sort_values(['Mesiac', 'Název_norm'], kind='stable', ignore_index=True)
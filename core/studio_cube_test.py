@@ -0,0 +1,131 @@
+# core/studio_cube_test.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.studio_cube import StudioCube, EMPLOYEE_COLUMN
+
+
+APPLIANCES = ['digestor', 'trouba', 'varna deska']
+
+
+def make_frame(seed=0, rows=400):
+    """Malý Studio df: mená aj riadky bez mena, ceny aj NaN, časy počas dňa, spotrebič mimo zoznamu"""
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp('2024-01-20') + pd.to_timedelta(rng.integers(0, 90, rows), unit='D')
+    times = pd.to_timedelta(rng.integers(0, 24 * 60, rows), unit='min')
+    df = pd.DataFrame({
+        EMPLOYEE_COLUMN: rng.choice(['Adam A.', 'Bára B.', 'Cyril C.', None], rows),
+        'Datum real.': days + times,
+        'Název_norm': rng.choice(APPLIANCES + ['ostatne'], rows),
+        'Cena/jedn.': np.where(rng.random(rows) < 0.1, np.nan, rng.integers(1, 500, rows) * 100.0),
+    })
+    df.loc[df.index[:3], 'Datum real.'] = pd.NaT
+    df['workplace'] = df[EMPLOYEE_COLUMN].map({'Adam A.': 'Praha', 'Bára B.': 'Brno', 'Cyril C.': 'Praha'})
+    return df
+
+
+def reference(df, start_date, end_date, employees=None):
+    """Riadky v rozsahu dní [start_date, end_date] (vrátane celého end_date) - rovnaký výber ako kocka"""
+    df = df[df['Datum real.'].notna() & df['Název_norm'].isin(APPLIANCES)]
+    day = df['Datum real.'].dt.normalize()
+    if start_date is not None:
+        df = df[day >= pd.Timestamp(start_date)]
+        day = day[df.index]
+    if end_date is not None:
+        df = df[day <= pd.Timestamp(end_date)]
+    if employees is not None:
+        df = df[df[EMPLOYEE_COLUMN].isin(employees)]
+    return df
+
+
+RANGES = [
+    (None, None),
+    ('2024-02-01', '2024-02-29'),
+    ('2024-01-25', '2024-03-10'),
+    ('2024-03-05', '2024-03-05'),   # jeden deň - riadky počas celého dňa
+    ('2024-03-06', '2024-03-05'),   # prázdny rozsah (koniec pred začiatkom)
+    ('2023-01-01', '2023-12-31'),   # pred dátami
+    ('2024-04-01', None),
+]
+
+
+@pytest.fixture(scope='module')
+def frame():
+    return make_frame()
+
+
+@pytest.fixture(scope='module')
+def cube(frame):
+    return StudioCube(frame, APPLIANCES)
+
+
+@pytest.mark.parametrize('employees', [None, ['Adam A.', 'Cyril C.'], ['Nikto']])
+@pytest.mark.parametrize('start_date, end_date', RANGES)
+def test_summary_matches_groupby(frame, cube, start_date, end_date, employees):
+    summary = cube.summary(start_date, end_date, employees=employees)
+    expected = reference(frame, start_date, end_date, employees)
+
+    assert summary['total_count'] == len(expected)
+    assert summary['total_sales'] == pytest.approx(expected['Cena/jedn.'].sum())
+    assert summary['employees'] == expected[EMPLOYEE_COLUMN].nunique()
+    if expected['Cena/jedn.'].notna().any():
+        assert summary['avg_price'] == pytest.approx(expected['Cena/jedn.'].mean())
+    else:
+        assert np.isnan(summary['avg_price'])
+
+    per_appliance = summary['appliances'].set_index('appliance')
+    grouped = expected.groupby('Název_norm')
+    counts = grouped.size().reindex(APPLIANCES, fill_value=0)
+    sales = grouped['Cena/jedn.'].sum().reindex(APPLIANCES, fill_value=0.0)
+    people = grouped[EMPLOYEE_COLUMN].nunique().reindex(APPLIANCES, fill_value=0)
+    assert per_appliance['total_count'].tolist() == counts.tolist()
+    assert np.allclose(per_appliance['total_sales'], sales)
+    assert per_appliance['employees'].tolist() == people.tolist()
+
+
+@pytest.mark.parametrize('start_date, end_date', RANGES)
+def test_monthly_matches_groupby(frame, cube, start_date, end_date):
+    monthly = cube.monthly(start_date, end_date)
+    expected = reference(frame, start_date, end_date)
+    months = expected['Datum real.'].dt.to_period('M').astype(str).rename('Mesiac')
+    grouped = expected.groupby([months, expected['Název_norm']])['Cena/jedn.'].agg(['size', 'count', 'sum']).reset_index()
+
+    assert list(monthly.columns) == ['Mesiac', 'Název_norm', 'count', 'priced', 'revenue']
+    assert monthly['Mesiac'].tolist() == grouped['Mesiac'].tolist()
+    assert monthly['Název_norm'].tolist() == grouped['Název_norm'].tolist()
+    assert monthly['count'].tolist() == grouped['size'].tolist()
+    assert monthly['priced'].tolist() == grouped['count'].tolist()
+    assert np.allclose(monthly['revenue'], grouped['sum'])
+
+
+def test_unnamed_rows_count_in_totals_not_in_employees(frame, cube):
+    summary = cube.summary()
+    named = reference(frame, None, None)
+    assert summary['total_count'] == len(named)
+    assert summary['employees'] == 3
+    # Výber podľa mien riadky bez mena vynechá
+    by_name = cube.summary(employees=['Adam A.', 'Bára B.', 'Cyril C.'])
+    assert by_name['total_count'] == named[EMPLOYEE_COLUMN].notna().sum()
+
+
+def test_workplace_scope(frame, cube):
+    summary = cube.summary(workplaces=['praha'])
+    expected = reference(frame, None, None, ['Adam A.', 'Cyril C.'])
+    assert summary['total_count'] == len(expected)
+    assert summary['total_sales'] == pytest.approx(expected['Cena/jedn.'].sum())
+
+
+def test_day_positions_include_whole_end_date(cube):
+    start, end = cube.day_positions('2024-03-05', '2024-03-05')
+    assert end - start == 1
+    assert cube.days[start] == np.datetime64('2024-03-05')
+    assert cube.day_positions('2024-03-06', '2024-03-05')[0] == cube.day_positions('2024-03-06', '2024-03-05')[1]
+
+
+def test_empty_frame():
+    cube = StudioCube(make_frame().iloc[0:0], APPLIANCES)
+    summary = cube.summary()
+    assert summary['total_count'] == 0 and summary['employees'] == 0
+    assert summary['appliances']['total_count'].tolist() == [0, 0, 0]
+    assert cube.monthly().empty
@@ -0,0 +1,183 @@
+# core/studio_details.py
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.studio_products import ProductIndex
+
+
+EMPLOYEE_COLUMN = 'Kontaktní osoba-Jméno a příjmení'
+PRICE_COLUMN = 'Cena/jedn.'
+
+
+class StudioDetails:
+    """Podklady pre detail zamestnanca pre všetkých zamestnancov naraz
+
+    Každá časť (metriky, kategórie, mesačný vývoj a produkty cez
+    ProductIndex) je jeden groupby cez celý df, zoradený podľa zamestnanca.
+    Payload zamestnanca sú potom len rezy [od, do) týchto výsledkov - skladá
+    sa až pri prvom get() a pamätá sa.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.rows = {}
+        self.metrics = {}
+        self.parts = {}
+        self.products = None
+        self.payloads = {}
+        if df.empty:
+            return
+
+        self.rows = df.groupby(EMPLOYEE_COLUMN, sort=False, observed=True).indices
+        self.metrics = self._metrics(df)
+        self.products = ProductIndex(df)
+        parts = {'categories': self._categories(df), 'monthly': self._monthly(df)}
+        self.parts = {name: self._by_employee(part) for name, part in parts.items()}
+
+    def __contains__(self, employee):
+        return employee in self.rows
+
+    def get(self, employee):
+        """Payload zamestnanca alebo None"""
+        if employee not in self.rows:
+            return None
+        if employee not in self.payloads:
+            payload = {
+                'metrics': self.metrics[employee],
+                'top_products_per_category': self._top_per_category(employee),
+            }
+            for name, (part, bounds) in self.parts.items():
+                payload[name] = self._slice(part, bounds.get(employee))
+            self.payloads[employee] = payload
+        return self.payloads[employee]
+
+    def employee_data(self, employee):
+        """Riadky zamestnanca (v poradí df)"""
+        positions = self.rows.get(employee)
+        if positions is None:
+            return self.df.iloc[0:0]
+        return self.df.iloc[positions]
+
+    # ==================== ČASTI ====================
+
+    @staticmethod
+    def _by_employee(obj):
+        """Stabilne zoradí výsledok groupby podľa zamestnanca (1. úroveň) -> (obj, {zamestnanec: (od, do)})"""
+        codes = obj.index.codes[0]
+        order = np.argsort(codes, kind='stable')
+        obj, codes = obj.iloc[order], codes[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        ends = np.append(starts[1:], len(codes))
+        names = obj.index.levels[0][codes[starts]]
+        return obj, dict(zip(names, zip(starts, ends)))
+
+    @staticmethod
+    def _slice(obj, bounds):
+        """Časť jedného zamestnanca bez úrovne zamestnanca (DataFrame s indexom v stĺpcoch)"""
+        start, end = bounds if bounds is not None else (0, 0)
+        part = obj.iloc[start:end].droplevel(0)
+        return part.reset_index() if isinstance(part, pd.DataFrame) else part
+
+    @staticmethod
+    def _metrics(df):
+        grouped = df.groupby(EMPLOYEE_COLUMN, sort=False, observed=True)
+        frame = pd.DataFrame({
+            'total_sales': grouped[PRICE_COLUMN].sum(),
+            'total_orders': grouped.size(),
+            'avg_order': grouped[PRICE_COLUMN].mean(),
+            'unique_orders': grouped['Doklad'].nunique(),
+        })
+        if 'Datum real.' in df.columns:
+            dates = grouped['Datum real.']
+            frame['date_range'] = (dates.max() - dates.min()).dt.days.fillna(0).astype(int)
+        else:
+            frame['date_range'] = 0
+        return frame.to_dict('index')
+
+    @staticmethod
+    def _categories(df):
+        categories = df.groupby([EMPLOYEE_COLUMN, 'Název_norm'], observed=True)[PRICE_COLUMN].agg(['sum', 'count', 'mean']).round(0)
+        categories.columns = ['Celkový predaj', 'Počet kusov', 'Priemerná cena']
+        return categories
+
+    def _top_per_category(self, employee):
+        """Najpredávanejší produkt z každej kategórie pre kartu v detaile"""
+        best = self.products.best_sellers(employee=employee)
+        return [
+            {
+                'category': category.replace('_', ' ').capitalize(),
+                'product': product,
+                'value': value,
+                'count': count,
+            }
+            for category, product, value, count in zip(best['Název_norm'], best['Název'], best['revenue'], best['items'])
+        ]
+
+    @staticmethod
+    def _monthly(df):
+        months = df['Datum real.'].dt.to_period('M').rename('Mesiac')
+        monthly = df.groupby([df[EMPLOYEE_COLUMN], months, df['Název_norm']], observed=True)[PRICE_COLUMN].sum()
+        monthly.index = monthly.index.set_levels(monthly.index.levels[1].astype(str), level=1)
+        return monthly.to_frame()
+
+
+# ==================== PREDPOČET NA POZADÍ ====================
+
+MAX_SNAPSHOTS = 8    # koľko kombinácií (snapshot, dátumy, mestá) sa drží v pamäti
+MAX_EMPLOYEES = 256  # samostatne vypočítané detaily (kým predpočet nedobehne)
+
+# Jeden worker thread - výpočet je vektorizovaný pandas, proces by len pickloval celý df
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='studio-details')
+_jobs = OrderedDict()
+_employees = OrderedDict()
+_lock = threading.Lock()
+
+
+def precompute(key, df):
+    """Spustí výpočet detailov všetkých zamestnancov na pozadí (ak pre kľúč ešte nebeží)"""
+    with _lock:
+        if key in _jobs:
+            _jobs.move_to_end(key)
+            return _jobs[key]
+        _jobs[key] = _executor.submit(StudioDetails, df)
+        while len(_jobs) > MAX_SNAPSHOTS:
+            _jobs.popitem(last=False)
+        return _jobs[key]
+
+
+def ready_details(key):
+    """Hotové detaily pre kľúč alebo None (ak výpočet ešte beží, nečaká sa)"""
+    with _lock:
+        job = _jobs.get(key)
+    if job is None or not job.done():
+        return None
+    if job.exception() is not None:
+        # Zlyhaný výpočet sa zahodí, ďalší precompute() ho spustí znova
+        with _lock:
+            if _jobs.get(key) is job:
+                del _jobs[key]
+        return None
+    return job.result()
+
+
+def employee_details(key, employee, df):
+    """(riadky, payload) zamestnanca - z hotového predpočtu pre key, inak len z jeho riadkov
+
+    Samostatný výpočet sa pamätá podľa (key, zamestnanec); key obsahuje snapshot
+    Studio dát a rozsah dátumov, takže sa nič nehashuje z obsahu df.
+    """
+    details = ready_details(key)
+    if details is None:
+        with _lock:
+            details = _employees.get((key, employee))
+        if details is None:
+            details = StudioDetails(df[df[EMPLOYEE_COLUMN] == employee])
+            with _lock:
+                _employees[(key, employee)] = details
+                while len(_employees) > MAX_EMPLOYEES:
+                    _employees.popitem(last=False)
+    return details.employee_data(employee), details.get(employee)
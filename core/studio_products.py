@@ -0,0 +1,126 @@
+# core/studio_products.py
+import numpy as np
+import pandas as pd
+
+
+EMPLOYEE_COLUMN = 'Kontaktní osoba-Jméno a příjmení'
+PRICE_COLUMN = 'Cena/jedn.'
+
+
+class ProductIndex:
+    """Tržby a kusy na (kategória, produkt) pre firmu, mestá a zamestnancov
+
+    Tabuľka zamestnanec × kategória × produkt sa zgrupuje raz, firma a mestá
+    sú jej súčty. Každá úroveň je zoradená podľa (kategória, tržby zostupne),
+    takže top-N v kategórii je rez; pre ľubovoľnú skupinu zamestnancov sa
+    zoraďuje len jej (malý) súčet.
+
+    Stĺpce: revenue, items (kusy = riadky), priced (kusy s cenou),
+    quantity (súčet Množství, ak je v dátach) a first_seen (prvý riadok).
+    """
+
+    KEYS = ['Název_norm', 'Název']
+
+    def __init__(self, df):
+        frame = pd.DataFrame({
+            EMPLOYEE_COLUMN: df[EMPLOYEE_COLUMN].to_numpy(),
+            'Název_norm': df['Název_norm'].to_numpy(),
+            'Název': df['Název'].to_numpy(),
+            'revenue': df[PRICE_COLUMN].to_numpy(dtype=float),
+            'priced': df[PRICE_COLUMN].notna().to_numpy(),
+            'first_seen': np.arange(len(df)),
+        })
+        agg = {'revenue': ('revenue', 'sum'), 'items': ('revenue', 'size'),
+               'priced': ('priced', 'sum'), 'first_seen': ('first_seen', 'min')}
+        if 'Množství' in df.columns:
+            frame['quantity'] = df['Množství'].to_numpy()
+            agg['quantity'] = ('quantity', 'sum')
+        self.has_quantity = 'quantity' in agg
+
+        table = frame.groupby([EMPLOYEE_COLUMN] + self.KEYS).agg(**agg).reset_index()
+        self.employees, self.employee_bounds = self._ranked(table, EMPLOYEE_COLUMN)
+        self.company, _ = self._ranked(self._sum(table, self.KEYS))
+
+        self.cities, self.city_bounds = None, {}
+        if 'workplace' in df.columns:
+            workplace = df.groupby(EMPLOYEE_COLUMN, sort=False, observed=True)['workplace'].first().astype(str).str.lower()
+            table['workplace'] = table[EMPLOYEE_COLUMN].map(workplace)
+            self.cities, self.city_bounds = self._ranked(self._sum(table, ['workplace'] + self.KEYS), 'workplace')
+
+    @staticmethod
+    def _sum(table, keys):
+        agg = {c: 'min' if c == 'first_seen' else 'sum'
+               for c in ('revenue', 'items', 'priced', 'quantity', 'first_seen') if c in table.columns}
+        return table.groupby(keys, sort=True).agg(agg).reset_index()
+
+    @staticmethod
+    def _ranked(table, level=None):
+        """Zoradí podľa (úroveň, kategória, tržby zostupne) -> (tabuľka, {hodnota úrovne: (od, do)})
+
+        Pri zhode tržieb ostáva abecedné poradie produktov (ako idxmax po groupby).
+        """
+        keys = ([level] if level else []) + ['Název_norm']
+        table = table.sort_values(keys + ['revenue'], ascending=[True] * len(keys) + [False],
+                                  kind='stable', ignore_index=True)
+        if level is None:
+            return table, {}
+        values = table[level].to_numpy()
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]]) if len(values) else np.array([], dtype=int)
+        ends = np.append(starts[1:], len(values))
+        return table, dict(zip(values[starts], zip(starts, ends)))
+
+    # ==================== DOTAZY ====================
+
+    def products(self, employee=None, workplace=None, employees=None):
+        """Zoradená tabuľka (kategória, produkt) pre zamestnanca, mesto, skupinu alebo celú firmu"""
+        if employee is not None:
+            return self._slice(self.employees, self.employee_bounds.get(employee))
+        if workplace is not None:
+            if self.cities is None:
+                return self.company.iloc[0:0]
+            return self._slice(self.cities, self.city_bounds.get(str(workplace).lower()))
+        if employees is not None:
+            parts = [self._slice(self.employees, self.employee_bounds.get(e)) for e in set(employees)]
+            parts = [p for p in parts if not p.empty]
+            if not parts:
+                return self.company.iloc[0:0]
+            return self._ranked(self._sum(pd.concat(parts, ignore_index=True), self.KEYS))[0]
+        return self.company
+
+    @staticmethod
+    def _slice(table, bounds):
+        start, end = bounds if bounds is not None else (0, 0)
+        return table.iloc[start:end]
+
+    def top(self, n=1, category=None, by='revenue', **scope):
+        """n najlepších produktov z každej kategórie (alebo z jednej) podľa tržieb / kusov / množstva"""
+        table = self.products(**scope)
+        if category is not None:
+            table = table[table['Název_norm'] == category]
+        if by != 'revenue':
+            table = table.sort_values(['Název_norm', by], ascending=[True, False], kind='stable')
+        return table.groupby('Název_norm', sort=False).head(n)
+
+    def best_sellers(self, n=1, **scope):
+        """Najpredávanejšie produkty každého spotrebiča, zoradené podľa tržieb
+
+        Pri zhode rozhoduje prvý výskyt kategórie v dátach.
+        """
+        table = self.products(**scope)
+        category_seen = table.groupby('Název_norm', sort=False)['first_seen'].transform('min')
+        best = table.assign(category_seen=category_seen).groupby('Název_norm', sort=False).head(n)
+        best = best.sort_values('category_seen', kind='stable').sort_values('revenue', ascending=False, kind='stable')
+        return best.drop(columns='category_seen').reset_index(drop=True)
+
+    def ranking(self, n=10, by='revenue', **scope):
+        """n najlepších produktov naprieč kategóriami (Series indexovaná názvom produktu)"""
+        table = self.products(**scope)
+        if by == 'avg_price':
+            priced = table['priced'].to_numpy()
+            values = np.divide(table['revenue'].to_numpy(), priced, out=np.full(len(table), np.nan), where=priced > 0)
+        else:
+            values = table[by].to_numpy()
+        values = pd.Series(values, index=pd.Index(table['Název'].to_numpy(), name='Název'))
+        # Rovnaké poradie ako groupby('Název') + sort_values: abecedne, potom stabilne podľa hodnoty
+        values = values.sort_index(kind='stable')
+        return values.sort_values(ascending=False, kind='stable').head(n)
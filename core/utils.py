@@ -14,6 +14,33 @@ def time_to_minutes(time_str):
     except:
         return 0
 
+def time_series_to_minutes(series):
+    """Vektorová verzia time_to_minutes pre celý stĺpec (sekundy sa ignorujú rovnako)"""
+    parts = series.astype(str).str.extract(r'^\s*(\d+):(\d+)')
+    hours = pd.to_numeric(parts[0], errors='coerce').fillna(0)
+    minutes = pd.to_numeric(parts[1], errors='coerce').fillna(0)
+    return (hours * 60 + minutes).astype('int64')
+
+def activity_minutes_by_person(data_source, columns):
+    """
+    Sčíta minúty vybraných aktivít pre každú osobu jedným prechodom
+
+    Args:
+        data_source: DataFrame so stĺpcom 'Osoba ▲' a časovými stĺpcami
+        columns: zoznam časových stĺpcov (chýbajúce budú 0)
+
+    Returns:
+        DataFrame: index = osoba, stĺpce = aktivity v minútach
+    """
+    if data_source is None or data_source.empty:
+        return pd.DataFrame(columns=columns, dtype='int64')
+
+    minutes = pd.DataFrame(
+        {col: time_series_to_minutes(data_source[col]) if col in data_source.columns else 0 for col in columns},
+        index=data_source.index
+    )
+    return minutes.groupby(data_source['Osoba ▲'].values).sum()
+
 def format_money(value):
     """Formátovanie peňazí"""
     return f"{value:,.0f} Kč"
@@ -39,98 +66,115 @@ def calculate_quarter_sales(monthly_sales, quarter):
 
 # ✅ NOVÉ FUNKCIE PRE ROZLOŽENIE AKTIVÍT
 
-def calculate_activity_breakdown(analyzer):
+INTERNET_ACTIVITY_COLUMNS = ['Mail', 'Chat', 'IS Sykora', 'SykoraShop', 'Web k praci', 'Hry',
+                             'Nepracovni weby', 'Nezařazené', 'Umela inteligence', 'hladanie prace']
+APP_ACTIVITY_COLUMNS = ['Helios Green', 'Imos - program', 'Programy', 'Půdorysy', 'Mail', 'Chat', 'Internet']
+
+
+def _person_cities(analyzer, persons):
+    """Priradí osobám z monitoringu mesto podľa name_mappingu na sales zamestnancov"""
+    canon_to_city = {}
+    for emp in analyzer.get_employee_table().records:
+        canon = analyzer.name_mapping.get(emp.get('name', ''))
+        if canon and canon not in canon_to_city:
+            canon_to_city[canon] = str(emp.get('workplace', 'unknown')).lower()
+    return [canon_to_city.get(analyzer.name_mapping.get(person), 'unknown') for person in persons]
+
+
+def _minutes_by_city(analyzer, data_source, columns):
+    """Minúty aktivít sčítané po mestách (jeden prechod dátami)"""
+    by_person = activity_minutes_by_person(data_source, columns)
+    if by_person.empty:
+        return by_person
+    return by_person.groupby(_person_cities(analyzer, by_person.index)).sum()
+
+
+def _build_activity_breakdown(internet_minutes, app_minutes):
+    """Zostaví výstup calculate_activity_breakdown zo súčtov minút po aktivitách"""
+    
+    # Konverzia na hodiny a vyfilterovanie nulových hodnôt
+    internet_hours = {k: float(v) / 60 for k, v in internet_minutes.items() if v > 0}
+    app_hours = {k: float(v) / 60 for k, v in app_minutes.items() if v > 0}
+    
+    # Výpočet percent
+    total_internet_hours = sum(internet_hours.values())
+    total_app_hours = sum(app_hours.values())
+    total_hours = total_internet_hours + total_app_hours
+    
+    internet_percentages = {k: (v / total_internet_hours) * 100 for k, v in internet_hours.items()} if total_internet_hours > 0 else {}
+    app_percentages = {k: (v / total_app_hours) * 100 for k, v in app_hours.items()} if total_app_hours > 0 else {}
+    
+    return {
+        'internet': {
+            'hours': internet_hours,
+            'percentages': internet_percentages,
+            'total_hours': total_internet_hours,
+            'activities_count': len(internet_hours)
+        },
+        'applications': {
+            'hours': app_hours,
+            'percentages': app_percentages,
+            'total_hours': total_app_hours,
+            'activities_count': len(app_hours)
+        },
+        'combined': {
+            'total_hours': total_hours,
+            'internet_ratio': (total_internet_hours / total_hours * 100) if total_hours > 0 else 0,
+            'app_ratio': (total_app_hours / total_hours * 100) if total_hours > 0 else 0
+        }
+    }
+
+
+def calculate_activity_breakdown(analyzer, allowed_cities=None):
     """
     Vypočíta rozloženie všetkých aktivít zo všetkých zamestnancov
     
     Args:
         analyzer: DataAnalyzer objekt s načítanými dátami
+        allowed_cities: zoznam miest používateľa (None = celá firma)
         
     Returns:
-        dict: Štruktúrované dáta o aktivitách
+        dict: Štruktúrované dáta o aktivitách, v 'cities' rozloženie po mestách
     """
     
-    # Definície aktivít
-    internet_activities = {
-        'Mail': 0,
-        'Chat': 0, 
-        'IS Sykora': 0,
-        'SykoraShop': 0,
-        'Web k praci': 0,
-        'Hry': 0,
-        'Nepracovni weby': 0,
-        'Nezařazené': 0,
-        'Umela inteligence': 0,
-        'hladanie prace': 0
-    }
-    
-    app_activities = {
-        'Helios Green': 0,
-        'Imos - program': 0,
-        'Programy': 0,
-        'Půdorysy': 0,
-        'Mail': 0,
-        'Chat': 0,
-        'Internet': 0
-    }
-    
     try:
-        # Spracovanie internet dát
-        if analyzer.internet_data is not None:
-            for _, row in analyzer.internet_data.iterrows():
-                person = row.get('Osoba ▲', '')
-                
-                for activity in internet_activities.keys():
-                    time_value = row.get(activity, '0:00')
-                    minutes = time_to_minutes(time_value)
-                    internet_activities[activity] += minutes
-        
-        # Spracovanie aplikačných dát
-        if analyzer.applications_data is not None:
-            for _, row in analyzer.applications_data.iterrows():
-                person = row.get('Osoba ▲', '')
-                
-                for activity in app_activities.keys():
-                    time_value = row.get(activity, '0:00')
-                    minutes = time_to_minutes(time_value)
-                    app_activities[activity] += minutes
-        
-        # Konverzia na hodiny a vyfilterovanie nulových hodnôt
-        internet_hours = {k: v/60 for k, v in internet_activities.items() if v > 0}
-        app_hours = {k: v/60 for k, v in app_activities.items() if v > 0}
+        # Súčty po mestách sa počítajú raz za snapshot dát
+        snapshot = (analyzer.internet_data, analyzer.applications_data, analyzer.name_mapping,
+                    analyzer.get_employee_table())
+        cache = getattr(analyzer, '_activity_breakdown_cache', None)
+        if cache is None or any(a is not b for a, b in zip(cache['snapshot'], snapshot)):
+            cache = {
+                'snapshot': snapshot,
+                'internet': _minutes_by_city(analyzer, analyzer.internet_data, INTERNET_ACTIVITY_COLUMNS),
+                'applications': _minutes_by_city(analyzer, analyzer.applications_data, APP_ACTIVITY_COLUMNS),
+                'scopes': {}
+            }
+            analyzer._activity_breakdown_cache = cache
         
-        # Výpočet percent
-        total_internet_hours = sum(internet_hours.values())
-        total_app_hours = sum(app_hours.values())
+        scope_key = None if allowed_cities is None else tuple(sorted(str(c).lower() for c in allowed_cities))
+        if scope_key in cache['scopes']:
+            return cache['scopes'][scope_key]
         
-        internet_percentages = {}
-        app_percentages = {}
+        internet_by_city = cache['internet']
+        app_by_city = cache['applications']
+        if scope_key is not None:
+            internet_by_city = internet_by_city[internet_by_city.index.isin(scope_key)]
+            app_by_city = app_by_city[app_by_city.index.isin(scope_key)]
         
-        if total_internet_hours > 0:
-            internet_percentages = {k: (v/total_internet_hours)*100 for k, v in internet_hours.items()}
+        result = _build_activity_breakdown(
+            internet_by_city.sum().reindex(INTERNET_ACTIVITY_COLUMNS, fill_value=0).to_dict(),
+            app_by_city.sum().reindex(APP_ACTIVITY_COLUMNS, fill_value=0).to_dict()
+        )
         
-        if total_app_hours > 0:
-            app_percentages = {k: (v/total_app_hours)*100 for k, v in app_hours.items()}
+        # Rozloženie po mestách z tých istých súčtov
+        result['cities'] = {}
+        for city in sorted(set(internet_by_city.index) | set(app_by_city.index)):
+            internet_row = internet_by_city.loc[city] if city in internet_by_city.index else {}
+            app_row = app_by_city.loc[city] if city in app_by_city.index else {}
+            result['cities'][city] = _build_activity_breakdown(dict(internet_row), dict(app_row))
         
-        return {
-            'internet': {
-                'hours': internet_hours,
-                'percentages': internet_percentages,
-                'total_hours': total_internet_hours,
-                'activities_count': len([v for v in internet_hours.values() if v > 0])
-            },
-            'applications': {
-                'hours': app_hours,
-                'percentages': app_percentages,
-                'total_hours': total_app_hours,
-                'activities_count': len([v for v in app_hours.values() if v > 0])
-            },
-            'combined': {
-                'total_hours': total_internet_hours + total_app_hours,
-                'internet_ratio': (total_internet_hours / (total_internet_hours + total_app_hours) * 100) if (total_internet_hours + total_app_hours) > 0 else 0,
-                'app_ratio': (total_app_hours / (total_internet_hours + total_app_hours) * 100) if (total_internet_hours + total_app_hours) > 0 else 0
-            }
-        }
+        cache['scopes'][scope_key] = result
+        return result
     
     except Exception as e:
         return None
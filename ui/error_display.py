@@ -0,0 +1,25 @@
+# ui/error_display.py
+import streamlit as st
+
+from core.error_handler import set_session_provider, set_error_display
+
+
+def show_error(error_info):
+    """Priateľská chyba pre používateľa, detaily len pre adminov"""
+    st.error("❌ Nastala chyba. Bola automaticky zalogovaná.")
+
+    try:
+        from auth.auth import is_admin
+        if is_admin() and error_info:
+            with st.expander("🔧 Detaily chyby (len pre adminov)"):
+                st.code(f"Error: {error_info.get('error_type')}")
+                st.code(f"Message: {error_info.get('error_message')}")
+                st.code(f"Timestamp: {error_info.get('timestamp')}")
+    except Exception:
+        pass
+
+
+def install():
+    """Napojí core.error_handler na Streamlit session state a UI"""
+    set_session_provider(lambda: st.session_state)
+    set_error_display(show_error)
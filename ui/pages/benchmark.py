@@ -8,6 +8,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import calendar
+import numpy as np
+from core.benchmark_engine import BenchmarkEngine, PERIOD_MONTHS, get_medal
+from core.employee_table import EmployeeTable
 
 
 def render(analyzer):
@@ -42,6 +45,8 @@ def render(analyzer):
     # ✅ NOVÉ - Role-based filtering pre benchmark dáta
     from auth.auth import get_current_user
     user = get_current_user()
+    employee_table = analyzer.get_employee_table()
+    all_rows = np.arange(len(employee_table))
     
     if user and user.get('role') != 'admin':
         # Manager - aplikuj city filtering
@@ -49,35 +54,37 @@ def render(analyzer):
         
         # Filtruj len zamestnancov z povolených miest
         try:
-            original_employees = analyzer.get_all_employees_summary()
-            filtered_employees = []
-            
-            for emp in original_employees:
-                emp_workplace = emp.get('workplace', '').lower()
-                if any(city.lower() in emp_workplace or emp_workplace in city.lower() for city in user_cities):
-                    filtered_employees.append(emp)
+            workplaces = [str(wp).lower() for wp in employee_table.workplaces]
+            filtered_rows = np.array([
+                i for i, emp_workplace in enumerate(workplaces)
+                if any(city.lower() in emp_workplace or emp_workplace in city.lower() for city in user_cities)
+            ], dtype=int)
             
             # Ak nemáme filtered employees, použijeme pôvodných (fallback)
-            employees_summary = filtered_employees if filtered_employees else original_employees
+            rows = filtered_rows if len(filtered_rows) else all_rows
+            scope_key = tuple(sorted(c.lower() for c in user_cities)) if len(filtered_rows) else 'all'
             
-            if filtered_employees:
+            if len(filtered_rows):
                 st.success(f"🔒 **Filtrované dáta** - Zobrazujú sa len zamestnanci z miest: {', '.join([c.title() for c in user_cities])}")
-                st.info(f"👥 **Nájdených zamestnancov**: {len(filtered_employees)} z celkových {len(original_employees)}")
+                st.info(f"👥 **Nájdených zamestnancov**: {len(filtered_rows)} z celkových {len(all_rows)}")
             else:
                 st.warning(f"⚠️ **Žiadni zamestnanci** z vašich miest ({', '.join([c.title() for c in user_cities])}) neboli nájdení.")
                 
         except Exception as e:
             st.error(f"❌ Chyba pri filtrovaní podľa miest: {e}")
-            employees_summary = analyzer.get_all_employees_summary()
+            rows, scope_key = all_rows, 'all'
     else:
         # Admin vidí všetkých zamestnancov
-        employees_summary = analyzer.get_all_employees_summary()
+        rows, scope_key = all_rows, 'all'
         st.success("👑 **Admin prístup** - Zobrazujú sa všetky dáta")
     
-    if not employees_summary:
+    if len(rows) == 0:
         st.error("❌ Žiadni zamestnanci neboli nájdení.")
         return
     
+    # Ranking engine - súčty za obdobia a poradia sa prepočítajú len pri zmene dát
+    engine = get_benchmark_engine(analyzer, rows, scope_key)
+    
     # ✅ ROZŠÍRENÉ CIELE S KONKRÉTNYMI OBDOBIAMI
     TARGETS = {
         # Štvrťroky
@@ -137,7 +144,7 @@ def render(analyzer):
                 st.session_state.show_main_stats = not st.session_state.get('show_main_stats', False)
     
     # ✅ VÝPOČET S NOVÝMI OBDOBIAMI
-    main_benchmark_data = calculate_benchmark_data(employees_summary, main_target, main_period)
+    main_benchmark_data = engine.benchmark_data(main_target, main_period)
     
     # ✅ EXPANDABLE HLAVNÉ ŠTATISTIKY
     if st.session_state.get('show_main_stats', False):
@@ -184,7 +191,7 @@ def render(analyzer):
         with col2:
             workplace_filter = st.selectbox(
                 "🏢 Pracovisko:",
-                ["Všetky"] + list(set([emp['workplace'] for emp in employees_summary])),
+                ["Všetky"] + list(set(employee_table.workplaces[rows])),
                 key="ranking_workplace_filter"
             )
         
@@ -206,7 +213,7 @@ def render(analyzer):
     
     # Ranking target a prepočítanie
     ranking_target = TARGETS[ranking_period]
-    ranking_data = calculate_benchmark_data(employees_summary, ranking_target, ranking_period)
+    ranking_data = engine.benchmark_data(ranking_target, ranking_period)
     
     # ✅ RANKING INFO PANEL
     display_ranking_info_panel(ranking_data, ranking_target, ranking_period, main_period)
@@ -237,69 +244,35 @@ def render(analyzer):
     
     st.markdown("---")
     
+    # ✅ WHAT-IF ANALÝZA CIEĽOV
+    st.markdown("## 🔮 What-if analýza cieľov")
+    display_target_whatif(engine, TARGETS, period_labels, main_period)
+    
+    st.markdown("---")
+    
     # ✅ EXPORT A AKCIE
     st.markdown("## 💾 Export a Akcie")
     display_export_section(ranking_data, ranking_target, ranking_period)
 
 
+def get_benchmark_engine(analyzer, rows, scope_key):
+    """Ranking engine cachovaný na analyzéri per snapshot dát a rozsah používateľa"""
+    
+    table = analyzer.get_employee_table()
+    cache = getattr(analyzer, '_benchmark_engines', None)
+    if cache is None or cache['table'] is not table:
+        cache = {'table': table, 'scopes': {}}
+        analyzer._benchmark_engines = cache
+    
+    if scope_key not in cache['scopes']:
+        cache['scopes'][scope_key] = BenchmarkEngine(table, rows)
+    return cache['scopes'][scope_key]
+
+
 def calculate_benchmark_data(employees_summary, target, period):
     """✅ Vypočíta benchmark dáta pre konkrétne obdobia v roku"""
-    benchmark_data = []
-    
-    for emp in employees_summary:
-        name = emp.get('name', 'Unknown')
-        total_sales = emp.get('total_sales', 0)
-        monthly_sales = emp.get('monthly_sales', {})
-        workplace = emp.get('workplace', 'unknown')
-        score = emp.get('score', 0)
-        
-        # ✅ NOVÝ VÝPOČET: Konkrétne obdobia namiesto "posledných N mesiacov"
-        period_sales = calculate_specific_period_sales(monthly_sales, period)
-        
-        # Výpočet progress na základe obdobia
-        progress = (period_sales / target) * 100 if target > 0 else 0
-        
-        # Klasifikácia výkonu
-        if progress >= 100:
-            performance = "🏆 Cieľ splnený"
-            color = "#28a745"
-            tier = "excellent"
-        elif progress >= 75:
-            performance = "🥉 Blízko k cieľu"
-            color = "#ffc107"
-            tier = "good"
-        elif progress >= 50:
-            performance = "⚠️ Podpriemerný"
-            color = "#17a2b8"
-            tier = "average"
-        else:
-            performance = "❌ Kritický"
-            color = "#dc3545"
-            tier = "poor"
-        
-        benchmark_data.append({
-            'name': name,
-            'total_sales': total_sales,
-            'period_sales': period_sales,
-            'progress': progress,
-            'performance': performance,
-            'color': color,
-            'tier': tier,
-            'workplace': workplace,
-            'score': score,
-            'monthly_sales': monthly_sales,
-            'to_target': max(0, target - period_sales),
-            'target': target,
-            'period': period
-        })
     
-    # Zoradenie podľa predaja za obdobie
-    benchmark_data.sort(key=lambda x: x['period_sales'], reverse=True)
-    for i, emp in enumerate(benchmark_data):
-        emp['position'] = i + 1
-        emp['medal'] = get_medal(i + 1)
-    
-    return benchmark_data
+    return BenchmarkEngine(EmployeeTable(list(employees_summary))).benchmark_data(target, period)
 
 
 def calculate_specific_period_sales(monthly_sales, period):
@@ -308,25 +281,8 @@ def calculate_specific_period_sales(monthly_sales, period):
     if not monthly_sales:
         return 0
     
-    # Definícia konkrétnych období
-    period_definitions = {
-        # Štvrťroky
-        "q1": ['leden', 'unor', 'brezen'],           # Q1: jan-mar
-        "q2": ['duben', 'kveten', 'cerven'],         # Q2: apr-jun  
-        "q3": ['cervenec', 'srpen', 'zari'],         # Q3: jul-sep
-        "q4": ['rijen', 'listopad', 'prosinec'],     # Q4: oct-dec
-        
-        # Polroky
-        "h1": ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven'],           # H1: jan-jun
-        "h2": ['cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec'],    # H2: jul-dec
-        
-        # Celý rok
-        "year": ['leden', 'unor', 'brezen', 'duben', 'kveten', 'cerven', 
-                'cervenec', 'srpen', 'zari', 'rijen', 'listopad', 'prosinec'],
-    }
-    
     # Získaj mesiace pre dané obdobie
-    months_to_sum = period_definitions.get(period, ['leden', 'unor', 'brezen'])
+    months_to_sum = PERIOD_MONTHS.get(period, PERIOD_MONTHS['q1'])
     
     # Spočítaj predaj za dané mesiace
     period_sales = 0
@@ -344,20 +300,6 @@ def calculate_specific_period_sales(monthly_sales, period):
     return period_sales
 
 
-def get_medal(position):
-    """Vráti medailu na základe pozície"""
-    if position == 1:
-        return "🥇"
-    elif position == 2:
-        return "🥈"
-    elif position == 3:
-        return "🥉"
-    elif position <= 10:
-        return "🏅"
-    else:
-        return f"#{position}"
-
-
 def display_main_statistics(benchmark_data, target, period):
     """Zobrazí hlavné štatistiky s novými názvami období"""
     
@@ -546,12 +488,9 @@ def display_trending_analysis(benchmark_data, target):
     st.markdown("### 📈 Analýza Trendov")
     
     # Rozdelenie do kategórií
-    tiers = {
-        "excellent": [emp for emp in benchmark_data if emp['tier'] == 'excellent'],
-        "good": [emp for emp in benchmark_data if emp['tier'] == 'good'],
-        "average": [emp for emp in benchmark_data if emp['tier'] == 'average'],
-        "poor": [emp for emp in benchmark_data if emp['tier'] == 'poor']
-    }
+    tiers = {"excellent": [], "good": [], "average": [], "poor": []}
+    for emp in benchmark_data:
+        tiers[emp['tier']].append(emp)
     
     col1, col2 = st.columns(2)
     
@@ -577,7 +516,8 @@ def display_trending_analysis(benchmark_data, target):
         st.markdown("**🎯 Insights:**")
         
         avg_sales = sum([emp['period_sales'] for emp in benchmark_data]) / len(benchmark_data)
-        median_sales = sorted([emp['period_sales'] for emp in benchmark_data])[len(benchmark_data)//2]
+        # benchmark_data je už zoradené zostupne - medián je len index
+        median_sales = benchmark_data[len(benchmark_data) - 1 - len(benchmark_data) // 2]['period_sales']
         gap_to_target = sum([emp['to_target'] for emp in benchmark_data])
         
         st.write(f"• Priemerný predaj: **{avg_sales:,.0f} Kč**")
@@ -585,8 +525,8 @@ def display_trending_analysis(benchmark_data, target):
         st.write(f"• Celková medzera k cieľu: **{gap_to_target:,.0f} Kč**")
         
         if len(tiers["excellent"]) > 0:
-            top_workplace = max(set([emp['workplace'] for emp in tiers["excellent"]]), 
-                              key=lambda x: len([emp for emp in tiers["excellent"] if emp['workplace'] == x]))
+            workplace_counts = pd.Series([emp['workplace'] for emp in tiers["excellent"]]).value_counts()
+            top_workplace = workplace_counts.index[0]
             st.write(f"• Najlepšie pracovisko: **{top_workplace}**")
 
 
@@ -807,6 +747,89 @@ def display_workplace_analysis(ranking_data):
     st.dataframe(df_workplace, use_container_width=True, hide_index=True)
 
 
+def display_target_whatif(engine, targets, period_labels, main_period):
+    """Krivka splnení / pokroku / medzery pre celú mriežku cieľov - jeden výpočet bez rerunu na hodnotu"""
+    
+    st.markdown("*Koľko zamestnancov by splnilo cieľ pri rôznych hodnotách - bez posúvania slidera po krokoch*")
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    
+    with col1:
+        periods = st.multiselect(
+            "📅 Obdobia:",
+            list(period_labels.keys()),
+            default=[main_period],
+            format_func=lambda x: period_labels[x],
+            key="whatif_periods"
+        )
+    
+    with col2:
+        target_range = st.slider(
+            "🎯 Rozsah cieľa (mil. Kč):",
+            min_value=0.5,
+            max_value=20.0,
+            value=(0.5, 6.0),
+            step=0.5,
+            key="whatif_target_range"
+        )
+    
+    with col3:
+        steps = st.selectbox("🔢 Bodov:", [25, 50, 100, 200], index=2, key="whatif_steps")
+    
+    if not periods:
+        st.info("ℹ️ Vyberte aspoň jedno obdobie.")
+        return
+    
+    target_grid = np.linspace(target_range[0], target_range[1], steps) * 1_000_000
+    sweep = engine.sweep(target_grid, periods)
+    
+    metric_options = {
+        'pass_count': "🏆 Počet splnení",
+        'avg_progress': "📊 Priemerný pokrok (%)",
+        'total_gap': "📉 Celková medzera (Kč)"
+    }
+    tabs = st.tabs(list(metric_options.values()))
+    
+    for tab, (metric_key, metric_label) in zip(tabs, metric_options.items()):
+        with tab:
+            fig = go.Figure()
+            for period in periods:
+                fig.add_trace(go.Scatter(
+                    x=target_grid,
+                    y=sweep[period][metric_key],
+                    mode='lines',
+                    name=period_labels[period],
+                    hovertemplate="Cieľ: %{x:,.0f} Kč<br>" + metric_label + ": %{y:,.1f}<extra></extra>"
+                ))
+                
+                # Aktuálny cieľ obdobia ako referenčná čiara
+                current_target = targets[period]
+                if target_grid[0] <= current_target <= target_grid[-1]:
+                    fig.add_vline(x=current_target, line_dash="dot", line_color="gray")
+            
+            fig.update_layout(
+                title=dict(text=f"{metric_label} podľa cieľa", x=0.5),
+                xaxis_title="Cieľ (Kč)",
+                yaxis_title=metric_label,
+                height=400,
+                hovermode="x unified"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    
+    # Súhrn pri aktuálnych cieľoch
+    current = engine.sweep([targets[p] for p in periods], periods)
+    summary_rows = []
+    for k, period in enumerate(periods):
+        summary_rows.append({
+            "Obdobie": period_labels[period],
+            "Cieľ": f"{targets[period]:,} Kč",
+            "Splnili": f"{int(current[period]['pass_count'][k])}/{len(engine)}",
+            "Priemerný pokrok": f"{current[period]['avg_progress'][k]:.1f}%",
+            "Celková medzera": f"{current[period]['total_gap'][k]:,.0f} Kč"
+        })
+    st.dataframe(pd.DataFrame(summary_rows), use_container_width=True, hide_index=True)
+
+
 def display_export_section(ranking_data, ranking_target, ranking_period):
     """Zobrazí export sekciu"""
     
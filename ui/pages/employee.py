@@ -40,11 +40,7 @@ def render(analyzer, selected_employee):
     from auth.auth import can_access_city, get_current_user
     
     # Najprv získaj údaje o zamestnancovi
-    employee_data = None
-    for emp in analyzer.sales_employees:
-        if emp.get('name') == selected_employee:
-            employee_data = emp
-            break
+    employee_data = analyzer.get_employee_by_name(selected_employee)
     
     if not employee_data:
         st.error(f"❌ Zamestnanec '{selected_employee}' nebol nájdený!")
@@ -78,6 +74,9 @@ def render(analyzer, selected_employee):
         st.write(f"🔍 DEBUG: Workplace = '{employee_workplace}'")
         st.write(f"🔍 DEBUG: User cities = {current_user.get('cities', [])}")
     
+    # Upozornenie z validačného reportu ešte pred vykreslením grafov
+    show_data_quality_notice(analyzer, selected_employee)
+    
     # ✨ PROFESIONÁLNY HEADER
     st.markdown(f"""
     <div style="
@@ -188,6 +187,9 @@ def render(analyzer, selected_employee):
         </div>
         """, unsafe_allow_html=True)
     
+    # ✅ PORADIE V REBRÍČKOCH - predpočítané indexy, bez triedenia všetkých
+    show_employee_ranks(analyzer, selected_employee)
+    
     # ✅ ZÍSKANIE SKUTOČNÝCH INTERNET A APLIKAČNÝCH DÁT
     internet_data = get_employee_internet_data(analyzer, selected_employee)
     app_data = get_employee_application_data(analyzer, selected_employee)
@@ -247,6 +249,9 @@ def render(analyzer, selected_employee):
     
     st.markdown("</div>", unsafe_allow_html=True)
     
+    # ✅ PERCENTILOVÉ POROVNANIE S KOLEGAMI
+    create_percentile_comparison(analyzer, selected_employee, employee_workplace)
+    
     # ✅ PRIDANIE DETAILNEJ TABUĽKY NA KONCI
     with st.expander("📋 Detailné dátové tabuľky", expanded=False):
         if not monthly_sales:
@@ -268,6 +273,71 @@ def render(analyzer, selected_employee):
             st.dataframe(app_data.head(10), use_container_width=True)
 
 
+def create_percentile_comparison(analyzer, employee_name, workplace):
+    """Porovnanie denných priemerov s percentilovými pásmami firmy alebo mesta"""
+    
+    st.markdown("### 📊 Percentilové porovnanie s kolegami")
+    
+    scope_labels = {'company': "🏢 Celá firma", str(workplace).lower(): f"🏙️ {str(workplace).title()}"}
+    scope = st.radio("Porovnať s", list(scope_labels.keys()), format_func=lambda s: scope_labels[s],
+                     horizontal=True, key="percentile_scope")
+    
+    tab1, tab2 = st.tabs(["🌐 Internet", "💻 Aplikácie"])
+    for tab, data_type in ((tab1, 'internet'), (tab2, 'applications')):
+        with tab:
+            profile = analyzer.get_percentile_bands(data_type).employee_profile(employee_name, scope)
+            if profile.empty:
+                st.info("Žiadne dáta pre percentilové porovnanie")
+                continue
+            
+            # Len aktivity, kde má niekto nenulový čas
+            profile = profile[(profile['p90'] > 0) | (profile['value'] > 0)]
+            if profile.empty:
+                st.info("Žiadne aktivity na porovnanie")
+                continue
+            
+            create_percentile_band_chart(profile)
+            
+            top = profile.sort_values('percentile', ascending=False).iloc[0]
+            st.caption(f"💡 Najvyšší percentil: **{top.name}** – {top['percentile']:.0f}. percentil "
+                       f"({top['value']:.1f}h/deň, {int(top['count'])} zamestnancov)")
+
+
+def create_percentile_band_chart(profile):
+    """Pásma p10–p90 a p25–p75, medián a hodnota zamestnanca pre každú aktivitu"""
+    
+    activities = list(profile.index)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=activities, x=profile['p90'] - profile['p10'], base=profile['p10'], orientation='h',
+        marker_color='rgba(59, 130, 246, 0.25)', name="p10–p90", hoverinfo='skip'
+    ))
+    fig.add_trace(go.Bar(
+        y=activities, x=profile['p75'] - profile['p25'], base=profile['p25'], orientation='h',
+        marker_color='rgba(59, 130, 246, 0.6)', name="p25–p75", hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scatter(
+        y=activities, x=profile['p50'], mode='markers', name="Medián",
+        marker=dict(symbol='line-ns-open', size=18, color='white')
+    ))
+    fig.add_trace(go.Scatter(
+        y=activities, x=profile['value'], mode='markers', name="Zamestnanec",
+        marker=dict(size=12, color='#f59e0b'),
+        customdata=profile['percentile'],
+        hovertemplate='%{y}: %{x:.2f}h/deň<br>%{customdata:.0f}. percentil<extra></extra>'
+    ))
+    
+    layout = get_dark_plotly_layout()
+    layout.update({
+        'barmode': 'overlay',
+        'height': max(250, 40 * len(activities) + 80),
+        'xaxis': dict(title="Hodiny denne"),
+        'margin': dict(l=20, r=20, t=30, b=20),
+    })
+    fig.update_layout(**layout)
+    st.plotly_chart(fig, use_container_width=True)
+
+
 def create_monthly_activity_charts(internet_data, app_data, analyzer, employee_name):
     """Vytvorí mesačné stĺpcové grafy pre SketchUp a Mail aktivity"""
     
@@ -296,39 +366,55 @@ def create_monthly_activity_charts(internet_data, app_data, analyzer, employee_n
     st.markdown("</div>", unsafe_allow_html=True)
 
 
+def show_employee_ranks(analyzer, employee_name):
+    """Poradie zamestnanca v kľúčových rebríčkoch"""
+    ranks = []
+    for metric, label in (('total_sales', "💰 Predaj"), ('internet_score', "🌐 Internet skóre"),
+                          ('overall_score', "⭐ Celkové skóre")):
+        try:
+            board = analyzer.get_leaderboard(metric)
+        except Exception:
+            continue
+        rank = board.rank(employee_name)
+        if rank is not None:
+            ranks.append(f"{label}: **#{rank}** z {len(board)}")
+    
+    if ranks:
+        st.caption("🏆 Poradie vo firme – " + " | ".join(ranks))
+
+
+def show_data_quality_notice(analyzer, employee_name):
+    """Zobrazí dni nad 24h z validačného reportu pre daného zamestnanca"""
+    try:
+        report = analyzer.get_validation_report()
+    except Exception:
+        return
+    
+    canonical = analyzer.name_mapping.get(employee_name)
+    if not canonical:
+        return
+    
+    days = [
+        item for item in report.get('checks', {}).get('day_over_24h', [])
+        if analyzer.name_mapping.get(item['person']) == canonical
+    ]
+    if days:
+        listed = ', '.join(f"{d['date']} ({d['hours']:.1f}h, {d['source']})" for d in days[:5])
+        st.warning(f"⚠️ Dáta obsahujú {len(days)} dní nad 24h (duplicitné reporty?): {listed}")
+
+
 def create_monthly_sketchup_chart(internet_data, analyzer, employee_name):
     """Vytvorí mesačný stĺpcový graf SketchUp aktivity - VYLEPŠENÉ s timeline dátami"""
     
     st.markdown("#### 🎨 Mesačná aktivita - SketchUp")
     
-    # ✅ VYLEPŠENIE: Pokús sa použiť timeline dáta pre presnejšie mesačné agregácie
-    timeline_data = analyzer.get_employee_daily_timeline(employee_name, 'internet') if analyzer else pd.DataFrame()
-    
+    # Predpočítaný rollup osoba × mesiac (bez prechádzania denných riadkov)
     sketchup_monthly = {}
     
-    if not timeline_data.empty and 'Date' in timeline_data.columns and 'Chat' in timeline_data.columns:
-        # Máme timeline dáta - agreguj presne podľa dátumov
-        timeline_data['Month'] = timeline_data['Date'].dt.strftime('%Y-%m')
-        
-        for month in timeline_data['Month'].unique():
-            month_data = timeline_data[timeline_data['Month'] == month]
-            total_minutes = 0
-            
-            for _, row in month_data.iterrows():
-                chat_value = row.get('Chat', '0:00')
-                if pd.notna(chat_value) and str(chat_value) not in ['0:00', 'nan', '']:
-                    total_minutes += time_to_minutes(str(chat_value))
-            
-            if total_minutes > 0:
-                sketchup_monthly[month] = total_minutes / 60  # Konvertuj na hodiny
-    else:
-        # Fallback na pôvodnú analyzer funkciu
-        monthly_data = analyzer.get_employee_monthly_data(employee_name, 'internet') if analyzer else {}
-        
-        # Extrahuj len Chat (SketchUp) dáta z mesačných údajov 
-        for month, activities in monthly_data.items():
-            if 'Chat' in activities:
-                sketchup_monthly[month] = activities['Chat'] / 60  # Konvertuj na hodiny
+    monthly = analyzer.get_employee_monthly_activity(employee_name, 'internet', ['Chat']) if analyzer else pd.DataFrame()
+    if not monthly.empty and 'Chat' in monthly.columns:
+        chat = monthly['Chat']
+        sketchup_monthly = (chat[chat > 0] / 60).to_dict()  # Konvertuj na hodiny
     
     if not sketchup_monthly:
         st.markdown("""
@@ -408,64 +494,15 @@ def create_monthly_mail_chart(internet_data, app_data, analyzer, employee_name):
     
     mail_monthly = {}
     
-    # ✅ VYLEPŠENIE: Použij timeline dáta pre presnejšie mesačné agregácie
-    internet_timeline = analyzer.get_employee_daily_timeline(employee_name, 'internet') if analyzer else pd.DataFrame()
-    app_timeline = analyzer.get_employee_daily_timeline(employee_name, 'applications') if analyzer else pd.DataFrame()
-    
-    # Agreguj Mail z internet timeline
-    if not internet_timeline.empty and 'Date' in internet_timeline.columns and 'Mail' in internet_timeline.columns:
-        internet_timeline['Month'] = internet_timeline['Date'].dt.strftime('%Y-%m')
-        
-        for month in internet_timeline['Month'].unique():
-            month_data = internet_timeline[internet_timeline['Month'] == month]
-            total_minutes = 0
-            
-            for _, row in month_data.iterrows():
-                mail_value = row.get('Mail', '0:00')
-                if pd.notna(mail_value) and str(mail_value) not in ['0:00', 'nan', '']:
-                    total_minutes += time_to_minutes(str(mail_value))
-            
-            if total_minutes > 0:
-                if month not in mail_monthly:
-                    mail_monthly[month] = 0
-                mail_monthly[month] += total_minutes / 60  # Konvertuj na hodiny
-    
-    # Agreguj Mail z applications timeline
-    if not app_timeline.empty and 'Date' in app_timeline.columns and 'Mail' in app_timeline.columns:
-        app_timeline['Month'] = app_timeline['Date'].dt.strftime('%Y-%m')
-        
-        for month in app_timeline['Month'].unique():
-            month_data = app_timeline[app_timeline['Month'] == month]
-            total_minutes = 0
-            
-            for _, row in month_data.iterrows():
-                mail_value = row.get('Mail', '0:00')
-                if pd.notna(mail_value) and str(mail_value) not in ['0:00', 'nan', '']:
-                    total_minutes += time_to_minutes(str(mail_value))
-            
-            if total_minutes > 0:
-                if month not in mail_monthly:
-                    mail_monthly[month] = 0
-                mail_monthly[month] += total_minutes / 60  # Konvertuj na hodiny
-    
-    # Fallback ak timeline dáta nie sú dostupné
-    if not mail_monthly:
-        internet_monthly = analyzer.get_employee_monthly_data(employee_name, 'internet') if analyzer else {}
-        app_monthly = analyzer.get_employee_monthly_data(employee_name, 'applications') if analyzer else {}
-        
-        # Mail z internet dát
-        for month, activities in internet_monthly.items():
-            if 'Mail' in activities:
-                if month not in mail_monthly:
-                    mail_monthly[month] = 0
-                mail_monthly[month] += activities['Mail'] / 60  # Konvertuj na hodiny
-        
-        # Mail z aplikačných dát  
-        for month, activities in app_monthly.items():
-            if 'Mail' in activities:
-                if month not in mail_monthly:
-                    mail_monthly[month] = 0
-                mail_monthly[month] += activities['Mail'] / 60  # Konvertuj na hodiny
+    # Mail z internet aj aplikačného rollupu osoba × mesiac
+    if analyzer:
+        for data_type in ('internet', 'applications'):
+            monthly = analyzer.get_employee_monthly_activity(employee_name, data_type, ['Mail'])
+            if monthly.empty or 'Mail' not in monthly.columns:
+                continue
+            for month, minutes in monthly['Mail'].items():
+                if minutes > 0:
+                    mail_monthly[month] = mail_monthly.get(month, 0) + minutes / 60  # Konvertuj na hodiny
     
     if not mail_monthly:
         st.info("ℹ️ Žiadne Mail aktivity nájdené")
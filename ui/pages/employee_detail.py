@@ -3,142 +3,10 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import time
-import hashlib
-import os
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
-from multiprocessing import cpu_count
 from core.studio_analyzer import StudioAnalyzer
+from core import studio_details
 from auth.auth import has_feature_access, init_auth
-
-# 🚀 AUTO-DETECT CPU CORES pre maximálny výkon
-MAX_WORKERS = max(2, cpu_count())  # Minimálne 2, ale použije všetky dostupné cores
-
-def get_optimal_workers_count(data_size):
-    """Dynamické určenie optimálneho počtu workerov na základe veľkosti dát"""
-    if data_size < 1000:
-        return min(2, MAX_WORKERS)
-    elif data_size < 10000:
-        return min(4, MAX_WORKERS)
-    else:
-        return MAX_WORKERS  # Pre veľké datasety využij všetky cores
-
-@st.cache_data(ttl=300)  # 5 minút cache
-def get_employee_detailed_data_cached(employee_name, file_hash=None, filter_info=None):
-    """Cached verzia získania detailných dát pre zamestnanca"""
-    studio_analyzer = st.session_state.get('studio_analyzer')
-    if not studio_analyzer:
-        return pd.DataFrame()
-    
-    return studio_analyzer.get_employee_detailed_data(employee_name)
-
-@st.cache_data(ttl=300)
-def calculate_employee_metrics_cached(emp_data_hash, emp_data_dict):
-    """Cached výpočet základných metrík"""
-    emp_data = pd.DataFrame(emp_data_dict)
-    
-    if emp_data.empty:
-        return None
-    
-    total_sales = emp_data['Cena/jedn.'].sum()
-    total_orders = len(emp_data)
-    avg_order = emp_data['Cena/jedn.'].mean()
-    unique_orders = emp_data['Doklad'].nunique()
-    
-    # Pre výpočet rozsahu dátumov
-    if 'Datum real.' in emp_data.columns:
-        date_range = (emp_data['Datum real.'].max() - emp_data['Datum real.'].min()).days
-    else:
-        date_range = 0
-    
-    return {
-        'total_sales': total_sales,
-        'total_orders': total_orders,
-        'avg_order': avg_order,
-        'unique_orders': unique_orders,
-        'date_range': date_range
-    }
-
-@st.cache_data(ttl=300)
-def calculate_category_analysis_cached(emp_data_hash, emp_data_dict):
-    """Cached analýza podľa kategórií"""
-    emp_data = pd.DataFrame(emp_data_dict)
-    
-    if emp_data.empty or 'Název_norm' not in emp_data.columns:
-        return pd.DataFrame()
-    
-    category_sales = emp_data.groupby('Název_norm').agg({
-        'Cena/jedn.': ['sum', 'count', 'mean']
-    }).round(0)
-    
-    category_sales.columns = ['Celkový predaj', 'Počet kusov', 'Priemerná cena']
-    return category_sales.reset_index()
-
-@st.cache_data(ttl=300)
-def calculate_time_analysis_parallel(emp_data_hash, emp_data_dict):
-    """Paralelný výpočet časovej analýzy"""
-    emp_data = pd.DataFrame(emp_data_dict)
-    
-    if emp_data.empty or 'Datum real.' not in emp_data.columns:
-        return None
-    
-    try:
-        # Analýza podľa mesiacov
-        monthly_breakdown = emp_data.groupby(emp_data['Datum real.'].dt.month)['Cena/jedn.'].sum()
-        
-        # Analýza podľa dní v týždni
-        weekly_breakdown = emp_data.groupby(emp_data['Datum real.'].dt.dayofweek)['Cena/jedn.'].sum()
-        
-        # Trend analýza
-        daily_sales = emp_data.groupby(emp_data['Datum real.'].dt.date)['Cena/jedn.'].sum()
-        
-        return {
-            'monthly': monthly_breakdown,
-            'weekly': weekly_breakdown,
-            'daily_trend': daily_sales
-        }
-    except:
-        return None
-
-@st.cache_data(ttl=300)
-def calculate_product_analysis_parallel(emp_data_hash, emp_data_dict):
-    """Paralelný výpočet produktovej analýzy"""
-    emp_data = pd.DataFrame(emp_data_dict)
-    
-    if emp_data.empty:
-        return None
-    
-    try:
-        # Top produkty podľa predaja
-        if 'Název' in emp_data.columns:
-            top_products = emp_data.groupby('Název')['Cena/jedn.'].sum().sort_values(ascending=False).head(10)
-        else:
-            top_products = pd.Series()
-        
-        # Analýza podľa množstva
-        if 'Množství' in emp_data.columns:
-            quantity_analysis = emp_data.groupby('Název')['Množství'].sum().sort_values(ascending=False).head(10)
-        else:
-            quantity_analysis = pd.Series()
-        
-        # Priemerné ceny produktov
-        if 'Název' in emp_data.columns:
-            avg_prices = emp_data.groupby('Název')['Cena/jedn.'].mean().sort_values(ascending=False).head(10)
-        else:
-            avg_prices = pd.Series()
-        
-        return {
-            'top_products': top_products,
-            'quantity_analysis': quantity_analysis,
-            'avg_prices': avg_prices
-        }
-    except:
-        return None
-
-def get_data_hash(data):
-    """Vytvorí hash pre pandas DataFrame alebo iné dáta"""
-    if isinstance(data, pd.DataFrame):
-        return hashlib.md5(str(data.values.tobytes()).encode()).hexdigest()
-    return hashlib.md5(str(data).encode()).hexdigest()
+from ui.pages.studio import get_employee_grid_key
 
 def render_employee_metrics_optimized(metrics):
     """Optimalizované renderovanie metrík"""
@@ -213,15 +81,13 @@ def render(selected_employee_name, analyzer_or_data):
             st.rerun()
         return
     
-    # Cached získanie dát pre zamestnanca
-    file_hash = None
-    filter_info = st.session_state.get('date_filter_info')
-    
+    # Detail z predpočtu Studio stránky, inak výpočet len riadkov zamestnanca
+    # (cache podľa snapshotu, rozsahu dátumov a zamestnanca - bez hashovania dát)
     try:
-        emp_data = get_employee_detailed_data_cached(
-            selected_employee_name, 
-            file_hash=file_hash,
-            filter_info=filter_info
+        emp_data, payload = studio_details.employee_details(
+            get_employee_grid_key(analyzer_or_data),
+            selected_employee_name,
+            analyzer_or_data.df_active
         )
     except Exception as e:
         st.error(f"❌ Chyba pri načítavaní dát: {e}")
@@ -232,7 +98,7 @@ def render(selected_employee_name, analyzer_or_data):
             st.rerun()
         return
     
-    if emp_data.empty:
+    if payload is None or emp_data.empty:
         st.warning("Žiadne dáta pre tohto zamestnanca")
         if st.button("← Späť na Studio"):
             st.session_state['current_page'] = 'studio'
@@ -241,53 +107,8 @@ def render(selected_employee_name, analyzer_or_data):
             st.rerun()
         return
     
-    # Hash pre cache invalidation
-    emp_data_hash = get_data_hash(emp_data)
-    emp_data_dict = emp_data.to_dict('records')
-    data_size = len(emp_data)
-    optimal_workers = get_optimal_workers_count(data_size)
-    
-    # Zobrazenie performance info
-    st.caption(f"🔥 Employee Detail Performance: {optimal_workers}/{MAX_WORKERS} cores aktívnych")
-    
-    # Paralelné vykonávanie výpočtov - využívame všetky cores
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Spustenie cached výpočtov paralelne
-        future_metrics = executor.submit(
-            calculate_employee_metrics_cached, 
-            emp_data_hash, 
-            emp_data_dict
-        )
-        future_categories = executor.submit(
-            calculate_category_analysis_cached,
-            emp_data_hash,
-            emp_data_dict
-        )
-        # Pridáme ďalšie paralelné úlohy pre komplexnejšie spracovanie
-        future_time_analysis = executor.submit(
-            calculate_time_analysis_parallel,
-            emp_data_hash,
-            emp_data_dict
-        )
-        future_product_analysis = executor.submit(
-            calculate_product_analysis_parallel,
-            emp_data_hash,
-            emp_data_dict
-        )
-        
-        # Čakanie na výsledky s timeoutom
-        try:
-            metrics = future_metrics.result(timeout=10)
-            category_sales = future_categories.result(timeout=10)
-            time_analysis = future_time_analysis.result(timeout=10)
-            product_analysis = future_product_analysis.result(timeout=10)
-        except Exception as e:
-            st.warning(f"⚠️ Timeout pri paralelnom spracovaní: {e}")
-            # Fallback na základné výpočty
-            metrics = calculate_employee_metrics_cached(emp_data_hash, emp_data_dict)
-            category_sales = calculate_category_analysis_cached(emp_data_hash, emp_data_dict)
-            time_analysis = None
-            product_analysis = None
+    metrics = payload['metrics']
+    category_sales = payload['categories']
     
     # ==================== ZÁKLADNÉ METRIKY ====================
     st.header("📊 Základné metriky")
@@ -319,8 +140,7 @@ def render(selected_employee_name, analyzer_or_data):
     if has_feature_access("employee_detail_top_products"):
         st.header("🏆 Najpredávanejšie produkty z každej kategórie")
         
-        # Používame pôvodné emp_data namiesto cache pre túto sekciu
-        top_products_per_category = get_top_products_per_category(emp_data)
+        top_products_per_category = payload['top_products_per_category']
         
         if top_products_per_category:
             # Zobrazenie v krásnych kartách
@@ -379,9 +199,7 @@ def render(selected_employee_name, analyzer_or_data):
     # ==================== MESAČNÝ VÝVOJ ====================
     st.header("📅 Mesačný vývoj predaja")
     
-    emp_data['Mesiac'] = pd.to_datetime(emp_data['Datum real.']).dt.to_period('M')
-    monthly_emp_cat = emp_data.groupby(['Mesiac', 'Název_norm'])['Cena/jedn.'].sum().reset_index()
-    monthly_emp_cat['Mesiac'] = monthly_emp_cat['Mesiac'].astype(str)
+    monthly_emp_cat = payload['monthly']
     
     if not monthly_emp_cat.empty:
         fig_monthly = px.bar(
@@ -428,36 +246,3 @@ def render(selected_employee_name, analyzer_or_data):
         if 'selected_employee_name' in st.session_state:
             del st.session_state['selected_employee_name']
         st.rerun()
-
-# ==================== POMOCNÉ FUNKCIE ====================
-def get_top_products_per_category(emp_data):
-    """Získa najpredávanejší produkt z každej kategórie pre zamestnanca"""
-    
-    top_products = []
-    
-    for category in emp_data['Název_norm'].unique():
-        category_data = emp_data[emp_data['Název_norm'] == category]
-        
-        # Grupovanie podľa produktu a súčet predaja
-        grouped_products = category_data.groupby('Název').agg({
-            'Cena/jedn.': 'sum',
-            'Název': 'count'  # Počet kusov
-        }).rename(columns={'Název': 'count'})
-        
-        if not grouped_products.empty:
-            # Najdi produkt s najvyšším predajom
-            top_product_name = grouped_products['Cena/jedn.'].idxmax()
-            top_value = grouped_products.loc[top_product_name, 'Cena/jedn.']
-            top_count = grouped_products.loc[top_product_name, 'count']
-            
-            top_products.append({
-                'category': category.replace('_', ' ').capitalize(),
-                'product': top_product_name,
-                'value': top_value,
-                'count': top_count
-            })
-    
-    # Zoraď podľa hodnoty predaja (zostupne)
-    top_products.sort(key=lambda x: x['value'], reverse=True)
-    
-    return top_products
@@ -1,13 +1,188 @@
-
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 from core.utils import format_money
+from core.employee_table import MONTH_COLUMNS
+from core.forecast_engine import ForecastEngine, METHODS
 from ui.styling import get_dark_plotly_layout
 
+
 def render(analyzer):
     """Predikcia predaja na základe trendov"""
     st.header("🔮 Predikcia predaja")
-    
-    # Implementácia forecasting logiky
-    st.info("Implementujte predikciu podľa pôvodného kódu")
+
+    if analyzer is None:
+        st.error("❌ Dáta nie sú načítané. Prejdite najskôr na Overview stránku.")
+        return
+
+    rows, scope_key = get_user_scope(analyzer)
+    engine = get_forecast_engine(analyzer, rows, scope_key)
+
+    if len(engine) == 0 or engine.last_month < 0:
+        st.warning("⚠️ Žiadne predajné dáta pre predikciu")
+        return
+
+    method = st.selectbox("📐 Metóda predikcie", list(METHODS.keys()), format_func=lambda m: METHODS[m])
+
+    month_ahead = engine.month_ahead(method)
+    quarter_end = engine.quarter_end(method)
+
+    st.caption(f"📅 Posledný mesiac s dátami: **{MONTH_COLUMNS[engine.last_month]}** | "
+               f"Pásmo: 95 % interval | Zamestnancov: {len(engine)}")
+
+    # Súhrn za celý rozsah
+    month_cities = engine.by_workplace(month_ahead)
+    quarter_cities = engine.by_workplace(quarter_end)
+    month_total = month_cities['forecast'].sum()
+    month_std = np.sqrt((month_cities['std'] ** 2).sum())
+    quarter_total = quarter_cities['forecast'].sum()
+    quarter_std = np.sqrt((quarter_cities['std'] ** 2).sum())
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(f"📆 Predikcia {engine.next_month_label()}", format_money(month_total),
+                  help=f"± {format_money(engine.z * month_std)}")
+    with col2:
+        st.metric(f"🏁 Projekcia konca {engine.quarter_label()}", format_money(quarter_total),
+                  help=f"± {format_money(engine.z * quarter_std)}")
+    with col3:
+        st.metric(f"✅ Skutočnosť {engine.quarter_label()} doteraz", format_money(quarter_cities['actual_to_date'].sum()))
+
+    show_company_projection(engine, method)
+
+    tab1, tab2 = st.tabs(["🏙️ Mestá", "👥 Zamestnanci"])
+    with tab1:
+        show_city_forecast(month_cities, quarter_cities, engine)
+    with tab2:
+        show_employee_forecast(month_ahead, quarter_end, engine)
+
+
+def get_user_scope(analyzer):
+    """Riadky EmployeeTable podľa miest používateľa + kľúč pre cache"""
+    from auth.auth import get_current_user
+
+    table = analyzer.get_employee_table()
+    user = get_current_user()
+    cities = user.get('cities', []) if user else []
+
+    if not user or user.get('role') == 'admin' or 'all' in cities:
+        return None, 'all'
+
+    rows = table.rows_for_workplaces(cities)
+    return rows, tuple(sorted(c.lower() for c in cities))
+
+
+def get_forecast_engine(analyzer, rows, scope_key):
+    """Forecast engine cachovaný na analyzéri per snapshot dát a rozsah používateľa"""
+
+    table = analyzer.get_employee_table()
+    cache = getattr(analyzer, '_forecast_engines', None)
+    if cache is None or cache['table'] is not table:
+        cache = {'table': table, 'scopes': {}}
+        analyzer._forecast_engines = cache
+
+    if scope_key not in cache['scopes']:
+        cache['scopes'][scope_key] = ForecastEngine(table, rows)
+    return cache['scopes'][scope_key]
+
+
+def show_company_projection(engine, method):
+    """Graf skutočnosti po mesiacoch + predikcia do konca roka s pásmom"""
+
+    actual = engine.sales[:, :engine.last_month + 1].sum(axis=0)
+    future = np.arange(engine.last_month + 1, len(MONTH_COLUMNS))
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=MONTH_COLUMNS[:engine.last_month + 1], y=actual,
+        name="Skutočnosť", marker_color='#3b82f6'
+    ))
+
+    if len(future):
+        mean, var = engine.predict(future, method)
+        total = mean.sum(axis=0)
+        std = np.sqrt(var.sum(axis=0))
+        labels = [MONTH_COLUMNS[m] for m in future]
+
+        fig.add_trace(go.Scatter(
+            x=labels + labels[::-1],
+            y=list(total + engine.z * std) + list(np.maximum(total - engine.z * std, 0))[::-1],
+            fill='toself', fillcolor='rgba(245, 158, 11, 0.2)', line=dict(width=0),
+            name="95 % pásmo", hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=labels, y=total, mode='lines+markers',
+            name="Predikcia", line=dict(color='#f59e0b', width=3)
+        ))
+
+    layout = get_dark_plotly_layout()
+    layout.update({
+        'title': dict(text="📈 Firemný predaj a predikcia do konca roka", font=dict(color='white', size=16)),
+        'height': 400,
+        'xaxis': dict(categoryorder='array', categoryarray=MONTH_COLUMNS),
+    })
+    fig.update_layout(**layout)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def show_city_forecast(month_cities, quarter_cities, engine):
+    """Predikcie po mestách s chybovými úsečkami"""
+
+    fig = go.Figure(go.Bar(
+        x=quarter_cities['workplace'].str.title(),
+        y=quarter_cities['forecast'],
+        error_y=dict(
+            type='data', symmetric=False,
+            array=quarter_cities['upper'] - quarter_cities['forecast'],
+            arrayminus=quarter_cities['forecast'] - quarter_cities['lower']
+        ),
+        marker_color='#8b5cf6'
+    ))
+    layout = get_dark_plotly_layout()
+    layout.update({
+        'title': dict(text=f"🏁 Projekcia konca {engine.quarter_label()} po mestách", font=dict(color='white', size=16)),
+        'height': 350,
+    })
+    fig.update_layout(**layout)
+    st.plotly_chart(fig, use_container_width=True)
+
+    table = quarter_cities[['workplace', 'employees', 'actual_to_date', 'forecast', 'lower', 'upper']].merge(
+        month_cities[['workplace', 'forecast']].rename(columns={'forecast': 'month_forecast'}),
+        on='workplace', how='left'
+    )
+    display = pd.DataFrame({
+        '🏙️ Mesto': table['workplace'].str.title(),
+        '👥 Zamestnanci': table['employees'],
+        f'📆 {engine.next_month_label()}': table['month_forecast'].map(format_money),
+        f'✅ {engine.quarter_label()} doteraz': table['actual_to_date'].map(format_money),
+        f'🏁 {engine.quarter_label()} projekcia': table['forecast'].map(format_money),
+        '📉 Dolná hranica': table['lower'].map(format_money),
+        '📈 Horná hranica': table['upper'].map(format_money),
+    })
+    st.dataframe(display, use_container_width=True, hide_index=True)
+
+
+def show_employee_forecast(month_ahead, quarter_end, engine):
+    """Tabuľka predikcií pre všetkých zamestnancov"""
+
+    table = month_ahead.assign(
+        quarter_forecast=quarter_end['forecast'].to_numpy(),
+        quarter_lower=quarter_end['lower'].to_numpy(),
+        quarter_upper=quarter_end['upper'].to_numpy(),
+    ).sort_values('quarter_forecast', ascending=False)
+
+    display = pd.DataFrame({
+        '👤 Zamestnanec': table['name'],
+        '🏙️ Mesto': table['workplace'].astype(str).str.title(),
+        f'📊 {MONTH_COLUMNS[engine.last_month]}': table['last_actual'].map(format_money),
+        f'📆 {engine.next_month_label()}': table['forecast'].map(format_money),
+        f'🏁 {engine.quarter_label()} projekcia': table['quarter_forecast'].map(format_money),
+        '📏 Pásmo': [f"{format_money(lo)} – {format_money(hi)}"
+                    for lo, hi in zip(table['quarter_lower'], table['quarter_upper'])],
+        '🗓️ Mesiace histórie': table['history_months'],
+    })
+    st.dataframe(display, use_container_width=True, hide_index=True)
+
+    if (table['history_months'] < 3).any():
+        st.caption("ℹ️ Pri menej ako 3 mesiacoch histórie sa trend neodhaduje - použije sa priemer.")
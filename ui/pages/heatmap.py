@@ -2,7 +2,9 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-from core.utils import time_to_minutes, calculate_quarter_sales
+import numpy as np
+from core.utils import time_series_to_minutes, get_quarter_months
+from core.employee_table import EmployeeTable
 from ui.styling import (
     get_dark_plotly_layout, apply_dark_theme, create_section_header, 
     create_subsection_header, create_simple_metric_card
@@ -10,127 +12,107 @@ from ui.styling import (
 from auth.auth import filter_data_by_user_access, can_access_city, get_user_cities, get_current_user
 
 
-def calculate_weighted_benchmarks(analyzer):
-    """Vypočíta vážené benchmarky na základe predajných výsledkov"""
+INTERNET_USAGE_COLUMNS = ['Mail', 'IS Sykora', 'SykoraShop', 'Web k praci', 'Chat', 'Hry', 'Nepracovni weby']
+APP_USAGE_COLUMNS = ['Helios Green', 'Imos - program', 'Mail', 'Programy', 'Půdorysy']
+QUARTER_TARGET = 2000000  # 2M na štvrťrok
+
+
+def _usage_by_canonical(analyzer, data_type):
+    """Súčty využitia a dostupného času pre každé kanonické meno (jeden prechod dátami)"""
     
-    if not analyzer.sales_employees:
-        return {'internet_benchmark': 50, 'app_benchmark': 50}
+    cache = getattr(analyzer, '_heatmap_usage', None)
+    data_source = analyzer.internet_data if data_type == 'internet' else analyzer.applications_data
+    if cache is None or cache.get('mapping') is not analyzer.name_mapping:
+        cache = {'mapping': analyzer.name_mapping}
+        analyzer._heatmap_usage = cache
     
-    total_weighted_internet = 0
-    total_weighted_apps = 0
-    total_weight = 0
+    entry = cache.get(data_type)
+    if entry is not None and entry[0] is data_source:
+        return entry[1]
     
-    for emp in analyzer.sales_employees:
-        emp_name = emp['name']
-        
-        # Váha = celkové predaje (vyšší predaj = vyššia váha)
-        monthly_sales = emp.get('monthly_sales', {})
-        total_sales = sum(monthly_sales.values()) if monthly_sales else 0
-        weight = max(1, total_sales / 1000000)  # Minimálna váha 1, škálované na milióny
-        
-        # Výpočet metrík pre tohto zamestnanca
-        internet_usage = calculate_raw_internet_usage(analyzer, emp_name)
-        app_usage = calculate_raw_app_usage(analyzer, emp_name)
-        
-        # Vážený prispevok
-        total_weighted_internet += internet_usage * weight
-        total_weighted_apps += app_usage * weight
-        total_weight += weight
-    
-    # Výpočet vážených priemerov
-    if total_weight > 0:
-        internet_benchmark = total_weighted_internet / total_weight
-        app_benchmark = total_weighted_apps / total_weight
+    if data_source is None:
+        usage = None
     else:
-        internet_benchmark = 50
-        app_benchmark = 50
+        columns = INTERNET_USAGE_COLUMNS if data_type == 'internet' else APP_USAGE_COLUMNS
+        used = sum(
+            time_series_to_minutes(data_source[col]) if col in data_source.columns else 0
+            for col in columns
+        )
+        if 'Čas celkem ▼' in data_source.columns:
+            available = time_series_to_minutes(data_source['Čas celkem ▼'])
+        else:
+            available = pd.Series(0, index=data_source.index)
+        available = available.where(available > 0, 480)  # 8h ak chýba celkový čas
+        
+        frame = pd.DataFrame({
+            'canon': data_source['Osoba ▲'].map(analyzer.name_mapping),
+            'used': used,
+            'available': available
+        }).dropna(subset=['canon'])
+        usage = frame.groupby('canon')[['used', 'available']].sum()
+    
+    cache[data_type] = (data_source, usage)
+    return usage
+
+
+def calculate_raw_usage_vector(analyzer, names, data_type='internet'):
+    """Surové využitie (%) internetu alebo aplikácií pre zoznam mien naraz"""
+    
+    default = 30 if data_type == 'internet' else 20
+    usage = _usage_by_canonical(analyzer, data_type)
+    if usage is None or len(names) == 0:
+        return np.full(len(names), float(default))
+    
+    canon = [analyzer.get_canonical_name(name) for name in names]
+    matched = usage.reindex(canon)
+    ratio = matched['used'] / matched['available'] * 100
+    return ratio.fillna(default).to_numpy(dtype=float)
+
+
+def calculate_weighted_benchmarks(analyzer, rows=None):
+    """Vypočíta vážené benchmarky na základe predajných výsledkov (vážený priemer)"""
+    
+    table = analyzer.get_employee_table()
+    if rows is None:
+        rows = np.arange(len(table))
+    
+    if len(rows) == 0:
+        return {'internet_benchmark': 50, 'app_benchmark': 50}
+    
+    names = table.names[rows]
+    # Váha = celkové predaje v miliónoch, minimálna váha 1
+    weights = np.maximum(1, table.totals[rows] / 1000000)
     
     return {
-        'internet_benchmark': internet_benchmark,
-        'app_benchmark': app_benchmark
+        'internet_benchmark': float(np.average(calculate_raw_usage_vector(analyzer, names, 'internet'), weights=weights)),
+        'app_benchmark': float(np.average(calculate_raw_usage_vector(analyzer, names, 'applications'), weights=weights))
     }
 
 
 def calculate_raw_internet_usage(analyzer, employee_name):
     """Vypočíta surovú hodnotu využívania internetu (bez relatívneho hodnotenia)"""
     
-    canonical_name = analyzer.get_canonical_name(employee_name)
-    matching_names = [name for name, canon in analyzer.name_mapping.items() if canon == canonical_name]
-    
-    if analyzer.internet_data is None:
-        return 30  # Default nízke využívanie
-    
-    user_data = analyzer.internet_data[analyzer.internet_data['Osoba ▲'].isin(matching_names)]
-    
-    if user_data.empty:
-        return 30
-    
-    total_internet_time = 0
-    total_available_time = 0
-    
-    for _, row in user_data.iterrows():
-        # Všetky internet aktivity
-        internet_time = (
-            time_to_minutes(row.get('Mail', '0:00')) +
-            time_to_minutes(row.get('IS Sykora', '0:00')) +
-            time_to_minutes(row.get('SykoraShop', '0:00')) +
-            time_to_minutes(row.get('Web k praci', '0:00')) +
-            time_to_minutes(row.get('Chat', '0:00')) +
-            time_to_minutes(row.get('Hry', '0:00')) +
-            time_to_minutes(row.get('Nepracovni weby', '0:00'))
-        )
-        
-        day_total = time_to_minutes(row.get('Čas celkem ▼', '0:00'))
-        if day_total == 0:
-            day_total = 480  # 8h
-        
-        total_internet_time += internet_time
-        total_available_time += day_total
-    
-    if total_available_time > 0:
-        return (total_internet_time / total_available_time) * 100
-    
-    return 30
+    return calculate_raw_usage_vector(analyzer, [employee_name], 'internet')[0]
 
 
 def calculate_raw_app_usage(analyzer, employee_name):
     """Vypočíta surovú hodnotu využívania aplikácií (bez relatívneho hodnotenia)"""
     
-    canonical_name = analyzer.get_canonical_name(employee_name)
-    matching_names = [name for name, canon in analyzer.name_mapping.items() if canon == canonical_name]
-    
-    if analyzer.applications_data is None:
-        return 20  # Default nízke využívanie
-    
-    user_data = analyzer.applications_data[analyzer.applications_data['Osoba ▲'].isin(matching_names)]
-    
-    if user_data.empty:
-        return 20
-    
-    total_app_time = 0
-    total_available_time = 0
-    
-    for _, row in user_data.iterrows():
-        # Produktívne aplikácie
-        app_time = (
-            time_to_minutes(row.get('Helios Green', '0:00')) +
-            time_to_minutes(row.get('Imos - program', '0:00')) +
-            time_to_minutes(row.get('Mail', '0:00')) +
-            time_to_minutes(row.get('Programy', '0:00')) +
-            time_to_minutes(row.get('Půdorysy', '0:00'))
-        )
-        
-        day_total = time_to_minutes(row.get('Čas celkem ▼', '0:00'))
-        if day_total == 0:
-            day_total = 480
-        
-        total_app_time += app_time
-        total_available_time += day_total
-    
-    if total_available_time > 0:
-        return (total_app_time / total_available_time) * 100
-    
-    return 20
+    return calculate_raw_usage_vector(analyzer, [employee_name], 'applications')[0]
+
+
+def _internet_productivity(raw_usage, internet_benchmark):
+    """Relatívne internet skóre (menej internetu ako priemer = lepšie)"""
+    if internet_benchmark > 0:
+        return np.clip(100 * (internet_benchmark / np.maximum(raw_usage, 1)), 0, 100)
+    return np.full(len(raw_usage), 50.0)
+
+
+def _app_productivity(raw_usage, app_benchmark):
+    """Relatívne aplikačné skóre (viac aplikácií ako priemer = lepšie)"""
+    if app_benchmark > 0:
+        return np.clip(100 * (raw_usage / app_benchmark), 0, 100)
+    return np.full(len(raw_usage), 50.0)
 
 
 def calculate_internet_productivity(analyzer, employee_name):
@@ -140,19 +122,8 @@ def calculate_internet_productivity(analyzer, employee_name):
     if not hasattr(analyzer, '_heatmap_benchmarks'):
         analyzer._heatmap_benchmarks = calculate_weighted_benchmarks(analyzer)
     
-    benchmarks = analyzer._heatmap_benchmarks
-    internet_benchmark = benchmarks['internet_benchmark']
-    
-    # Surová hodnota pre tohto zamestnanca
-    raw_usage = calculate_raw_internet_usage(analyzer, employee_name)
-    
-    # Relatívne hodnotenie (menej internetu = lepšie)
-    if internet_benchmark > 0:
-        # Inverzný vzťah: ak má menej internetu ako priemer = lepšie skóre
-        relative_score = 100 * (internet_benchmark / max(raw_usage, 1))
-        return min(100, max(0, relative_score))
-    
-    return 50
+    raw_usage = calculate_raw_usage_vector(analyzer, [employee_name], 'internet')
+    return float(_internet_productivity(raw_usage, analyzer._heatmap_benchmarks['internet_benchmark'])[0])
 
 
 def calculate_app_productivity(analyzer, employee_name):
@@ -162,19 +133,8 @@ def calculate_app_productivity(analyzer, employee_name):
     if not hasattr(analyzer, '_heatmap_benchmarks'):
         analyzer._heatmap_benchmarks = calculate_weighted_benchmarks(analyzer)
     
-    benchmarks = analyzer._heatmap_benchmarks
-    app_benchmark = benchmarks['app_benchmark']
-    
-    # Surová hodnota pre tohto zamestnanca
-    raw_usage = calculate_raw_app_usage(analyzer, employee_name)
-    
-    # Relatívne hodnotenie (viac aplikácií = lepšie)
-    if app_benchmark > 0:
-        # Priamy vzťah: ak má viac aplikácií ako priemer = lepšie skóre
-        relative_score = 100 * (raw_usage / app_benchmark)
-        return min(100, max(0, relative_score))
-    
-    return 50
+    raw_usage = calculate_raw_usage_vector(analyzer, [employee_name], 'applications')
+    return float(_app_productivity(raw_usage, analyzer._heatmap_benchmarks['app_benchmark'])[0])
 
 
 def get_available_quarters(sales_employees):
@@ -183,28 +143,73 @@ def get_available_quarters(sales_employees):
     if not sales_employees:
         return ['Q1', 'Q2']
     
-    # Skontroluj aké mesiace máme v dátach
-    all_months = set()
-    for emp in sales_employees:
-        monthly_sales = emp.get('monthly_sales', {})
-        for month in monthly_sales.keys():
-            if monthly_sales[month] > 0:  # Len mesiace s dátami
-                all_months.add(month.lower())
-    
-    quarters = []
-    quarter_months = {
-        'Q1': ['leden', 'unor', 'brezen'],
-        'Q2': ['duben', 'kveten', 'cerven'], 
-        'Q3': ['cervenec', 'srpen', 'zari'],
-        'Q4': ['rijen', 'listopad', 'prosinec']
+    table = sales_employees if isinstance(sales_employees, EmployeeTable) else EmployeeTable(sales_employees)
+    return _available_quarters(table, np.arange(len(table)))
+
+
+def _available_quarters(table, rows):
+    """Štvrťroky, v ktorých má aspoň jeden mesiac nenulový predaj"""
+    
+    if len(rows) == 0:
+        return ['Q1', 'Q2']
+    
+    months_with_data = (table.sales[rows] > 0).any(axis=0)
+    # Ak má aspoň jeden mesiac dáta, zahrnúť štvrťrok
+    return [
+        quarter for quarter in ['Q1', 'Q2', 'Q3', 'Q4']
+        if months_with_data[table.month_columns(get_quarter_months(quarter))].any()
+    ]
+
+
+def calculate_heatmap_matrix(analyzer, rows):
+    """Celá heatmapa ako maticové operácie nad vybranými riadkami tabuľky zamestnancov"""
+    
+    table = analyzer.get_employee_table()
+    names = table.names[rows]
+    available_quarters = _available_quarters(table, rows)
+    
+    # Štvrťročné skóre priamo zo sales matice
+    quarterly_scores = {
+        quarter: np.minimum(100, table.quarter_sales(quarter, rows) / QUARTER_TARGET * 100).tolist()
+        for quarter in available_quarters
     }
     
-    for quarter, months in quarter_months.items():
-        # Ak má aspoň jeden mesiac dáta, zahrnúť štvrťrok
-        if any(month in all_months for month in months):
-            quarters.append(quarter)
+    # Benchmarky ako vážený priemer za aktuálny rozsah používateľa
+    benchmarks = calculate_weighted_benchmarks(analyzer, rows)
+    internet_scores = _internet_productivity(
+        calculate_raw_usage_vector(analyzer, names, 'internet'), benchmarks['internet_benchmark'])
+    app_scores = _app_productivity(
+        calculate_raw_usage_vector(analyzer, names, 'applications'), benchmarks['app_benchmark'])
+    
+    # Celkové skóre s dynamickými štvrťrokmi
+    target_sales = len(available_quarters) * QUARTER_TARGET
+    total_sales = table.totals[rows]
+    sales_scores = np.minimum(100, total_sales / target_sales * 100) if target_sales > 0 else np.zeros(len(rows))
+    overall_scores = sales_scores * 0.5 + internet_scores * 0.25 + app_scores * 0.25
     
-    return quarters
+    return {
+        'employees': names.tolist(),
+        'quarterly_scores': quarterly_scores,
+        'internet_scores': internet_scores.tolist(),
+        'app_scores': app_scores.tolist(),
+        'overall_scores': overall_scores.tolist(),
+        'available_quarters': available_quarters,
+        'benchmarks': benchmarks
+    }
+
+
+def get_heatmap_matrix(analyzer, rows, scope_key):
+    """Heatmapa cachovaná per snapshot dát a per rozsah používateľa"""
+    
+    snapshot = (analyzer.get_employee_table(), analyzer.internet_data, analyzer.applications_data)
+    cache = getattr(analyzer, '_heatmap_matrix_cache', None)
+    if cache is None or any(a is not b for a, b in zip(cache['snapshot'], snapshot)):
+        cache = {'snapshot': snapshot, 'scopes': {}}
+        analyzer._heatmap_matrix_cache = cache
+    
+    if scope_key not in cache['scopes']:
+        cache['scopes'][scope_key] = calculate_heatmap_matrix(analyzer, rows)
+    return cache['scopes'][scope_key]
 
 
 def render(analyzer):
@@ -216,65 +221,30 @@ def render(analyzer):
         return
     
     # ✅ NOVÉ - Filtrovanie zamestnancov podľa oprávnení používateľa
-    filtered_employees = []
     user_cities = get_user_cities()
     current_user = get_current_user()
+    employee_table = analyzer.get_employee_table()
     
-    for employee in analyzer.sales_employees:
-        if current_user and current_user.get('role') == 'admin':
-            # Admin vidí všetkých
-            filtered_employees.append(employee)
-        elif employee.get('workplace', '').lower() in [c.lower() for c in user_cities]:
-            # Manažér vidí len svojich
-            filtered_employees.append(employee)
+    if current_user and current_user.get('role') == 'admin':
+        # Admin vidí všetkých
+        rows = np.arange(len(employee_table))
+        scope_key = 'admin'
+    else:
+        # Manažér vidí len svojich - výber cez index pracovísk
+        rows = employee_table.rows_for_workplaces(user_cities)
+        scope_key = tuple(sorted(str(c).lower() for c in user_cities))
     
-    if not filtered_employees:
+    if len(rows) == 0:
         st.warning("⚠️ Nemáte oprávnenie na zobrazenie týchto dát alebo nie sú dostupné")
         return
     
-    # Použitie filtrovaných zamestnancov namiesto pôvodných
-    original_employees = analyzer.sales_employees
-    analyzer.sales_employees = filtered_employees
-    
-    # Zistenie dostupných štvrťrokov
-    available_quarters = get_available_quarters(analyzer.sales_employees)
-    
-    # Príprava dát pre heatmapu
-    employees = []
-    quarterly_scores = {}  # Dynamické štvrťroky
-    internet_scores = []
-    app_scores = []
-    overall_scores = []
-    
-    for i, emp in enumerate(analyzer.sales_employees):
-        emp_name = emp['name']
-        
-        employees.append(emp_name)
-        
-        monthly_sales = emp.get('monthly_sales', {})
-        
-        # Dynamické spracovanie štvrťrokov
-        for quarter in available_quarters:
-            if quarter not in quarterly_scores:
-                quarterly_scores[quarter] = []
-            
-            quarter_sales = calculate_quarter_sales(monthly_sales, quarter)
-            quarter_score = min(100, (quarter_sales / 2000000 * 100)) if quarter_sales else 0
-            quarterly_scores[quarter].append(quarter_score)
-        
-        # ✅ POUŽÍVAME VÁŽENÉ HODNOTENIE
-        internet_productivity = calculate_internet_productivity(analyzer, emp_name)
-        app_productivity = calculate_app_productivity(analyzer, emp_name)
-        
-        internet_scores.append(internet_productivity)
-        app_scores.append(app_productivity)
-        
-        # Celkové skóre s dynamickými štvrťrokmi
-        total_sales = sum(monthly_sales.values()) if monthly_sales else 0
-        target_sales = len(available_quarters) * 2000000  # 2M na štvrťrok
-        sales_score = min(100, (total_sales / target_sales * 100)) if total_sales and target_sales > 0 else 0
-        overall_score = (sales_score * 0.5 + internet_productivity * 0.25 + app_productivity * 0.25)
-        overall_scores.append(overall_score)
+    heatmap = get_heatmap_matrix(analyzer, rows, scope_key)
+    employees = heatmap['employees']
+    quarterly_scores = heatmap['quarterly_scores']
+    internet_scores = heatmap['internet_scores']
+    app_scores = heatmap['app_scores']
+    overall_scores = heatmap['overall_scores']
+    available_quarters = heatmap['available_quarters']
     
     # Zobrazenie výsledkov
     show_results_summary(internet_scores, app_scores, overall_scores, available_quarters)
@@ -293,9 +263,6 @@ def render(analyzer):
     
     # Interpretačná príručka
     show_interpretation_guide()
-    
-    # ✅ Obnovenie pôvodných dát na konci render funkcie
-    analyzer.sales_employees = original_employees
 
 
 def show_results_summary(internet_scores, app_scores, overall_scores, available_quarters):
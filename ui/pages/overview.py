@@ -1,5 +1,6 @@
 # ui/pages/overview.py
 import streamlit as st
+import pandas as pd
 import plotly.graph_objects as go
 from core.utils import (
     format_money, format_profit_value, time_to_minutes,
@@ -53,11 +54,56 @@ def render(analyzer):
     with st.expander("🔍 Detailné rozloženie aktivít", expanded=False):
         create_activity_breakdown_chart(analyzer)
     
+    # ✅ NOVÉ - Anomálie dennej aktivity všetkých zamestnancov
+    with st.expander("🚨 Anomálie dennej aktivity", expanded=False):
+        show_activity_anomalies(analyzer)
+    
     st.markdown("---")
     
     # Vyhľadávanie zamestnancov (pôvodné) - s filtrovanými dátami
     show_employee_search(filtered_summary, analyzer)
 
+def show_activity_anomalies(analyzer):
+    """Panel s anomáliami (nárast Hry / Nepracovni weby / hladanie prace, pokles Čas celkem)"""
+    from auth.auth import is_admin, get_current_user
+    
+    anomalies = analyzer.get_activity_anomalies()
+    
+    current_user = get_current_user() or {}
+    if not is_admin() and 'all' not in current_user.get('cities', []):
+        allowed = [c.lower() for c in get_user_cities()]
+        anomalies = anomalies[anomalies['workplace'].isin(allowed)]
+    
+    if anomalies.empty:
+        st.success("✅ Žiadne anomálie v denných dátach")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        activities = st.multiselect("Aktivita", sorted(anomalies['activity'].unique()),
+                                    default=sorted(anomalies['activity'].unique()), key="anomaly_activities")
+    with col2:
+        direction = st.radio("Smer", ["všetko", "nárast", "pokles"], horizontal=True, key="anomaly_direction")
+    
+    shown = anomalies[anomalies['activity'].isin(activities)]
+    if direction != "všetko":
+        shown = shown[shown['direction'] == direction]
+    
+    st.caption(f"🔎 {len(shown)} anomálií | baseline = medián predchádzajúcich dní, z = robustné z-skóre (MAD)")
+    display = pd.DataFrame({
+        '📅 Dátum': shown['date'],
+        '👤 Zamestnanec': shown['employee'],
+        '🏙️ Mesto': shown['workplace'].str.title(),
+        '📂 Zdroj': shown['source'],
+        '🎯 Aktivita': shown['activity'],
+        '⏱️ Minúty': shown['minutes'].astype(int),
+        '📊 Baseline': shown['baseline'].round(0).astype(int),
+        'z': shown['z_score'],
+        '↕️ Smer': shown['direction'],
+    })
+    st.dataframe(display, use_container_width=True, hide_index=True)
+
+
 def create_city_overview(summary_data):
     """Vytvorí prehľad podľa miest"""
     
@@ -363,13 +409,11 @@ def create_monthly_activity_chart(analyzer):
     
     # ✅ AGREGÁCIA SKUTOČNÝCH SALES DÁT
     if hasattr(analyzer, 'sales_employees') and analyzer.sales_employees:
-        for employee in analyzer.sales_employees:
-            if 'monthly_sales' in employee and employee['monthly_sales']:
-                for month, sales in employee['monthly_sales'].items():
-                    # Konverzia názvov mesiacov ak je potrebné
-                    month_lower = month.lower()
-                    if month_lower in monthly_data:
-                        monthly_data[month_lower] += sales
+        # Deklaratívny dotaz - výsledok zdieľaný pre všetkých s rovnakým snapshotom
+        monthly_sales = analyzer.get_analytics_engine().query('sales', group_by=['month'])
+        for month, sales in zip(monthly_sales['month'], monthly_sales['value']):
+            if month in monthly_data:
+                monthly_data[month] += sales
     
     # ✅ FALLBACK - ak nemáme monthly_sales, použijeme total_sales rozdelené
     if all(value == 0 for value in monthly_data.values()):
@@ -551,8 +595,11 @@ def create_activity_breakdown_chart(analyzer):
     
     create_section_header("Detailné rozloženie aktivít", "🎯")
     
-    # ✅ POUŽITIE UTILITY FUNKCIÍ Z core/utils.py
-    activity_data = calculate_activity_breakdown(analyzer)
+    # ✅ POUŽITIE UTILITY FUNKCIÍ Z core/utils.py - cachované per snapshot a rozsah používateľa
+    from auth.auth import is_admin, get_current_user
+    current_user = get_current_user() or {}
+    allowed_cities = None if is_admin() or 'all' in current_user.get('cities', []) else get_user_cities()
+    activity_data = calculate_activity_breakdown(analyzer, allowed_cities)
     
     if not activity_data:
         st.warning("⚠️ Nie je možné vypočítať rozloženie aktivít")
@@ -636,6 +683,42 @@ def create_activity_breakdown_chart(analyzer):
     # Produktivitné metriky
     if show_metrics:
         display_productivity_metrics(activity_data)
+    
+    # Rozloženie po mestách (počítané v tom istom prechode ako celkové súčty)
+    display_city_activity_breakdown(activity_data)
+
+def display_city_activity_breakdown(activity_data):
+    """Zobrazí internet vs. aplikačné hodiny po mestách"""
+    
+    cities = activity_data.get('cities', {})
+    if not cities:
+        return
+    
+    create_subsection_header("Rozloženie aktivít podľa miest", "🏙️")
+    
+    city_names = [city.title() for city in cities]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name="🌐 Internet",
+        x=city_names,
+        y=[data['internet']['total_hours'] for data in cities.values()],
+        marker_color='#3b82f6'
+    ))
+    fig.add_trace(go.Bar(
+        name="💻 Aplikácie",
+        x=city_names,
+        y=[data['applications']['total_hours'] for data in cities.values()],
+        marker_color='#10b981'
+    ))
+    
+    from ui.styling import get_dark_plotly_layout
+    layout_settings = get_dark_plotly_layout()
+    layout_settings['yaxis'] = {**layout_settings.get('yaxis', {}), 'title': {'text': "Hodiny", 'font': {'color': '#fafafa'}}}
+    layout_settings.update({'barmode': 'stack', 'height': 400})
+    fig.update_layout(**layout_settings)
+    st.plotly_chart(fig, use_container_width=True)
+
+
 def display_monthly_summary_from_utils(activity_data):
     """Zobrazí súhrn používajúc utils funkciu"""
     
@@ -1091,13 +1174,11 @@ def find_correct_sales_data(employee_name, emp, analyzer):
         sales_candidates.append(('total_sales', total_sales))
     
     # 3. Z analyzer.sales_employees
-    if hasattr(analyzer, 'sales_employees'):
-        for sales_emp in analyzer.sales_employees:
-            if sales_emp.get('name') == employee_name:
-                if 'monthly_sales' in sales_emp and sales_emp['monthly_sales']:
-                    analyzer_total = sum(sales_emp['monthly_sales'].values())
-                    sales_candidates.append(('analyzer_monthly', analyzer_total))
-                break
+    if hasattr(analyzer, 'get_employee_table'):
+        table = analyzer.get_employee_table()
+        person_id = table.person_id(employee_name)
+        if person_id is not None and table.records[person_id].get('monthly_sales'):
+            sales_candidates.append(('analyzer_monthly', table.totals[person_id]))
     
     # Analýza a výber správnej hodnoty
     if not sales_candidates:
@@ -1163,24 +1244,37 @@ def calculate_real_employee_metrics(emp, analyzer):
     # Výpočty
     sales_score = calculator.calculate_sales_score(sales)
     
-    # Ostatné metriky
-    try:
-        mail_score = calculator.calculate_mail_efficiency(employee_name, sales)
-    except Exception as e:
-        mail_score = 65
-    
+    # Ostatné metriky - jeden riadok z batch tabuľky (počíta sa raz pre všetkých)
     try:
-        sketchup_score = calculator.calculate_sketchup_usage(employee_name)
+        metrics_table = calculator.calculate_all_employees_metrics()
+        person_id = analyzer.get_employee_table().person_id(employee_name)
     except Exception as e:
-        sketchup_score = 90
-    
-    try:
-        internet_score = calculator.calculate_internet_efficiency(employee_name)
-    except Exception as e:
-        internet_score = 60
-    
-    # ✅ OPRAVENÉ: Nájsť pôvodný overall score z analyzátora
-    overall_score = find_original_overall_score(employee_name, analyzer)
+        metrics_table, person_id = None, None
+    
+    if person_id is not None:
+        row = metrics_table.iloc[person_id]
+        mail_score = 65 if pd.isna(row['mail']) else row['mail']
+        sketchup_score = row['sketchup']
+        internet_score = row['internet']
+        overall_score = row['overall']
+    else:
+        try:
+            mail_score = calculator.calculate_mail_efficiency(employee_name, sales)
+        except Exception as e:
+            mail_score = 65
+        
+        try:
+            sketchup_score = calculator.calculate_sketchup_usage(employee_name)
+        except Exception as e:
+            sketchup_score = 90
+        
+        try:
+            internet_score = calculator.calculate_internet_efficiency(employee_name)
+        except Exception as e:
+            internet_score = 60
+        
+        # ✅ OPRAVENÉ: Nájsť pôvodný overall score z analyzátora
+        overall_score = find_original_overall_score(employee_name, analyzer)
     
     return {
         'sales': {'value': sales_score},
@@ -1194,12 +1288,12 @@ def find_original_overall_score(employee_name, analyzer):
     """Nájde pôvodný overall score z analyzátora"""
     
     # Hľadanie v sales_employees
-    if hasattr(analyzer, 'sales_employees'):
-        for emp in analyzer.sales_employees:
-            if emp.get('name') == employee_name:
-                score = emp.get('score', 0)
-                if score > 0:
-                    return score
+    if hasattr(analyzer, 'get_employee_by_name'):
+        emp = analyzer.get_employee_by_name(employee_name)
+        if emp:
+            score = emp.get('score', 0)
+            if score > 0:
+                return score
     
     # Fallback
     return 50
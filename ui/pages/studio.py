@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 from core.studio_analyzer import StudioAnalyzer
+from core import studio_details
 from auth.auth import filter_data_by_user_access, can_access_city, get_user_cities, get_current_user, has_feature_access
 from ui.styling import (
     apply_dark_theme, create_section_header, create_subsection_header, 
@@ -218,6 +219,9 @@ def show_studio_page():
     current_user = get_current_user()
     if current_user and current_user.get('role') == 'admin':
         st.success("👑 **Admin:** Zobrazujú sa všetci zamestnanci")
+        memory = analyzer.memory_usage()
+        st.caption(f"💾 Studio dáta v pamäti: {memory['total'] / 1024**2:.1f} MB "
+                   f"({len(analyzer.df_active):,} záznamov)")
     elif has_feature_access("studio_see_all_employees"):
         st.success("🌍 **Všetci zamestnanci:** Máte povolenie vidieť všetkých")
     else:
@@ -231,8 +235,11 @@ def show_studio_page():
     st.subheader("📅 Filter dátumu")
     
     # Zistenie rozsahu dátumov v dátach
-    min_date = pd.to_datetime(analyzer.df_active['Datum real.']).min().date()
-    max_date = pd.to_datetime(analyzer.df_active['Datum real.']).max().date()
+    min_date, max_date = analyzer.date_bounds()
+    if min_date is None:
+        st.warning("⚠️ Žiadne dáta s platným dátumom!")
+        return
+    min_date, max_date = min_date.date(), max_date.date()
     
     col1, col2, col3 = st.columns([2, 2, 1])
     
@@ -287,9 +294,11 @@ def show_studio_page():
                 analyzer.df_active = analyzer.df_active[
                     analyzer.df_active[studio_column].isin(allowed_employees)
                 ].copy()
+                analyzer.employee_scope = list(allowed_employees)
             else:
                 st.warning(f"⚠️ **Žiadni zamestnanci** z vašich miest neboli nájdení v studio dátach.")
                 analyzer.df_active = analyzer.df_active.iloc[0:0].copy()  # Prázdny dataframe
+                analyzer.employee_scope = []
         except Exception as e:
             st.error(f"❌ Chyba pri filtrovaní podľa miest: {e}")
     # ✅ Admin alebo používateľ s studio_see_all_employees - žiadne filtrovanie
@@ -314,6 +323,9 @@ def show_studio_page():
         'filtered_records': filtered_records
     }
     
+    # Detaily všetkých zamestnancov sa predpočítajú na pozadí - preklik na detail je potom lookup
+    studio_details.precompute(get_employee_grid_key(filtered_analyzer), filtered_analyzer.df_active)
+    
     st.divider()
     
     # Základné štatistiky
@@ -322,6 +334,7 @@ def show_studio_page():
     # Štatistiky podľa kategórií spotrebičov
     st.divider()
     show_appliance_stats_cards(filtered_analyzer)
+    show_best_sellers(filtered_analyzer)
     
     # Mesačný predaj spotrebičov
     st.divider()
@@ -343,29 +356,12 @@ def show_studio_page():
 # FILTER DÁTUMU
 # ---------------------------------------------------------------------------
 def apply_date_filter(analyzer, start_date, end_date):
-    """Aplikuje filter dátumu na analyzer a vráti nový filtrovaný analyzer"""
-    
-    # Konverzia dátumov na pandas datetime
-    start_datetime = pd.to_datetime(start_date)
-    end_datetime = pd.to_datetime(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)  # Koniec dňa
-    
-    # Filtrovanie dátového rámca
-    df_filtered = analyzer.df_active[
-        (pd.to_datetime(analyzer.df_active['Datum real.']) >= start_datetime) &
-        (pd.to_datetime(analyzer.df_active['Datum real.']) <= end_datetime)
-    ].copy()
+    """Aplikuje filter dátumu na analyzer a vráti nový filtrovaný analyzer
     
-    # Vytvorenie nového analyzéra s filtrovanými dátami
-    filtered_analyzer = StudioAnalyzer.__new__(StudioAnalyzer)
-    filtered_analyzer.df_active = df_filtered
-    filtered_analyzer.APPLIANCES = analyzer.APPLIANCES
-    
-    # Normalizácia názvov v filtrovanom analyzéri (ak existuje metóda)
-    if not df_filtered.empty and hasattr(analyzer, 'realistic_normalize_appliance'):
-        filtered_analyzer.realistic_normalize_appliance = analyzer.realistic_normalize_appliance
-        filtered_analyzer.df_active.loc[:, 'Název_norm'] = filtered_analyzer.df_active['Název'].apply(filtered_analyzer.realistic_normalize_appliance)
-    
-    return filtered_analyzer
+    df_active je zoradený podľa dátumu, takže filter je rez (searchsorted) bez kópie;
+    Název_norm je už normalizovaný z načítania.
+    """
+    return analyzer.filter_by_date(start_date, end_date)
 
 # ---------------------------------------------------------------------------
 # AUTOMATICKÉ NAČÍTANIE DÁT Z /data/studio/
@@ -395,37 +391,48 @@ def load_studio_data(folder_hash):
 # ---------------------------------------------------------------------------
 # ZÁKLADNÉ ŠTATISTIKY
 # ---------------------------------------------------------------------------
-def show_basic_stats(analyzer):
-    """Zobrazí základné štatistiky s rešpektovaním používateľských oprávnení"""
+def get_cube_scope(analyzer):
+    """Argumenty pre StudioCube podľa filtra dátumu a oprávnení (None = nič na zobrazenie)"""
+    start_date, end_date = getattr(analyzer, 'date_window', None) or (None, None)
+    scope = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'employees': getattr(analyzer, 'employee_scope', None),
+    }
     
-    st.subheader("📊 Základné štatistiky")
+    # Pre administrátora alebo používateľov s "studio_see_all_employees" bez filtrovania
+    current_user = get_current_user()
+    if (current_user and current_user.get('role') == 'admin') or has_feature_access("studio_see_all_employees"):
+        return scope
     
-    # ✅ OPRAVENÉ - Použiť filtrované dáta podľa oprávnení
+    # Filtrovanie podľa miest používateľa
     user_cities = get_user_cities()
-    current_user = get_current_user()
+    if not user_cities:
+        return None
+    if analyzer.get_cube().workplaces is not None:
+        scope['workplaces'] = user_cities
+    return scope  # Fallback ak nie je workplace stĺpec - rozsah určuje employee_scope
+
+
+def show_basic_stats(analyzer):
+    """Zobrazí základné štatistiky s rešpektovaním používateľských oprávnení
     
-    # Pre administrátora alebo používateľov s "studio_see_all_employees" bez filtrovania
-    if (current_user and current_user.get('role') == 'admin') or has_feature_access("studio_see_all_employees"):
-        df_to_use = analyzer.df_active
-    else:
-        # Filtrovanie podľa miest používateľa
-        if not user_cities:
-            df_to_use = pd.DataFrame()  # Prázdny DataFrame ak nemá mestá
-        elif 'workplace' in analyzer.df_active.columns:
-            city_filter = analyzer.df_active['workplace'].str.lower().isin([c.lower() for c in user_cities])
-            df_to_use = analyzer.df_active[city_filter]
-        else:
-            df_to_use = analyzer.df_active  # Fallback ak nie je workplace stĺpec
+    Súčty sú rozdiely kumulatívnych súčtov v StudioCube - bez prechodu cez riadky.
+    """
+    
+    st.subheader("📊 Základné štatistiky")
+    
+    scope = get_cube_scope(analyzer)
+    summary = analyzer.get_cube().summary(**scope) if scope is not None else None
     
-    if df_to_use.empty:
+    if summary is None or summary['total_count'] == 0:
         st.warning("⚠️ Žiadne dáta na zobrazenie podľa vašich oprávnení")
         return
     
-    # Výpočet základných metrík z filtrovaných dát
-    total_sales = df_to_use['Cena/jedn.'].sum()
-    unique_employees = df_to_use['Kontaktní osoba-Jméno a příjmení'].nunique()
-    total_orders = len(df_to_use)
-    avg_order_value = df_to_use['Cena/jedn.'].mean()
+    total_sales = summary['total_sales']
+    unique_employees = summary['employees']
+    total_orders = summary['total_count']
+    avg_order_value = summary['avg_price']
     
     # Zobrazenie v 4 stĺpcoch
     col1, col2, col3, col4 = st.columns(4)
@@ -450,55 +457,25 @@ def show_appliance_stats_cards(analyzer):
     
     st.subheader("📈 Prehľad predaja podľa kategórií")
     
-    # ✅ OPRAVENÉ - Použiť filtrované dáta podľa oprávnení
-    user_cities = get_user_cities()
-    current_user = get_current_user()
+    scope = get_cube_scope(analyzer)
+    summary = analyzer.get_cube().summary(**scope) if scope is not None else None
     
-    # Pre administrátora alebo používateľov s "studio_see_all_employees" bez filtrovania
-    if (current_user and current_user.get('role') == 'admin') or has_feature_access("studio_see_all_employees"):
-        df_to_use = analyzer.df_active
-    else:
-        # Filtrovanie podľa miest používateľa
-        if not user_cities:
-            df_to_use = pd.DataFrame()  # Prázdny DataFrame ak nemá mestá
-        elif 'workplace' in analyzer.df_active.columns:
-            city_filter = analyzer.df_active['workplace'].str.lower().isin([c.lower() for c in user_cities])
-            df_to_use = analyzer.df_active[city_filter]
-        else:
-            df_to_use = analyzer.df_active  # Fallback ak nie je workplace stĺpec
-    
-    if df_to_use.empty:
+    if summary is None or summary['total_count'] == 0:
         st.warning("⚠️ Žiadne dáta na zobrazenie podľa vašich oprávnení")
         return
     
-    # Výpočet štatistík pre každú kategóriu z filtrovaných dát
-    appliance_stats = []
-    
-    for appliance in analyzer.APPLIANCES:
-        appliance_data = df_to_use[
-            df_to_use['Název_norm'] == appliance
-        ]
-        
-        if not appliance_data.empty:
-            stats = {
-                'name': appliance.replace('_', ' ').capitalize(),
-                'key': appliance,
-                'total_sales': appliance_data['Cena/jedn.'].sum(),
-                'total_count': len(appliance_data),
-                'employees': appliance_data['Kontaktní osoba-Jméno a příjmení'].nunique(),
-                'avg_price': appliance_data['Cena/jedn.'].mean()
-            }
-        else:
-            stats = {
-                'name': appliance.replace('_', ' ').capitalize(),
-                'key': appliance,
-                'total_sales': 0,
-                'total_count': 0,
-                'employees': 0,
-                'avg_price': 0
-            }
-        
-        appliance_stats.append(stats)
+    # Štatistiky pre každú kategóriu priamo z kocky
+    appliance_stats = [
+        {
+            'name': row.appliance.replace('_', ' ').capitalize(),
+            'key': row.appliance,
+            'total_sales': row.total_sales,
+            'total_count': int(row.total_count),
+            'employees': int(row.employees),
+            'avg_price': row.avg_price
+        }
+        for row in summary['appliances'].itertuples(index=False)
+    ]
     
     # Zobrazenie kariet v riadkoch po 3
     for i in range(0, len(appliance_stats), 3):
@@ -526,6 +503,27 @@ def show_appliance_stats_cards(analyzer):
                         delta=f"{stats['total_count']} kusov • {stats['employees']} zam."
                     )
 
+def show_best_sellers(analyzer):
+    """Najpredávanejší produkt každého spotrebiča za vybrané obdobie (hotová odpoveď z ProductIndex)"""
+    if not has_feature_access("employee_detail_top_products"):
+        return
+    
+    # Index z predpočtu detailov (ak už dobehol), inak z analyzéra
+    details = studio_details.ready_details(get_employee_grid_key(analyzer))
+    products = details.products if details is not None and details.products is not None else analyzer.get_product_index()
+    best = products.best_sellers()
+    if best.empty:
+        return
+    
+    with st.expander("🏆 Najpredávanejšie produkty podľa spotrebičov", expanded=False):
+        display = pd.DataFrame({
+            'Spotrebič': best['Název_norm'].str.replace('_', ' ').str.capitalize(),
+            'Produkt': best['Název'],
+            'Celkový predaj': best['revenue'].map(lambda x: f"{x:,.0f} Kč"),
+            'Počet kusov': best['items'],
+        })
+        st.dataframe(display, use_container_width=True, hide_index=True)
+
 # ---------------------------------------------------------------------------
 # MESAČNÉ ŠTATISTIKY PREDAJA
 # ---------------------------------------------------------------------------
@@ -534,13 +532,10 @@ def show_monthly_sales_stats(analyzer):
     
     st.subheader("📅 Mesačný predaj spotrebičov")
     
-    # Vytvorenie mesačného súhrnu s kategóriami spotrebičov
-    df_monthly = analyzer.df_active.copy()
-    df_monthly['Mesiac'] = pd.to_datetime(df_monthly['Datum real.']).dt.to_period('M')
-    
-    # Používame už normalizované kategórie z analyzéra
-    monthly_by_category = df_monthly.groupby(['Mesiac', 'Název_norm'])['Cena/jedn.'].sum().reset_index()
-    monthly_by_category['Mesiac'] = monthly_by_category['Mesiac'].astype(str)
+    # Mesačný súhrn s kategóriami spotrebičov z kocky (rozdiely kumulatívnych súčtov na hraniciach mesiacov)
+    start_date, end_date = getattr(analyzer, 'date_window', None) or (None, None)
+    monthly = analyzer.get_cube().monthly(start_date, end_date, getattr(analyzer, 'employee_scope', None))
+    monthly_by_category = monthly[['Mesiac', 'Název_norm', 'revenue']].rename(columns={'revenue': 'Cena/jedn.'})
     
     # Stĺpcový graf s farbami pre rôzne kategórie
     fig = px.bar(
@@ -563,13 +558,12 @@ def show_monthly_sales_stats(analyzer):
     st.plotly_chart(fig, use_container_width=True)
     
     # Celkové mesačné štatistiky (tabuľka)
-    monthly_totals = df_monthly.groupby('Mesiac').agg({
-        'Cena/jedn.': ['sum', 'count', 'mean']
-    }).round(0)
-    
-    monthly_totals.columns = ['Celkový predaj', 'Počet objednávok', 'Priemerná hodnota']
-    monthly_totals = monthly_totals.reset_index()
-    monthly_totals['Mesiac'] = monthly_totals['Mesiac'].astype(str)
+    monthly_totals = monthly.groupby('Mesiac')[['revenue', 'priced']].sum()
+    monthly_totals = pd.DataFrame({
+        'Celkový predaj': monthly_totals['revenue'],
+        'Počet objednávok': monthly_totals['priced'],
+        'Priemerná hodnota': monthly_totals['revenue'] / monthly_totals['priced'].where(monthly_totals['priced'] > 0),
+    }).round(0).reset_index()
     
     # Tabuľka s detailmi
     st.subheader("📋 Detailné mesačné údaje")
@@ -619,9 +613,32 @@ def show_employees_filter_section(analyzer):
     
     return filter_type, appliance_filter, min_count
 
-@st.cache_data(ttl=300)  # 5 minút cache
-def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0):
-    """Vráti filtrovaných zamestnancov podľa kritérií + autentifikácie"""
+def get_employee_grid_key(analyzer):
+    """Kľúč cache gridu zamestnancov: (snapshot Studio dát, rozsah dátumov, rozsah miest, sales snapshot)
+    
+    _analyzer sa do hashu st.cache_data nezapočítava, preto všetko, od čoho
+    výsledok závisí, musí byť v tomto kľúči. Povolených zamestnancov manažéra
+    určuje hlavný analyzer (sales dáta + nastavenie ukončených zamestnancov).
+    """
+    current_user = get_current_user()
+    if (current_user and current_user.get('role') == 'admin') or has_feature_access("studio_see_all_employees"):
+        city_scope = ('all',)
+        sales_scope = None
+    else:
+        city_scope = tuple(sorted(c.lower() for c in get_user_cities()))
+        main_analyzer = st.session_state.get('analyzer')
+        sales_version = main_analyzer.get_analytics_engine().snapshot_version(()) if main_analyzer is not None else None
+        sales_scope = (sales_version, bool(st.session_state.get('include_terminated_employees', False)))
+    window = tuple(str(d) for d in (getattr(analyzer, 'date_window', None) or ()))
+    return get_studio_folder_hash(), window, city_scope, sales_scope
+
+@st.cache_data(ttl=300, max_entries=256)  # 5 minút cache
+def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0, grid_key=None):
+    """Vráti filtrovaných zamestnancov podľa kritérií + autentifikácie
+    
+    Memoizované podľa grid_key (snapshot, dátumy, mestá) + filtrov; vyhľadávanie
+    podľa mena sa robí nad výsledkom, bez nového groupby.
+    """
     
     # Autentifikačné filtrovanie na začiatku
     user_cities = get_user_cities()
@@ -651,7 +668,7 @@ def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0
     # Základné štatistiky zamestnancov podľa kategorií spotrebičov
     if appliance_filter == "Všetky kategórie":
         # Celkové štatistiky
-        employee_stats = df_to_use.groupby('Kontaktní osoba-Jméno a příjmení').agg({
+        employee_stats = df_to_use.groupby('Kontaktní osoba-Jméno a příjmení', observed=True).agg({
             'Cena/jedn.': ['sum', 'count', 'mean'],
             'Datum real.': ['min', 'max']
         }).round(0)
@@ -672,7 +689,7 @@ def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0
         if category_data.empty:
             return pd.DataFrame()
         
-        employee_stats = category_data.groupby('Kontaktní osoba-Jméno a příjmení').agg({
+        employee_stats = category_data.groupby('Kontaktní osoba-Jméno a příjmení', observed=True).agg({
             'Cena/jedn.': ['sum', 'count', 'mean'],
             'Datum real.': ['min', 'max']
         }).round(0)
@@ -685,7 +702,7 @@ def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0
         employee_stats['Počet v kategórii'] = employee_stats['Počet objednávok']
         
         # Pridanie celkových štatistík zamestnanca
-        total_stats = df_to_use.groupby('Kontaktní osoba-Jméno a příjmení').agg({
+        total_stats = df_to_use.groupby('Kontaktní osoba-Jméno a příjmení', observed=True).agg({
             'Cena/jedn.': 'sum',
             'Název': 'count'
         })
@@ -698,18 +715,29 @@ def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0
             how='left'
         )
     
+    # Predpočítané rebríčky platia len pre celé df_active (nie pre výrez podľa miest)
+    use_leaderboard = df_to_use is _analyzer.df_active and not employee_stats.empty
+    
     # Aplikovanie filtrov
     if filter_type == "Najmenej predali" and appliance_filter != "Všetky kategórie":
         # Zamestnanci s najmenším počtom v danej kategórii
-        employee_stats = employee_stats[
-            employee_stats['Počet v kategórii'] <= min_count
-        ].sort_values('Počet v kategórii', ascending=True)
+        if use_leaderboard:
+            board = _analyzer.get_appliance_leaderboard(appliance_filter, 'count')
+            employee_stats = order_by_leaderboard(employee_stats, board.keys[board.at_most(min_count)])
+        else:
+            employee_stats = employee_stats[
+                employee_stats['Počet v kategórii'] <= min_count
+            ].sort_values('Počet v kategórii', ascending=True)
         
     elif filter_type == "Najviac predali" and appliance_filter != "Všetky kategórie":
         # Zamestnanci s najvyšším počtom v danej kategórii  
-        employee_stats = employee_stats[
-            employee_stats['Počet v kategórii'] >= min_count
-        ].sort_values('Počet v kategórii', ascending=False)
+        if use_leaderboard:
+            board = _analyzer.get_appliance_leaderboard(appliance_filter, 'count')
+            employee_stats = order_by_leaderboard(employee_stats, board.keys[board.at_least(min_count)])
+        else:
+            employee_stats = employee_stats[
+                employee_stats['Počet v kategórii'] >= min_count
+            ].sort_values('Počet v kategórii', ascending=False)
         
     elif filter_type == "Nepredali vôbec":
         # Všetci zamestnanci, ktorí nepredali nič z danej kategórie
@@ -729,7 +757,7 @@ def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0
                     'Počet v kategórii': [0] * len(employees_without)
                 })
                 # Pridanie celkových štatistík
-                total_stats = _analyzer.df_active.groupby('Kontaktní osoba-Jméno a příjmení').agg({
+                total_stats = _analyzer.df_active.groupby('Kontaktní osoba-Jméno a příjmení', observed=True).agg({
                     'Cena/jedn.': 'sum',
                     'Název': 'count'
                 }).reindex(employees_without, fill_value=0)
@@ -746,10 +774,20 @@ def get_filtered_employees(_analyzer, filter_type, appliance_filter, min_count=0
                 employee_stats = pd.DataFrame()
     else:
         # Všetci zamestnanci - zoradení podľa celkového predaja
-        employee_stats = employee_stats.sort_values('Celkový predaj', ascending=False)
+        if use_leaderboard:
+            appliance = None if appliance_filter == "Všetky kategórie" else appliance_filter
+            board = _analyzer.get_appliance_leaderboard(appliance, 'revenue')
+            employee_stats = order_by_leaderboard(employee_stats, board.keys[board.order])
+        else:
+            employee_stats = employee_stats.sort_values('Celkový predaj', ascending=False)
     
     return employee_stats
 
+def order_by_leaderboard(employee_stats, names):
+    """Vyberie a zoradí riadky employee_stats podľa poradia mien z rebríčka"""
+    name_col = 'Kontaktní osoba-Jméno a příjmení'
+    return employee_stats.set_index(name_col).reindex(names).dropna(how='all').reset_index()
+
 # ---------------------------------------------------------------------------
 # ZOBRAZENIE ZAMESTNANCOV - S FILTROVANÍM
 # ---------------------------------------------------------------------------
@@ -762,11 +800,13 @@ def show_employees_grid(analyzer, name_filter=""):
     st.divider()
     
     # Získanie filtrovaných zamestnancov
-    employee_stats = get_filtered_employees(analyzer, filter_type, appliance_filter, min_count)
+    employee_stats = get_filtered_employees(
+        analyzer, filter_type, appliance_filter, min_count, grid_key=get_employee_grid_key(analyzer)
+    )
     
     # Filtrovanie podľa mena
     if name_filter and not employee_stats.empty:
-        mask = employee_stats['Kontaktní osoba-Jméno a příjmení'].str.contains(name_filter, case=False, na=False)
+        mask = employee_stats['Kontaktní osoba-Jméno a příjmení'].str.contains(name_filter, case=False, na=False, regex=False)
         employee_stats = employee_stats[mask]
     
     if employee_stats.empty:
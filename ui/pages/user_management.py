@@ -160,6 +160,7 @@ def show_add_user_form(user_db):
             'employee': '👤 Detail zamestnanca',
             'benchmark': '🏆 Benchmark', 
             'heatmap': '🔥 Heatmapa',
+            'forecast': '🔮 Predikcia',
             'studio': '🏢 Studio',
             'kpi_system': '🎯 KPI Systém'
         }
@@ -307,6 +308,7 @@ def show_page_permissions_tab(user_db, email, user_data):
         'employee': '👤 Detail zamestnanca',
         'benchmark': '🏆 Benchmark', 
         'heatmap': '🔥 Heatmapa',
+        'forecast': '🔮 Predikcia',
         'studio': '🏢 Studio',
         'kpi_system': '🎯 KPI Systém',
         'admin': '👑 Administrácia'